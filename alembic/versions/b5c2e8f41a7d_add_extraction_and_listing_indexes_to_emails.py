@@ -0,0 +1,43 @@
+"""add extraction and listing indexes to emails
+
+Revision ID: b5c2e8f41a7d
+Revises: 7e3a5d2c8b14
+Create Date: 2026-10-18 14:02:37.118450
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5c2e8f41a7d'
+down_revision = '7e3a5d2c8b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes this way keeps emails writable (fetch jobs) during the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_emails_user_id_received_at', 'emails', ['user_id', 'received_at'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_emails_pending_extraction', 'emails', ['id'],
+            unique=False, postgresql_where=sa.text("extraction_status = 'PENDING'"),
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_emails_extraction_lease', 'emails', ['extraction_lease_expires_at'],
+            unique=False, postgresql_where=sa.text("extraction_status = 'IN_PROGRESS'"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_emails_extraction_lease', table_name='emails', postgresql_concurrently=True)
+        op.drop_index('ix_emails_pending_extraction', table_name='emails', postgresql_concurrently=True)
+        op.drop_index('ix_emails_user_id_received_at', table_name='emails', postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: c3d9a1f60e42
+Revises: b5c2e8f41a7d
+Create Date: 2026-10-18 16:41:09.502113
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9a1f60e42'
+down_revision = 'b5c2e8f41a7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built CONCURRENTLY (outside a transaction) so jobs and users stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_created_at_id', 'jobs', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_users_created_at_id', 'users', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_jobs_created_at_id', table_name='jobs', postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""add active arq job id unique index to jobs
+
+Revision ID: e9a4c7b2d5f8
+Revises: b7d2f5a8c3e1
+Create Date: 2026-10-20 10:14:52.337104
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9a4c7b2d5f8'
+down_revision = 'b7d2f5a8c3e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Concurrent enqueues may have left several active records for one ARQ job id:
+    # keep the newest, the one lookups by ARQ job id already resolved to
+    op.execute(
+        """
+        UPDATE jobs
+        SET status = 'FAILED',
+            finished_at = TIMEZONE('utc', CURRENT_TIMESTAMP),
+            error_payload = '{"error": "Superseded by a newer record for the same ARQ job"}'
+        WHERE status IN ('QUEUED', 'RUNNING')
+          AND arq_job_id IS NOT NULL
+          AND id NOT IN (
+              SELECT MAX(id) FROM jobs
+              WHERE status IN ('QUEUED', 'RUNNING') AND arq_job_id IS NOT NULL
+              GROUP BY arq_job_id
+          )
+        """
+    )
+    op.create_index(
+        'uq_jobs_active_arq_job_id', 'jobs', ['arq_job_id'],
+        unique=True, postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_jobs_active_arq_job_id', table_name='jobs')
@@ -0,0 +1,34 @@
+"""restrict category delete on transaction aggregates
+
+Revision ID: f3b8d1e6a2c9
+Revises: e9a4c7b2d5f8
+Create Date: 2026-10-20 11:02:17.584930
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1e6a2c9'
+down_revision = 'e9a4c7b2d5f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ON DELETE CASCADE dropped the totals of a category deleted outside
+    # CategoryService, while its transactions only became uncategorized (SET NULL).
+    # Without an ON DELETE action such a delete fails until the rows are folded.
+    op.drop_constraint('transaction_aggregates_category_id_fkey', 'transaction_aggregates', type_='foreignkey')
+    op.create_foreign_key(
+        'transaction_aggregates_category_id_fkey', 'transaction_aggregates', 'categories',
+        ['category_id'], ['id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('transaction_aggregates_category_id_fkey', 'transaction_aggregates', type_='foreignkey')
+    op.create_foreign_key(
+        'transaction_aggregates_category_id_fkey', 'transaction_aggregates', 'categories',
+        ['category_id'], ['id'], ondelete='CASCADE'
+    )
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, unit_of_work
 from app.core.security import create_access_token, create_refresh_token, decode_token
 from app.core.config import settings
 from app.crud.auth import (
@@ -17,9 +17,11 @@ from app.crud.auth import (
     verify_refresh_token,
 )
 from app.schemas.auth import UserRegister, UserLogin, LoginResponse, Token, UserResponse, ForgotPasswordRequest, ResetPasswordRequest
-from app.core.otp import generate_otp
+from app.core.otp import OTPCheck, consume_otp, generate_otp, store_otp
 from app.core import queue
-from app.crud.auth import save_user_otp, clear_user_otp, update_user_password
+from app.crud.auth import update_user_password
+from app.services.auth_cache import auth_user_cache
+from app.services.auth_revocation import revocation_list
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -32,12 +34,12 @@ async def forgot_password(
     if not user:
         return {"message": "If an account exists with this email, an OTP has been sent."}
     
+    # The OTP lives in Redis with its own TTL; the users row is not written
     otp = generate_otp()
-    expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
-    await save_user_otp(db, user, otp, expires_at)
+    await store_otp(user.id, otp)
     
-    if queue.email_pool:
-        await queue.email_pool.enqueue_job("send_otp_email", request.email, otp)
+    if queue.transactional_pool:
+        await queue.transactional_pool.enqueue_job("send_otp_email", request.email, otp)
     
     return {"message": "If an account exists with this email, an OTP has been sent."}
 
@@ -53,19 +55,26 @@ async def reset_password(
             detail="User not found",
         )
     
-    if not user.otp or user.otp != request.otp:
+    otp_check = await consume_otp(user.id, request.otp)
+    if otp_check == OTPCheck.INVALID:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid OTP",
         )
-    
-    if not user.otp_expires_at or datetime.now(timezone.utc) > user.otp_expires_at.replace(tzinfo=timezone.utc):
+    if otp_check == OTPCheck.MISSING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Expired OTP",
         )
+    if otp_check == OTPCheck.TOO_MANY_ATTEMPTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Too many attempts, request a new OTP",
+        )
     
     await update_user_password(db, user, request.new_password)
+    await auth_user_cache.invalidate(user.id)
+    await revocation_list.revoke(user.id)
     
     return {"message": "Password updated successfully"}
 
@@ -87,14 +96,15 @@ async def register(
             detail="A user with this username already exists.",
         )
     
-    user = await create_user(db, user_in=user_in)
-    
-    access_token = create_access_token(user.id, user.role.name)
-    refresh_token = create_refresh_token(user.id)
-    
-    # Update refresh token in DB
-    expiry = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    await update_refresh_token(db, user, refresh_token, expiry)
+    # User and its refresh token are written in one transaction
+    async with unit_of_work(db):
+        user = await create_user(db, user_in=user_in, commit=False)
+
+        access_token = create_access_token(user.id, user.role.name)
+        refresh_token = create_refresh_token(user.id)
+
+        expiry = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        await update_refresh_token(db, user, refresh_token, expiry, commit=False)
     
     return {
         "access_token": access_token,
@@ -168,6 +178,11 @@ async def refresh_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
+    if not user.is_active:
+        # Stateless mode never loads the user again, so no new tokens for deactivated users
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user"
+        )
     
     access_token = create_access_token(user.id, user.role.name)
     # Optionally rotate refresh token here as well
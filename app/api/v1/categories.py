@@ -6,7 +6,7 @@ from app.core.database import get_db
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.services.category_service import CategoryService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 async def create_category(
     category_in: CategoryCreate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = CategoryService(db)
     return await service.create_category(category_in=category_in, user_id=current_user.id)
@@ -24,7 +24,7 @@ async def create_category(
 @router.get("/", response_model=List[CategoryResponse])
 async def read_categories(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = CategoryService(db)
     return await service.list_user_categories(user_id=current_user.id)
@@ -34,7 +34,7 @@ async def read_categories(
 async def read_category(
     category_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = CategoryService(db)
     category = await service.get_category(category_id=category_id)
@@ -48,7 +48,7 @@ async def update_category(
     category_id: int, 
     category_in: CategoryUpdate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = CategoryService(db)
     category = await service.get_category(category_id=category_id)
@@ -61,7 +61,7 @@ async def update_category(
 async def delete_category(
     category_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = CategoryService(db)
     category = await service.get_category(category_id=category_id)
@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,7 +7,7 @@ from app.core.database import get_db
 from app.schemas.connected_account import ConnectedAccountCreate, ConnectedAccountUpdate, ConnectedAccountResponse
 from app.services.connected_account_service import ConnectedAccountService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/connected-accounts", tags=["connected-accounts"])
 
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/connected-accounts", tags=["connected-accounts"])
 async def create_connected_account(
     account_in: ConnectedAccountCreate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = ConnectedAccountService(db)
     return await service.create_account(account_in=account_in, user_id=current_user.id)
@@ -24,7 +25,7 @@ async def create_connected_account(
 @router.get("/", response_model=List[ConnectedAccountResponse])
 async def read_connected_accounts(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = ConnectedAccountService(db)
     return await service.list_user_accounts(user_id=current_user.id)
@@ -34,7 +35,7 @@ async def read_connected_accounts(
 async def read_connected_account(
     account_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = ConnectedAccountService(db)
     account = await service.get_account(account_id=account_id)
@@ -48,7 +49,7 @@ async def update_connected_account(
     account_id: int, 
     account_in: ConnectedAccountUpdate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = ConnectedAccountService(db)
     account = await service.get_account(account_id=account_id)
@@ -61,7 +62,7 @@ async def update_connected_account(
 async def delete_connected_account(
     account_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = ConnectedAccountService(db)
     account = await service.get_account(account_id=account_id)
@@ -78,7 +79,7 @@ async def delete_connected_account(
 async def authorize_account(
     account_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Unified endpoint to initiate authorization for any provider.
@@ -120,11 +121,14 @@ async def authorize_account(
 async def trigger_account_fetch(
     account_id: int,
     limit: int = 10,
+    backfill: bool = False,
+    since: Optional[datetime] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Trigger an immediate email fetch job for a specific account.
+    Set backfill=true to ingest the full mailbox (optionally only mail after `since`).
     """
     from app.services.task_service import TaskService
     
@@ -134,12 +138,20 @@ async def trigger_account_fetch(
     if not account or account.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Connected account not found")
 
-    await TaskService.enqueue_email_fetch(
+    result = await TaskService(db).enqueue_email_fetch(
         user_id=current_user.id,
         provider=account.provider.value,
         limit=limit,
-        account_id=account.id
+        account_id=account.id,
+        backfill=backfill,
+        since=since
     )
     
-    return {"message": f"Fetch job enqueued for {account.email}", "account_id": account_id}
+    state = "already pending" if result.coalesced else "enqueued"
+    return {
+        "message": f"Fetch job {state} for {account.email}",
+        "account_id": account_id,
+        "job_id": result.job.id,
+        "coalesced": result.coalesced
+    }
 
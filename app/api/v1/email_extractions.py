@@ -7,7 +7,7 @@ from app.schemas.email_extraction import EmailExtractionCreate, EmailExtractionR
 from app.services.email_extraction_service import EmailExtractionService
 from app.services.email_service import EmailService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/email-extractions", tags=["email-extractions"])
 
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/email-extractions", tags=["email-extractions"])
 async def create_extraction(
     extraction_in: EmailExtractionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     # Verify email belongs to user
     email_service = EmailService(db)
@@ -32,7 +32,7 @@ async def create_extraction(
 async def read_email_extractions(
     email_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     # Verify email belongs to user
     email_service = EmailService(db)
@@ -48,7 +48,7 @@ async def read_email_extractions(
 async def read_extraction(
     extraction_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = EmailExtractionService(db)
     extraction = await service.get_extraction(extraction_id)
@@ -68,7 +68,7 @@ async def read_extraction(
 async def delete_extraction(
     extraction_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = EmailExtractionService(db)
     extraction = await service.get_extraction(extraction_id)
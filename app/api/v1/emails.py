@@ -1,12 +1,14 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.pagination import Cursor, NEXT_CURSOR_HEADER, next_cursor
 from app.schemas.email import EmailCreate, EmailUpdate, EmailRead
 from app.services.email_service import EmailService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.dependencies.pagination import get_cursor
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/emails", tags=["emails"])
 
@@ -15,7 +17,7 @@ router = APIRouter(prefix="/emails", tags=["emails"])
 async def create_email(
     email_in: EmailCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = EmailService(db)
     if email_in.user_id != current_user.id:
@@ -25,22 +27,31 @@ async def create_email(
 
 @router.get("/", response_model=List[EmailRead])
 async def read_emails(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
+    """
+    Newest first. Pass the X-Next-Cursor response header back as `cursor` to
+    fetch the next page; `skip` is still accepted but slows down on deep pages.
+    """
     service = EmailService(db)
     # Admin can see all emails, regular user only their own
-    user_id = None if current_user.role.name == "admin" else current_user.id
-    return await service.list_user_emails(user_id=user_id, skip=skip, limit=limit)
+    user_id = None if current_user.role == "admin" else current_user.id
+    emails = await service.list_user_emails(user_id=user_id, skip=skip, limit=limit, cursor=cursor)
+    if page_cursor := next_cursor(emails, "received_at", limit):
+        response.headers[NEXT_CURSOR_HEADER] = page_cursor
+    return emails
 
 
 @router.get("/{email_id}", response_model=EmailRead)
 async def read_email(
     email_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = EmailService(db)
     email = await service.get_email(email_id)
@@ -54,7 +65,7 @@ async def update_email(
     email_id: int,
     email_in: EmailUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = EmailService(db)
     email = await service.get_email(email_id)
@@ -67,7 +78,7 @@ async def update_email(
 async def delete_email(
     email_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = EmailService(db)
     email = await service.get_email(email_id)
@@ -61,14 +61,15 @@ async def callback(
         if not account_id:
             raise HTTPException(status_code=400, detail="Missing account_id in state")
 
-        # Exchange authorization code for tokens
-        flow.fetch_token(code=code)
+        # Exchange authorization code for tokens (blocking HTTP, keep it off the event loop)
+        from app.email.providers.gmail import run_blocking
+        await run_blocking(flow.fetch_token, code=code)
         credentials = flow.credentials
         
         # Verify email matches the account's email (security check)
         from googleapiclient.discovery import build
-        user_info_service = build('oauth2', 'v2', credentials=credentials)
-        user_info = user_info_service.userinfo().get().execute()
+        user_info_service = await run_blocking(build, 'oauth2', 'v2', credentials=credentials)
+        user_info = await run_blocking(user_info_service.userinfo().get().execute)
         google_email = user_info.get('email')
         
         conn_service = ConnectedAccountService(db)
@@ -91,7 +92,7 @@ async def callback(
             token_expiry=credentials.expiry.replace(tzinfo=timezone.utc),
             is_active=True
         )
-        await conn_service.update_account(account_id, update_data)
+        await conn_service.update_account(account_id, update_data, commit=False)
         await db.commit()
         
         # Redirect back to frontend
@@ -1,13 +1,17 @@
+from datetime import datetime
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.pagination import Cursor, NEXT_CURSOR_HEADER, next_cursor
 from app.schemas.job import JobCreate, JobUpdate, JobRead
 from app.services.job_service import JobService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.dependencies.pagination import get_cursor
+from app.schemas.auth import CurrentUser
 from app.services.task_service import TaskService
+from app.services.connected_account_service import ConnectedAccountService
 from typing import Optional
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
@@ -17,28 +21,44 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 async def trigger_email_fetch(
     provider: str = "gmail",
     limit: int = 20,
-    current_user: User = Depends(get_current_user)
+    backfill: bool = False,
+    since: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    """Trigger a background job to fetch emails for the current user."""
-    await TaskService.enqueue_email_fetch(user_id=current_user.id, provider=provider, limit=limit)
-    return {"message": "Email fetch job enqueued"}
+    """
+    Trigger a background job to fetch emails for the current user's active `provider` account.
+    Set backfill=true to ingest the full mailbox (optionally only mail after `since`).
+    """
+    # Keyed by account like the scheduler's and the per-account endpoint's fetches, so they coalesce
+    account = await ConnectedAccountService(db).get_active_account(current_user.id, provider)
+    if account is None:
+        raise HTTPException(status_code=404, detail=f"No active {provider} account found")
+
+    result = await TaskService(db).enqueue_email_fetch(
+        user_id=current_user.id, account_id=account.id, provider=provider, limit=limit, backfill=backfill, since=since
+    )
+    message = "Email fetch job already pending" if result.coalesced else "Email fetch job enqueued"
+    return {"message": message, "job_id": result.job.id, "coalesced": result.coalesced}
 
 
 @router.post("/trigger/extract", status_code=status.HTTP_202_ACCEPTED)
 async def trigger_email_extraction(
     batch_size: int = 10,
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Trigger a background job to extract data from all pending emails."""
-    await TaskService.enqueue_email_extraction(batch_size=batch_size)
-    return {"message": "Email extraction job enqueued"}
+    result = await TaskService(db).enqueue_email_extraction(batch_size=batch_size)
+    message = "Email extraction job already pending" if result.coalesced else "Email extraction job enqueued"
+    return {"message": message, "job_id": result.job.id, "coalesced": result.coalesced}
 
 
 @router.post("/", response_model=JobRead, status_code=status.HTTP_201_CREATED)
 async def create_job(
     job_in: JobCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     # Jobs might be system-wide or triggered by any user, for now allow all auth users
     service = JobService(db)
@@ -47,23 +67,31 @@ async def create_job(
 
 @router.get("/", response_model=List[JobRead])
 async def read_jobs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     job_type: Optional[str] = None,
+    cursor: Optional[Cursor] = Depends(get_cursor),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
+    """Newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
     service = JobService(db)
-    user_id = None if current_user.role.name == "admin" else current_user.id
-    return await service.list_jobs(skip=skip, limit=limit, status=status, job_type=job_type, user_id=user_id)
+    user_id = None if current_user.role == "admin" else current_user.id
+    jobs = await service.list_jobs(
+        skip=skip, limit=limit, status=status, job_type=job_type, user_id=user_id, cursor=cursor
+    )
+    if page_cursor := next_cursor(jobs, "created_at", limit):
+        response.headers[NEXT_CURSOR_HEADER] = page_cursor
+    return jobs
 
 
 @router.get("/{job_id}", response_model=JobRead)
 async def read_job(
     job_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = JobService(db)
     job = await service.get_job(job_id)
@@ -77,7 +105,7 @@ async def update_job(
     job_id: int,
     job_in: JobUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = JobService(db)
     job = await service.get_job(job_id)
@@ -90,7 +118,7 @@ async def update_job(
 async def delete_job(
     job_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = JobService(db)
     job = await service.get_job(job_id)
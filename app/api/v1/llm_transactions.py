@@ -6,7 +6,7 @@ from app.core.database import get_db
 from app.schemas.llm_transaction import LLMTransactionCreate, LLMTransactionRead
 from app.services.llm_transaction_service import LLMTransactionService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/llm-transactions", tags=["llm-transactions"])
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/llm-transactions", tags=["llm-transactions"])
 async def create_transaction(
     transaction_in: LLMTransactionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = LLMTransactionService(db)
     return await service.create_transaction(transaction_in)
@@ -25,7 +25,7 @@ async def create_transaction(
 async def read_job_transactions(
     job_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = LLMTransactionService(db)
     return await service.list_job_transactions(job_id=job_id)
@@ -35,7 +35,7 @@ async def read_job_transactions(
 async def read_transaction(
     transaction_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = LLMTransactionService(db)
     transaction = await service.get_transaction(transaction_id)
@@ -48,7 +48,7 @@ async def read_transaction(
 async def delete_transaction(
     transaction_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = LLMTransactionService(db)
     transaction = await service.get_transaction(transaction_id)
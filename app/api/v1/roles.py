@@ -6,7 +6,7 @@ from app.core.database import get_db
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse
 from app.services.role_service import RoleService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/roles", tags=["roles"])
 async def create_role(
     role_in: RoleCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Create a new role.
@@ -32,7 +32,7 @@ async def read_roles(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     List all roles.
@@ -45,7 +45,7 @@ async def read_roles(
 async def read_role(
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get a specific role by ID.
@@ -62,7 +62,7 @@ async def update_role(
     role_id: int,
     role_in: RoleUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Update a role.
@@ -78,7 +78,7 @@ async def update_role(
 async def delete_role(
     role_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Delete a role.
@@ -1,12 +1,18 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
+from app.core.pagination import Cursor, NEXT_CURSOR_HEADER, next_cursor
+from app.models.transaction import TransactionType
+from app.schemas.transaction import (
+    TransactionCreate, TransactionUpdate, TransactionResponse, TransactionSummaryResponse
+)
 from app.services.transaction_service import TransactionService
 from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.dependencies.pagination import get_cursor
+from app.schemas.auth import CurrentUser
 
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
@@ -16,7 +22,7 @@ router = APIRouter(prefix="/transactions", tags=["transactions"])
 async def create_transaction(
     transaction_in: TransactionCreate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = TransactionService(db)
     return await service.create_transaction(transaction_in=transaction_in, user_id=current_user.id)
@@ -24,20 +30,47 @@ async def create_transaction(
 
 @router.get("/", response_model=List[TransactionResponse])
 async def read_transactions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[Cursor] = Depends(get_cursor),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
+    """Newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
     service = TransactionService(db)
-    return await service.list_user_transactions(user_id=current_user.id, skip=skip, limit=limit)
+    transactions = await service.list_user_transactions(
+        user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+    )
+    if page_cursor := next_cursor(transactions, "occurred_at", limit):
+        response.headers[NEXT_CURSOR_HEADER] = page_cursor
+    return transactions
+
+
+@router.get("/summary", response_model=List[TransactionSummaryResponse])
+async def read_transaction_summary(
+    from_month: Optional[date] = None,
+    to_month: Optional[date] = None,
+    type: Optional[TransactionType] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Totals and counts per month, category and type, oldest month first.
+    `from_month` / `to_month` are inclusive; any day of the month selects it.
+    `category_id` null is uncategorized.
+    """
+    service = TransactionService(db)
+    return await service.get_summary(
+        user_id=current_user.id, from_month=from_month, to_month=to_month, transaction_type=type
+    )
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 async def read_transaction(
     transaction_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = TransactionService(db)
     transaction = await service.get_transaction(transaction_id=transaction_id)
@@ -51,7 +84,7 @@ async def update_transaction(
     transaction_id: int, 
     transaction_in: TransactionUpdate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = TransactionService(db)
     transaction = await service.get_transaction(transaction_id=transaction_id)
@@ -64,7 +97,7 @@ async def update_transaction(
 async def delete_transaction(
     transaction_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = TransactionService(db)
     transaction = await service.get_transaction(transaction_id=transaction_id)
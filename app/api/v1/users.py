@@ -1,18 +1,20 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.pagination import Cursor, NEXT_CURSOR_HEADER, next_cursor
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.services.user_service import UserService
-from app.dependencies.auth import get_current_user
-from app.models.user import User
+from app.dependencies.auth import get_current_user, get_current_user_profile
+from app.dependencies.pagination import get_cursor
+from app.schemas.auth import CurrentUser
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserResponse)
-async def read_user_me(current_user: User = Depends(get_current_user)):
+async def read_user_me(current_user: CurrentUser = Depends(get_current_user_profile)):
     return current_user
 
 
@@ -20,7 +22,7 @@ async def read_user_me(current_user: User = Depends(get_current_user)):
 async def create_user(
     user_in: UserCreate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = UserService(db)
     # Optional: Check if current_user is admin
@@ -35,20 +37,26 @@ async def create_user(
 
 @router.get("/", response_model=List[UserResponse])
 async def read_users(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[Cursor] = Depends(get_cursor),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
+    """Newest first. Pass the X-Next-Cursor response header back as `cursor` for the next page."""
     service = UserService(db)
-    return await service.get_users(skip=skip, limit=limit)
+    users = await service.get_users(skip=skip, limit=limit, cursor=cursor)
+    if page_cursor := next_cursor(users, "created_at", limit):
+        response.headers[NEXT_CURSOR_HEADER] = page_cursor
+    return users
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     service = UserService(db)
     db_user = await service.get_user(user_id=user_id)
@@ -62,7 +70,7 @@ async def update_user(
     user_id: int,     
     user_in: UserUpdate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     # Logic: users can only update themselves unless they are admin
     if current_user.id != user_id:
@@ -79,7 +87,7 @@ async def update_user(
 async def delete_user(
     user_id: int, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
@@ -1,14 +1,43 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Optional
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     REDIS_URL: str
+
+    # Database engine. Log every SQL statement only when debugging.
+    DB_ECHO: bool = False
+    # Connection pool per process, by profile: API server vs ARQ worker processes
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_WORKER_POOL_SIZE: int = 5
+    DB_WORKER_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Replace connections older than this (below server/proxy idle timeouts)
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Test each connection on checkout; drops connections killed by failovers or restarts
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statements cached per connection (0 behind PgBouncer in transaction mode)
+    DB_STATEMENT_CACHE_SIZE: int = 500
     
     SECRET_KEY: str = "your-super-secret-key-change-it"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Threads running bcrypt for the API process (None: one per CPU core)
+    PASSWORD_HASH_MAX_WORKERS: Optional[int] = None
+    # Authenticated user cache used by get_current_user. The in-process tier is not
+    # invalidated across processes, so its TTL bounds how long another API process may
+    # still see a user as it was before an update or deactivation.
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_LOCAL_TTL_SECONDS: int = 5
+    # Opt-in: trust access token claims (sub, role) without loading the user. Deactivation,
+    # deletion and password changes revoke tokens through a Redis map that every API process
+    # syncs every AUTH_REVOCATION_SYNC_SECONDS, so they take up to that long to apply elsewhere.
+    AUTH_STATELESS_MODE: bool = False
+    AUTH_REVOCATION_SYNC_SECONDS: int = 10
 
     BACKEND_URL: str = "http://localhost:8000"
     FRONTEND_URL: str = "http://localhost:5174"
@@ -17,6 +46,85 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str = "GOOGLE_CLIENT_SECRET"
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/api/v1/auth/google/callback"
 
+    # Threads dedicated to blocking Google client calls (discovery, token refresh, execute)
+    GMAIL_EXECUTOR_MAX_WORKERS: int = 8
+    # Built Gmail services kept per connected account (LRU)
+    GMAIL_SERVICE_CACHE_SIZE: int = 256
+
+    # Outgoing email ("console" prints, "smtp" delivers). The transactional worker keeps up to
+    # SMTP_POOL_SIZE connections open and reuses them for every message.
+    EMAIL_SENDER: str = "console"
+    EMAIL_FROM_ADDRESS: str = "no-reply@example.com"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    # Implicit TLS (port 465); otherwise STARTTLS is used when the server offers it
+    SMTP_USE_TLS: bool = False
+    SMTP_POOL_SIZE: int = 4
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+
+    # LLM provider ("mock" or "openai"; any OpenAI-compatible endpoint via LLM_BASE_URL)
+    LLM_PROVIDER: str = "mock"
+    LLM_MODEL: str = "gpt-4o"
+    LLM_API_KEY: Optional[str] = None
+    LLM_BASE_URL: Optional[str] = None
+    # Pooled HTTP connections to the LLM endpoint per worker process
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_TIMEOUT_SECONDS: float = 60.0
+
+    # Shared (Redis) limits per model across all workers; 0 disables a limit
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 200000
+    # Retries when the provider itself answers 429
+    LLM_RATE_LIMIT_MAX_RETRIES: int = 5
+
+    # How long an extraction job owns the emails it claimed; must exceed the job timeout
+    EXTRACTION_LEASE_SECONDS: int = 900
+    # Concurrent LLM calls per EmailExtractionJob batch
+    EXTRACTION_CONCURRENCY: int = 10
+    # Extraction jobs that may run at once (ARQ ids extract:0..n-1), each draining PENDING emails;
+    # at least 2, so a job stopping at its slice can hand over to another
+    EXTRACTION_MAX_JOBS: int = 4
+    # An extraction job stops claiming batches after this long; keep it below EMAIL_WORKER_JOB_TIMEOUT_SECONDS
+    EXTRACTION_SLICE_SECONDS: int = 480
+    # Fraction of MockLLMProvider's reported latency to actually sleep (0 = instant)
+    MOCK_LLM_LATENCY_SCALE: float = 0.0
+    # LLM result cache: in-process LRU entries and TTL shared by both tiers
+    LLM_CACHE_MAX_SIZE: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Background jobs: retries after the first attempt, with exponential backoff and jitter.
+    # Jobs still failing after JOB_MAX_RETRIES retries are moved to DEAD_LETTER.
+    JOB_MAX_RETRIES: int = 3
+    JOB_RETRY_BASE_DELAY_SECONDS: float = 30.0
+    JOB_RETRY_MAX_DELAY_SECONDS: float = 1800.0
+
+    # ARQ workers, per queue: concurrent jobs per process, job timeout and how long results are kept.
+    # The email queue timeout must stay below EXTRACTION_LEASE_SECONDS.
+    BASE_WORKER_MAX_JOBS: int = 10
+    BASE_WORKER_JOB_TIMEOUT_SECONDS: int = 300
+    BASE_WORKER_KEEP_RESULT_SECONDS: int = 3600
+    EMAIL_WORKER_MAX_JOBS: int = 10
+    EMAIL_WORKER_JOB_TIMEOUT_SECONDS: int = 600
+    EMAIL_WORKER_KEEP_RESULT_SECONDS: int = 3600
+    # A backfill job stops paging after this long and continues in a new job; keep it well
+    # below EMAIL_WORKER_JOB_TIMEOUT_SECONDS (a page can take several seconds)
+    EMAIL_BACKFILL_SLICE_SECONDS: int = 480
+    # Transactional emails (OTPs, notifications): short, latency-sensitive jobs
+    TRANSACTIONAL_WORKER_MAX_JOBS: int = 50
+    TRANSACTIONAL_WORKER_JOB_TIMEOUT_SECONDS: int = 30
+    TRANSACTIONAL_WORKER_KEEP_RESULT_SECONDS: int = 300
+
+    # Periodic email fetches: every active account is polled on its own interval, halved when
+    # a fetch finds new mail and doubled when it finds none, within the MIN/MAX bounds.
+    EMAIL_POLL_ENABLED: bool = True
+    EMAIL_POLL_DEFAULT_INTERVAL_SECONDS: int = 600
+    EMAIL_POLL_MIN_INTERVAL_SECONDS: int = 120
+    EMAIL_POLL_MAX_INTERVAL_SECONDS: int = 3600
+    EMAIL_POLL_JITTER: float = 0.1
+    EMAIL_POLL_BATCH_SIZE: int = 1000
+
     class Config:
         env_file = Path(__file__).resolve().parents[2] / ".env"
         env_file_encoding = "utf-8"
@@ -1,10 +1,38 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+# Pool sizing per process type: the API serves many short requests concurrently,
+# a worker process only needs a connection per running job (max_jobs).
+POOL_PROFILES: Dict[str, Dict[str, int]] = {
+    "api": {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW},
+    "worker": {"pool_size": settings.DB_WORKER_POOL_SIZE, "max_overflow": settings.DB_WORKER_MAX_OVERFLOW},
+}
+
+
+def engine_options(profile: str = "api") -> Dict[str, Any]:
+    """Keyword arguments for create_async_engine under the given pool profile."""
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+    if make_url(DATABASE_URL).get_backend_name() != "postgresql":
+        # e.g. SQLite for local scripts: keep the dialect's default pool
+        return options
+    options.update(
+        POOL_PROFILES[profile],
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    return options
+
+
+engine: AsyncEngine = create_async_engine(DATABASE_URL, **engine_options("api"))
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -14,6 +42,46 @@ AsyncSessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+
+def configure_database(profile: str) -> AsyncEngine:
+    """
+    Rebuild the engine for this process's profile ("api" or "worker") and rebind
+    AsyncSessionLocal to it. Call once at process startup, before the first session.
+    """
+    global engine
+    options = engine_options(profile)
+    engine = create_async_engine(DATABASE_URL, **options)
+    AsyncSessionLocal.configure(bind=engine)
+
+    effective = {key: value for key, value in options.items() if key not in ("future", "connect_args")}
+    effective.update(options.get("connect_args", {}))
+    print(f"Database engine ({profile}): " + ", ".join(f"{key}={value}" for key, value in effective.items()))
+    return engine
+
+
+async def close_database() -> None:
+    """Close all pooled connections (process shutdown)."""
+    await engine.dispose()
+
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Commit everything written inside the block once, or roll it all back on error.
+    Pair with the `commit=False` mode of the CRUD functions, which only flush:
+
+        async with unit_of_work(db):
+            user = await create_user(db, user_in, commit=False)
+            await update_refresh_token(db, user, token, expiry, commit=False)
+    """
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
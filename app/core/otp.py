@@ -1,10 +1,85 @@
-import random
+import secrets
 import string
-from typing import Optional
-from app.core.redis import redis_client
+from enum import Enum
+
+from app.core import redis as redis_core
 
 OTP_EXPIRY = 300  # 5 minutes in seconds
+# Wrong guesses allowed per OTP; the next one burns it and a new OTP must be requested
+OTP_MAX_ATTEMPTS = 5
+OTP_KEY_PREFIX = "otp"
+
+# Single-use check of a password reset OTP, atomic in Redis.
+# KEYS[1]: OTP, KEYS[2]: failed attempts counter
+# ARGV[1]: submitted OTP, ARGV[2]: max attempts
+# Returns 1 when it matched (and is consumed), 0 on a wrong guess, -1 when there is
+# no OTP (never requested, expired or already used), -2 when this guess used up the attempts.
+# The counter gets the OTP's absolute expiry (PEXPIRETIME, Redis 7), so both keys expire
+# at the same millisecond; copying the remaining PTTL would let the counter outlive it.
+CONSUME_OTP_SCRIPT = """
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return -1
+end
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+local attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then
+    redis.call('PEXPIREAT', KEYS[2], redis.call('PEXPIRETIME', KEYS[1]))
+end
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return -2
+end
+return 0
+"""
+
+
+class OTPCheck(str, Enum):
+    VALID = "valid"
+    INVALID = "invalid"
+    MISSING = "missing"
+    TOO_MANY_ATTEMPTS = "too_many_attempts"
+
+
+_SCRIPT_RESULTS = {1: OTPCheck.VALID, 0: OTPCheck.INVALID, -1: OTPCheck.MISSING, -2: OTPCheck.TOO_MANY_ATTEMPTS}
+_script = None
+_script_client = None
+
 
 def generate_otp(length: int = 6) -> str:
     """Generate a random numeric OTP."""
-    return "".join(random.choices(string.digits, k=length))
+    return "".join(secrets.choice(string.digits) for _ in range(length))
+
+
+def _keys(user_id: int):
+    return [f"{OTP_KEY_PREFIX}:{user_id}", f"{OTP_KEY_PREFIX}:{user_id}:attempts"]
+
+
+def _get_client():
+    client = redis_core.redis_client
+    if client is None:
+        raise RuntimeError("Redis is not initialized. Ensure the application is running.")
+    return client
+
+
+async def store_otp(user_id: int, otp: str) -> None:
+    """Store a new OTP for the user, replacing any previous one and its failed attempts."""
+    otp_key, attempts_key = _keys(user_id)
+    async with _get_client().pipeline(transaction=True) as pipe:
+        pipe.set(otp_key, otp, ex=OTP_EXPIRY)
+        pipe.delete(attempts_key)
+        await pipe.execute()
+
+
+async def consume_otp(user_id: int, otp: str) -> OTPCheck:
+    """Check a submitted OTP; a matching OTP is deleted, so it can only be used once."""
+    global _script, _script_client
+    client = _get_client()
+    if _script_client is not client:
+        _script = client.register_script(CONSUME_OTP_SCRIPT)
+        _script_client = client
+    result = await _script(keys=_keys(user_id), args=[otp, OTP_MAX_ATTEMPTS])
+    return _SCRIPT_RESULTS[int(result)]
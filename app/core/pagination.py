@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Position of the last row of a page: (sort key, id)
+Cursor = Tuple[datetime, int]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(sort_value: datetime, id: int) -> str:
+    """Opaque, URL-safe cursor for the row after which the next page starts."""
+    raw = json.dumps([sort_value.isoformat(), id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def keyset_paginate(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[Cursor] = None
+) -> Select:
+    """
+    Order newest first by (sort_column, id) and, with a cursor, start strictly after it.
+    The row-value comparison lets PostgreSQL seek straight to the position in a
+    (…, sort_column) index instead of reading and discarding OFFSET rows.
+    """
+    if cursor is not None:
+        query = query.where(tuple_(sort_column, id_column) < tuple_(*cursor))
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+def next_cursor(items: Sequence[Any], sort_attr: str, limit: int) -> Optional[str]:
+    """Cursor for the page after `items`, or None when this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
@@ -4,3 +4,4 @@ from arq.connections import ArqRedis
 # These are populated by the setup system during app lifespan
 base_pool: ArqRedis | None = None
 email_pool: ArqRedis | None = None
+transactional_pool: ArqRedis | None = None
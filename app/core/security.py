@@ -1,3 +1,9 @@
+import asyncio
+import functools
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -8,6 +14,32 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Refresh tokens are signed JWTs (high entropy), so a keyed hash is enough to store them
+REFRESH_TOKEN_HASH_PREFIX = "hmac-sha256$"
+
+# bcrypt takes 100-250ms of CPU per call and releases the GIL while hashing. Async code
+# runs it on this bounded executor so the event loop keeps serving other requests and
+# concurrent logins use up to PASSWORD_HASH_MAX_WORKERS cores.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_MAX_WORKERS or os.cpu_count() or 1,
+            thread_name_prefix="password-hash"
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the password hashing executor (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -17,6 +49,37 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing executor; use this from async code."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(verify_password, plain_password, hashed_password)
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing executor; use this from async code."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(get_password_hash, password))
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    digest = hmac.new(settings.SECRET_KEY.encode(), refresh_token.encode(), hashlib.sha256).hexdigest()
+    return f"{REFRESH_TOKEN_HASH_PREFIX}{digest}"
+
+
+def is_legacy_refresh_token_hash(stored_hash: str) -> bool:
+    """Refresh token hashes written before HMAC storage are bcrypt hashes."""
+    return not stored_hash.startswith(REFRESH_TOKEN_HASH_PREFIX)
+
+
+async def verify_refresh_token_hash(refresh_token: str, stored_hash: str) -> bool:
+    """Constant-time check of a refresh token against its stored hash (HMAC or legacy bcrypt)."""
+    if is_legacy_refresh_token_hash(stored_hash):
+        return await verify_password_async(refresh_token, stored_hash)
+    return hmac.compare_digest(hash_refresh_token(refresh_token), stored_hash)
+
+
 def create_access_token(
     user_id: int, role_name: str, expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -30,6 +93,7 @@ def create_access_token(
         "sub": str(user_id),
         "role": role_name,
         "type": "access",
+        "iat": datetime.now(timezone.utc),
         "exp": expire
     }
     encoded_jwt = jwt.encode(
@@ -50,6 +114,7 @@ def create_refresh_token(
     to_encode = {
         "sub": str(user_id),
         "type": "refresh",
+        "iat": datetime.now(timezone.utc),
         "exp": expire
     }
     encoded_jwt = jwt.encode(
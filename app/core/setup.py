@@ -5,10 +5,16 @@ from fastapi import APIRouter, FastAPI
 from arq.connections import RedisSettings, create_pool
 from fastapi import APIRouter, FastAPI
 from app.core.config import settings
+from app.core.database import configure_database, close_database
 from app.core.redis import init_redis, close_redis
+from app.core.security import shutdown_executor as shutdown_password_executor
+from app.email.providers.gmail import shutdown_executor as shutdown_gmail_executor
+from app.services.auth_revocation import revocation_list
 from app.core import queue
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.core.worker.base_settings import WorkerSettings as BaseWorkerSettings
 from app.core.worker.email_settings import WorkerSettings as EmailWorkerSettings
+from app.core.worker.transactional_settings import WorkerSettings as TransactionalWorkerSettings
 
 
 async def create_redis_queue_pools() -> None:
@@ -19,6 +25,9 @@ async def create_redis_queue_pools() -> None:
     # Pool for email queue (DB 2)
     queue.email_pool = await create_pool(EmailWorkerSettings.redis_settings)
 
+    # Pool for transactional email queue (DB 3)
+    queue.transactional_pool = await create_pool(TransactionalWorkerSettings.redis_settings)
+
 
 async def close_redis_queue_pools() -> None:
     """Close all ARQ pools gracefully."""
@@ -28,18 +37,30 @@ async def close_redis_queue_pools() -> None:
     if queue.email_pool:
         await queue.email_pool.close()
         queue.email_pool = None
+    if queue.transactional_pool:
+        await queue.transactional_pool.close()
+        queue.transactional_pool = None
 
 
 async def setup_infrastructure():
     """Initialize all infrastructure components."""
+    configure_database("api")
     await init_redis()
     await create_redis_queue_pools()
+    if settings.AUTH_STATELESS_MODE:
+        await revocation_list.sync()
+        revocation_list.start()
 
 
 async def teardown_infrastructure():
     """Close all infrastructure connections."""
+    await revocation_list.stop()
     await close_redis_queue_pools()
     await close_redis()
+    await close_database()
+    shutdown_password_executor()
+    # Google OAuth callback calls run on the Gmail executor
+    shutdown_gmail_executor()
 
 
 @asynccontextmanager
@@ -72,6 +93,8 @@ def create_application(router: APIRouter, **kwargs: Any) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Lets browser clients read the keyset pagination cursor
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
     
     # Include the main router
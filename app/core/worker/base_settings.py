@@ -1,17 +1,23 @@
 from arq.connections import RedisSettings
 from app.core.config import settings
+from app.core.database import configure_database, close_database
 from app.workers.jobs import sample_task
 
 async def startup(ctx):
     print("Base Worker starting...")
+    configure_database("worker")
 
 async def shutdown(ctx):
     print("Base Worker shutting down...")
+    await close_database()
 
 class WorkerSettings:
     functions = [sample_task]
     redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
     # Use database 1 for base queue
     redis_settings.database = 1
+    max_jobs = settings.BASE_WORKER_MAX_JOBS
+    job_timeout = settings.BASE_WORKER_JOB_TIMEOUT_SECONDS
+    keep_result = settings.BASE_WORKER_KEEP_RESULT_SECONDS
     on_startup = startup
     on_shutdown = shutdown
@@ -1,17 +1,47 @@
+from arq import cron, func
 from arq.connections import RedisSettings
 from app.core.config import settings
-from app.workers.jobs import send_email, send_otp_email, run_email_fetch, run_email_extraction
+from app.core.database import configure_database, close_database
+from app.workers.jobs import run_email_fetch, run_email_extraction
+from app.workers.scheduler import SCHEDULER_TICK_SECONDS, schedule_email_fetches
+from app.core.redis import init_redis, close_redis
+from app.email.providers.gmail import shutdown_executor, load_discovery_document
+from app.llm.providers import close_client as close_llm_client
 
 async def startup(ctx):
     print("Email Worker starting...")
+    configure_database("worker")
+    # Parse the Gmail discovery document once, before the first job needs it
+    load_discovery_document()
+    # Shared tier of the LLM result cache
+    await init_redis()
 
 async def shutdown(ctx):
     print("Email Worker shutting down...")
+    shutdown_executor()
+    await close_llm_client()
+    await close_redis()
+    await close_database()
 
 class WorkerSettings:
-    functions = [send_email, send_otp_email, run_email_fetch, run_email_extraction]
+    # Results of deduplicated jobs are not kept: a finished `fetch:{account_id}` / `extract:{slot}`
+    # job id must be free to enqueue again (see TaskService)
+    # (send_email / send_otp_email run on the transactional queue)
+    functions = [
+        func(run_email_fetch, keep_result=0),
+        func(run_email_extraction, keep_result=0)
+    ]
+    # Periodic per-account fetches (once a minute, one worker per tick)
+    cron_jobs = [
+        cron(schedule_email_fetches, second=0, timeout=SCHEDULER_TICK_SECONDS)
+    ] if settings.EMAIL_POLL_ENABLED else []
     redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
     # Use database 2 for email queue
     redis_settings.database = 2
+    max_jobs = settings.EMAIL_WORKER_MAX_JOBS
+    job_timeout = settings.EMAIL_WORKER_JOB_TIMEOUT_SECONDS
+    keep_result = settings.EMAIL_WORKER_KEEP_RESULT_SECONDS
+    # First attempt plus JOB_MAX_RETRIES retries; JobRunner dead-letters the record on the last one
+    max_tries = settings.JOB_MAX_RETRIES + 1
     on_startup = startup
     on_shutdown = shutdown
@@ -0,0 +1,30 @@
+from arq.connections import RedisSettings
+from app.core.config import settings
+from app.core.database import configure_database, close_database
+from app.email.senders import EmailSenderFactory
+from app.workers.jobs import send_email, send_otp_email
+
+async def startup(ctx):
+    print("Transactional Worker starting...")
+    configure_database("worker")
+    # One sender per process: its SMTP connections are reused by every job
+    ctx["email_sender"] = EmailSenderFactory.get_sender()
+    await ctx["email_sender"].open()
+    print(f"Email sender: {ctx['email_sender'].name}")
+
+async def shutdown(ctx):
+    print("Transactional Worker shutting down...")
+    await ctx["email_sender"].close()
+    await close_database()
+
+class WorkerSettings:
+    # Latency-sensitive emails only, so a backfill on the email queue never delays an OTP
+    functions = [send_email, send_otp_email]
+    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
+    # Use database 3 for transactional queue
+    redis_settings.database = 3
+    max_jobs = settings.TRANSACTIONAL_WORKER_MAX_JOBS
+    job_timeout = settings.TRANSACTIONAL_WORKER_JOB_TIMEOUT_SECONDS
+    keep_result = settings.TRANSACTIONAL_WORKER_KEEP_RESULT_SECONDS
+    on_startup = startup
+    on_shutdown = shutdown
@@ -8,7 +8,13 @@ from sqlalchemy.orm import selectinload
 from app.models.user import User
 from app.models.role import Role
 from app.schemas.auth import UserRegister
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash_async,
+    hash_refresh_token,
+    is_legacy_refresh_token_hash,
+    verify_password_async,
+    verify_refresh_token_hash,
+)
 
 
 async def get_role_by_name(db: AsyncSession, name: str) -> Optional[Role]:
@@ -16,13 +22,16 @@ async def get_role_by_name(db: AsyncSession, name: str) -> Optional[Role]:
     return result.scalars().first()
 
 
-async def get_default_role(db: AsyncSession) -> Role:
+async def get_default_role(db: AsyncSession, commit: bool = True) -> Role:
     role = await get_role_by_name(db, "user")
     if not role:
         role = Role(name="user")
         db.add(role)
-        await db.commit()
-        await db.refresh(role)
+        if commit:
+            await db.commit()
+            await db.refresh(role)
+        else:
+            await db.flush()
     return role
 
 
@@ -47,16 +56,20 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     return result.scalars().first()
 
 
-async def create_user(db: AsyncSession, user_in: UserRegister) -> User:
-    role = await get_default_role(db)
+async def create_user(db: AsyncSession, user_in: UserRegister, commit: bool = True) -> User:
+    role = await get_default_role(db, commit=commit)
     db_user = User(
         name=user_in.name,
         username=user_in.username,
         primary_email=user_in.primary_email,
-        password_hash=get_password_hash(user_in.password),
-        role_id=role.id,
+        password_hash=await get_password_hash_async(user_in.password),
+        role=role,
     )
     db.add(db_user)
+    if not commit:
+        # Role is already attached, nothing to reload
+        await db.flush()
+        return db_user
     await db.commit()
     await db.refresh(db_user)
     # Reload with role
@@ -75,25 +88,31 @@ async def authenticate_user(
     user = result.scalars().first()
     if not user:
         return None
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         return None
     return user
 
 
 async def update_refresh_token(
-    db: AsyncSession, user: User, refresh_token: str, expiry: datetime
+    db: AsyncSession, user: User, refresh_token: str, expiry: datetime, commit: bool = True
 ) -> None:
-    # We store the raw token or hashed? Requirement says recommended hashed.
-    # But for ease of refresh, we might just store hashed and verify.
-    # Let's use get_password_hash/verify_password for consistency
-    user.refresh_token = get_password_hash(refresh_token)
+    # Only a keyed hash of the token is stored
+    user.refresh_token = hash_refresh_token(refresh_token)
     user.refresh_token_expiry = expiry
-    await db.commit()
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
 
 
 async def verify_refresh_token(
-    db: AsyncSession, user_id: int, refresh_token: str
+    db: AsyncSession, user_id: int, refresh_token: str, commit: bool = True
 ) -> Optional[User]:
+    """
+    The user whose stored refresh token matches and has not expired.
+    A match against a legacy bcrypt hash rewrites it as an HMAC hash, so
+    sessions from before the switch keep working and only pay bcrypt once.
+    """
     user = await get_user_by_id(db, user_id)
     if not user or not user.refresh_token or not user.refresh_token_expiry:
         return None
@@ -101,33 +120,27 @@ async def verify_refresh_token(
     if datetime.now(timezone.utc) > user.refresh_token_expiry.replace(tzinfo=timezone.utc):
         return None
         
-    if not verify_password(refresh_token, user.refresh_token):
+    if not await verify_refresh_token_hash(refresh_token, user.refresh_token):
         return None
-        
+
+    if is_legacy_refresh_token_hash(user.refresh_token):
+        user.refresh_token = hash_refresh_token(refresh_token)
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
+
     return user
 
 
 async def update_user_password(
-    db: AsyncSession, user: User, new_password: str
+    db: AsyncSession, user: User, new_password: str, commit: bool = True
 ) -> None:
-    user.password_hash = get_password_hash(new_password)
+    user.password_hash = await get_password_hash_async(new_password)
     # Also invalidate refresh sessions on password change
     user.refresh_token = None
     user.refresh_token_expiry = None
-    user.otp = None
-    user.otp_expires_at = None
-    await db.commit()
-
-
-async def save_user_otp(
-    db: AsyncSession, user: User, otp: str, expires_at: datetime
-) -> None:
-    user.otp = otp
-    user.otp_expires_at = expires_at
-    await db.commit()
-
-
-async def clear_user_otp(db: AsyncSession, user: User) -> None:
-    user.otp = None
-    user.otp_expires_at = None
-    await db.commit()
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
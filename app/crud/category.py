@@ -5,14 +5,17 @@ from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
 
-async def create_category(db: AsyncSession, category_in: CategoryCreate, user_id: int) -> Category:
+async def create_category(db: AsyncSession, category_in: CategoryCreate, user_id: int, commit: bool = True) -> Category:
     db_category = Category(
         **category_in.model_dump(exclude={"user_id"}),
         user_id=user_id
     )
     db.add(db_category)
-    await db.commit()
-    await db.refresh(db_category)
+    if commit:
+        await db.commit()
+        await db.refresh(db_category)
+    else:
+        await db.flush()
     return db_category
 
 
@@ -33,21 +36,27 @@ async def get_category_by_name(db: AsyncSession, user_id: int, name: str) -> Opt
     return result.scalars().first()
 
 
-async def update_category(db: AsyncSession, db_category: Category, category_in: CategoryUpdate) -> Category:
+async def update_category(db: AsyncSession, db_category: Category, category_in: CategoryUpdate, commit: bool = True) -> Category:
     category_data = category_in.model_dump(exclude_unset=True)
     for field, value in category_data.items():
         setattr(db_category, field, value)
     
     db.add(db_category)
-    await db.commit()
-    await db.refresh(db_category)
+    if commit:
+        await db.commit()
+        await db.refresh(db_category)
+    else:
+        await db.flush()
     return db_category
 
 
-async def delete_category(db: AsyncSession, category_id: int) -> bool:
+async def delete_category(db: AsyncSession, category_id: int, commit: bool = True) -> bool:
     db_category = await get_category(db, category_id)
     if db_category:
         await db.delete(db_category)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
@@ -1,5 +1,6 @@
+from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.connected_account import ConnectedAccount
 from app.schemas.connected_account import ConnectedAccountCreate, ConnectedAccountUpdate
@@ -8,15 +9,19 @@ from app.schemas.connected_account import ConnectedAccountCreate, ConnectedAccou
 async def create_connected_account(
     db: AsyncSession, 
     account_in: ConnectedAccountCreate, 
-    user_id: int
+    user_id: int,
+    commit: bool = True
 ) -> ConnectedAccount:
     db_account = ConnectedAccount(
         **account_in.model_dump(exclude={"user_id"}),
         user_id=user_id
     )
     db.add(db_account)
-    await db.commit()
-    await db.refresh(db_account)
+    if commit:
+        await db.commit()
+        await db.refresh(db_account)
+    else:
+        await db.flush()
     return db_account
 
 
@@ -30,25 +35,47 @@ async def get_connected_accounts_by_user(db: AsyncSession, user_id: int) -> List
     return list(result.scalars().all())
 
 
+async def get_accounts_due_for_poll(db: AsyncSession, until: datetime, limit: int) -> List[ConnectedAccount]:
+    """Active, non-revoked accounts whose next fetch is due before `until` (never scheduled first)."""
+    result = await db.execute(
+        select(ConnectedAccount)
+        .where(
+            ConnectedAccount.is_active,
+            ConnectedAccount.revoked_at.is_(None),
+            or_(ConnectedAccount.next_poll_at.is_(None), ConnectedAccount.next_poll_at < until)
+        )
+        .order_by(ConnectedAccount.next_poll_at.asc().nulls_first())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
 async def update_connected_account(
     db: AsyncSession, 
     db_account: ConnectedAccount, 
-    account_in: ConnectedAccountUpdate
+    account_in: ConnectedAccountUpdate,
+    commit: bool = True
 ) -> ConnectedAccount:
     account_data = account_in.model_dump(exclude_unset=True)
     for field, value in account_data.items():
         setattr(db_account, field, value)
     
     db.add(db_account)
-    await db.commit()
-    await db.refresh(db_account)
+    if commit:
+        await db.commit()
+        await db.refresh(db_account)
+    else:
+        await db.flush()
     return db_account
 
 
-async def delete_connected_account(db: AsyncSession, account_id: int) -> bool:
+async def delete_connected_account(db: AsyncSession, account_id: int, commit: bool = True) -> bool:
     db_account = await get_connected_account(db, account_id)
     if db_account:
         await db.delete(db_account)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
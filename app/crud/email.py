@@ -1,18 +1,115 @@
-from typing import List, Optional
-from sqlalchemy import select
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+from sqlalchemy import Select, Update, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor, keyset_paginate
 from app.models.email import Email
 from app.schemas.email import EmailCreate, EmailUpdate
 
 
-async def create_email(db: AsyncSession, obj_in: EmailCreate) -> Email:
+async def create_email(db: AsyncSession, obj_in: EmailCreate, commit: bool = True) -> Email:
     db_obj = Email(**obj_in.model_dump())
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    if commit:
+        await db.commit()
+        await db.refresh(db_obj)
+    else:
+        await db.flush()
     return db_obj
 
 
+async def bulk_upsert_emails(
+    db: AsyncSession,
+    objs_in: Sequence[EmailCreate],
+    chunk_size: int = 500,
+    commit: bool = True
+) -> List[int]:
+    """
+    Insert emails in chunks, skipping rows that already exist.
+    Uses one INSERT ... ON CONFLICT DO NOTHING RETURNING id per chunk and
+    a single commit for the whole batch (none if commit=False). Returns the
+    ids of inserted rows.
+    """
+    inserted_ids: List[int] = []
+    for start in range(0, len(objs_in), chunk_size):
+        chunk = objs_in[start:start + chunk_size]
+        stmt = (
+            insert(Email)
+            .values([obj.model_dump() for obj in chunk])
+            .on_conflict_do_nothing(constraint="uq_email_provider_message_id")
+            .returning(Email.id)
+        )
+        result = await db.execute(stmt)
+        inserted_ids.extend(result.scalars().all())
+    if commit:
+        await db.commit()
+    return inserted_ids
+
+
+def expired_leases_query(now: datetime) -> Update:
+    """Requeue IN_PROGRESS rows whose lease has expired (crashed or killed worker)."""
+    return (
+        update(Email)
+        .where(
+            Email.extraction_status == "IN_PROGRESS",
+            Email.extraction_lease_expires_at < now
+        )
+        .values(extraction_status="PENDING", extraction_lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claim_candidates_query(limit: int, reprocess: bool = False) -> Select:
+    """
+    Oldest claimable rows, locked with FOR UPDATE SKIP LOCKED.
+    The PENDING case is served in id order by the ix_emails_pending_extraction partial index.
+    """
+    claimable = (
+        Email.extraction_status != "IN_PROGRESS" if reprocess
+        else Email.extraction_status == "PENDING"
+    )
+    return (
+        select(Email.id)
+        .where(claimable)
+        .order_by(Email.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+
+async def claim_pending_emails(
+    db: AsyncSession,
+    limit: int,
+    lease_seconds: int,
+    reprocess: bool = False
+) -> List[Email]:
+    """
+    Atomically claim up to `limit` emails for extraction and commit the claim.
+    Candidate rows are locked with FOR UPDATE SKIP LOCKED, so concurrent
+    claimers never receive the same email. Claimed rows move to IN_PROGRESS
+    with a lease; rows whose lease has expired are requeued and claimed again.
+    """
+    now = datetime.now(timezone.utc)
+    await db.execute(expired_leases_query(now))
+
+    candidates = claim_candidates_query(limit, reprocess).cte("candidates")
+    stmt = (
+        update(Email)
+        .where(Email.id == candidates.c.id)
+        .values(
+            extraction_status="IN_PROGRESS",
+            extraction_lease_expires_at=now + timedelta(seconds=lease_seconds)
+        )
+        .returning(Email)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    claimed = list(result.scalars().all())
+    await db.commit()
+    return claimed
+
+
 async def get_email(db: AsyncSession, id: int) -> Optional[Email]:
     result = await db.execute(select(Email).where(Email.id == id))
     return result.scalars().first()
@@ -29,30 +126,42 @@ async def get_email_by_provider_id(db: AsyncSession, user_id: int, provider: str
     return result.scalars().first()
 
 
-async def get_emails_by_user(db: AsyncSession, user_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Email]:
+async def get_emails_by_user(
+    db: AsyncSession,
+    user_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None
+) -> List[Email]:
     query = select(Email)
     if user_id is not None:
         query = query.where(Email.user_id == user_id)
     
-    query = query.offset(skip).limit(limit).order_by(Email.received_at.desc())
+    query = keyset_paginate(query, Email.received_at, Email.id, cursor).offset(skip).limit(limit)
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
-async def update_email(db: AsyncSession, db_obj: Email, obj_in: EmailUpdate) -> Email:
+async def update_email(db: AsyncSession, db_obj: Email, obj_in: EmailUpdate, commit: bool = True) -> Email:
     update_data = obj_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    if commit:
+        await db.commit()
+        await db.refresh(db_obj)
+    else:
+        await db.flush()
     return db_obj
 
 
-async def delete_email(db: AsyncSession, id: int) -> bool:
+async def delete_email(db: AsyncSession, id: int, commit: bool = True) -> bool:
     db_obj = await get_email(db, id)
     if db_obj:
         await db.delete(db_obj)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
@@ -5,11 +5,14 @@ from app.models.email_extraction import EmailExtraction
 from app.schemas.email_extraction import EmailExtractionCreate
 
 
-async def create_email_extraction(db: AsyncSession, obj_in: EmailExtractionCreate) -> EmailExtraction:
+async def create_email_extraction(db: AsyncSession, obj_in: EmailExtractionCreate, commit: bool = True) -> EmailExtraction:
     db_obj = EmailExtraction(**obj_in.model_dump())
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    if commit:
+        await db.commit()
+        await db.refresh(db_obj)
+    else:
+        await db.flush()
     return db_obj
 
 
@@ -23,10 +26,13 @@ async def get_extractions_by_email(db: AsyncSession, email_id: int) -> List[Emai
     return list(result.scalars().all())
 
 
-async def delete_email_extraction(db: AsyncSession, id: int) -> bool:
+async def delete_email_extraction(db: AsyncSession, id: int, commit: bool = True) -> bool:
     db_obj = await get_email_extraction(db, id)
     if db_obj:
         await db.delete(db_obj)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
@@ -1,15 +1,45 @@
-from typing import List, Optional
-from sqlalchemy import select
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor, keyset_paginate
 from app.models.job import Job
 from app.schemas.job import JobCreate, JobUpdate
 
+ACTIVE_STATUSES = ("QUEUED", "RUNNING")
 
-async def create_job(db: AsyncSession, obj_in: JobCreate) -> Job:
+
+async def create_job(db: AsyncSession, obj_in: JobCreate, commit: bool = True) -> Job:
     db_obj = Job(**obj_in.model_dump())
     db.add(db_obj)
+    if commit:
+        await db.commit()
+        await db.refresh(db_obj)
+    else:
+        await db.flush()
+    return db_obj
+
+
+async def create_active_job(db: AsyncSession, obj_in: JobCreate) -> Optional[Job]:
+    """
+    Insert a QUEUED/RUNNING record and commit it, unless a record for the same
+    arq_job_id is already active (uq_jobs_active_arq_job_id): then nothing is
+    inserted and None is returned.
+    """
+    stmt = (
+        insert(Job)
+        .values(**obj_in.model_dump())
+        .on_conflict_do_nothing(
+            index_elements=[Job.arq_job_id],
+            # Spelled like the index predicate, so PostgreSQL infers the partial index
+            index_where=text("status IN ('QUEUED', 'RUNNING')")
+        )
+        .returning(Job)
+    )
+    result = await db.execute(stmt)
+    db_obj = result.scalars().first()
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
 
@@ -18,13 +48,25 @@ async def get_job(db: AsyncSession, id: int) -> Optional[Job]:
     return result.scalars().first()
 
 
+async def get_active_job_by_arq_id(db: AsyncSession, arq_job_id: str) -> Optional[Job]:
+    """Latest QUEUED or RUNNING job record linked to an ARQ job id."""
+    result = await db.execute(
+        select(Job)
+        .where(Job.arq_job_id == arq_job_id, Job.status.in_(ACTIVE_STATUSES))
+        .order_by(Job.id.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 async def get_jobs(
     db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100,
     status: Optional[str] = None,
     job_type: Optional[str] = None,
-    user_id: Optional[int] = None
+    user_id: Optional[int] = None,
+    cursor: Optional[Cursor] = None
 ) -> List[Job]:
     query = select(Job)
     if status:
@@ -34,25 +76,50 @@ async def get_jobs(
     if user_id:
         query = query.where(Job.user_id == user_id)
     
-    query = query.offset(skip).limit(limit).order_by(Job.created_at.desc())
+    query = keyset_paginate(query, Job.created_at, Job.id, cursor).offset(skip).limit(limit)
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
-async def update_job(db: AsyncSession, db_obj: Job, obj_in: JobUpdate) -> Job:
+async def update_job(db: AsyncSession, db_obj: Job, obj_in: JobUpdate, commit: bool = True) -> Job:
     update_data = obj_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    if commit:
+        await db.commit()
+        await db.refresh(db_obj)
+    else:
+        await db.flush()
     return db_obj
 
 
-async def delete_job(db: AsyncSession, id: int) -> bool:
+async def fail_active_job(db: AsyncSession, id: int, error_payload: Any, commit: bool = True) -> bool:
+    """
+    Mark a job FAILED only if it is still QUEUED or RUNNING, in a single conditional
+    UPDATE, so a result committed concurrently by the worker is never overwritten.
+    Returns False if the job had already reached a final status.
+    """
+    result = await db.execute(
+        update(Job)
+        .where(Job.id == id, Job.status.in_(ACTIVE_STATUSES))
+        .values(status="FAILED", finished_at=datetime.now(timezone.utc), error_payload=error_payload)
+        .execution_options(synchronize_session=False)
+    )
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+    return result.rowcount == 1
+
+
+async def delete_job(db: AsyncSession, id: int, commit: bool = True) -> bool:
     db_obj = await get_job(db, id)
     if db_obj:
         await db.delete(db_obj)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
@@ -5,11 +5,14 @@ from app.models.llm_transaction import LLMTransaction
 from app.schemas.llm_transaction import LLMTransactionCreate
 
 
-async def create_llm_transaction(db: AsyncSession, obj_in: LLMTransactionCreate) -> LLMTransaction:
+async def create_llm_transaction(db: AsyncSession, obj_in: LLMTransactionCreate, commit: bool = True) -> LLMTransaction:
     db_obj = LLMTransaction(**obj_in.model_dump())
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    if commit:
+        await db.commit()
+        await db.refresh(db_obj)
+    else:
+        await db.flush()
     return db_obj
 
 
@@ -23,10 +26,13 @@ async def get_llm_transactions_by_job(db: AsyncSession, job_id: int) -> List[LLM
     return list(result.scalars().all())
 
 
-async def delete_llm_transaction(db: AsyncSession, id: int) -> bool:
+async def delete_llm_transaction(db: AsyncSession, id: int, commit: bool = True) -> bool:
     db_obj = await get_llm_transaction(db, id)
     if db_obj:
         await db.delete(db_obj)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
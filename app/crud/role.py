@@ -21,15 +21,18 @@ class CRUDRole:
         result = await db.execute(select(Role).offset(skip).limit(limit))
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: RoleCreate) -> Role:
+    async def create(self, db: AsyncSession, *, obj_in: RoleCreate, commit: bool = True) -> Role:
         db_obj = Role(name=obj_in.name)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        if commit:
+            await db.commit()
+            await db.refresh(db_obj)
+        else:
+            await db.flush()
         return db_obj
 
     async def update(
-        self, db: AsyncSession, *, db_obj: Role, obj_in: RoleUpdate
+        self, db: AsyncSession, *, db_obj: Role, obj_in: RoleUpdate, commit: bool = True
     ) -> Role:
         if isinstance(obj_in, dict):
             update_data = obj_in
@@ -40,15 +43,21 @@ class CRUDRole:
             setattr(db_obj, field, update_data[field])
         
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        if commit:
+            await db.commit()
+            await db.refresh(db_obj)
+        else:
+            await db.flush()
         return db_obj
 
-    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Role]:
+    async def remove(self, db: AsyncSession, *, id: int, commit: bool = True) -> Optional[Role]:
         db_obj = await self.get(db, id)
         if db_obj:
             await db.delete(db_obj)
-            await db.commit()
+            if commit:
+                await db.commit()
+            else:
+                await db.flush()
         return db_obj
 
 
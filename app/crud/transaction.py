@@ -1,18 +1,22 @@
 from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor, keyset_paginate
 from app.models.transaction import Transaction
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
 
 
-async def create_transaction(db: AsyncSession, transaction_in: TransactionCreate, user_id: int) -> Transaction:
+async def create_transaction(db: AsyncSession, transaction_in: TransactionCreate, user_id: int, commit: bool = True) -> Transaction:
     db_transaction = Transaction(
         **transaction_in.model_dump(exclude={"user_id"}),
         user_id=user_id
     )
     db.add(db_transaction)
-    await db.commit()
-    await db.refresh(db_transaction)
+    if commit:
+        await db.commit()
+        await db.refresh(db_transaction)
+    else:
+        await db.flush()
     return db_transaction
 
 
@@ -25,12 +29,12 @@ async def get_transactions_by_user(
     db: AsyncSession, 
     user_id: int, 
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[Cursor] = None
 ) -> List[Transaction]:
+    query = select(Transaction).where(Transaction.user_id == user_id)
     result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == user_id)
-        .order_by(Transaction.occurred_at.desc())
+        keyset_paginate(query, Transaction.occurred_at, Transaction.id, cursor)
         .offset(skip)
         .limit(limit)
     )
@@ -40,22 +44,29 @@ async def get_transactions_by_user(
 async def update_transaction(
     db: AsyncSession, 
     db_transaction: Transaction, 
-    transaction_in: TransactionUpdate
+    transaction_in: TransactionUpdate,
+    commit: bool = True
 ) -> Transaction:
     transaction_data = transaction_in.model_dump(exclude_unset=True)
     for field, value in transaction_data.items():
         setattr(db_transaction, field, value)
     
     db.add(db_transaction)
-    await db.commit()
-    await db.refresh(db_transaction)
+    if commit:
+        await db.commit()
+        await db.refresh(db_transaction)
+    else:
+        await db.flush()
     return db_transaction
 
 
-async def delete_transaction(db: AsyncSession, transaction_id: int) -> bool:
+async def delete_transaction(db: AsyncSession, transaction_id: int, commit: bool = True) -> bool:
     db_transaction = await get_transaction(db, transaction_id)
     if db_transaction:
         await db.delete(db_transaction)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
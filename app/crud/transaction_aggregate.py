@@ -0,0 +1,173 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Date, cast, delete, func, literal_column, null, select, text
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.transaction import Transaction, TransactionType
+from app.models.transaction_aggregate import TransactionAggregate
+
+# Conflict target of uq_transaction_aggregates_key; the 0 must be inlined
+# (not a bind parameter) for PostgreSQL to match it to the index expression
+AGGREGATE_KEY = [
+    TransactionAggregate.user_id,
+    TransactionAggregate.month,
+    func.coalesce(TransactionAggregate.category_id, literal_column("0")),
+    TransactionAggregate.type,
+]
+AGGREGATE_COLUMNS = ["user_id", "month", "category_id", "type", "total_amount", "transaction_count"]
+CENT = Decimal("0.01")
+
+
+def month_start(value: date) -> date:
+    """First day of the month of `value`; datetimes are taken in UTC (naive ones as UTC)."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+class AggregateDelta(NamedTuple):
+    user_id: int
+    month: date
+    category_id: Optional[int]
+    type: TransactionType
+    amount: Decimal
+    count: int
+
+    @classmethod
+    def of(cls, transaction: Transaction, sign: int = 1) -> "AggregateDelta":
+        """Contribution of a transaction to its aggregate row (sign=-1 to take it out)."""
+        # Rounded like the Numeric(12, 2) column, so adding and removing a transaction nets to zero
+        amount = Decimal(str(transaction.amount)).quantize(CENT, rounding=ROUND_HALF_UP)
+        return cls(
+            transaction.user_id,
+            month_start(transaction.occurred_at),
+            transaction.category_id,
+            TransactionType(transaction.type),
+            sign * amount,
+            sign
+        )
+
+
+def _accumulate(stmt: Insert) -> Insert:
+    """Add the inserted totals to the existing row on a key conflict."""
+    return stmt.on_conflict_do_update(
+        index_elements=AGGREGATE_KEY,
+        set_={
+            "total_amount": TransactionAggregate.total_amount + stmt.excluded.total_amount,
+            "transaction_count": TransactionAggregate.transaction_count + stmt.excluded.transaction_count
+        }
+    )
+
+
+async def apply_deltas(db: AsyncSession, deltas: Iterable[AggregateDelta], commit: bool = True) -> None:
+    """
+    Add transaction deltas to their aggregate rows with one
+    INSERT ... ON CONFLICT DO UPDATE, then drop rows left without transactions.
+    Deltas on the same row are merged first, and rows are written in key order
+    so concurrent writers lock them in the same order.
+    """
+    merged: Dict[Tuple[int, date, Optional[int], TransactionType], Tuple[Decimal, int]] = {}
+    for delta in deltas:
+        key = (delta.user_id, delta.month, delta.category_id, delta.type)
+        amount, count = merged.get(key, (Decimal(0), 0))
+        merged[key] = (amount + delta.amount, count + delta.count)
+
+    rows = [
+        dict(zip(AGGREGATE_COLUMNS, (*key, amount, count)))
+        for key, (amount, count) in sorted(
+            merged.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or 0, item[0][3].value)
+        )
+        if amount or count
+    ]
+    if rows:
+        await db.execute(_accumulate(insert(TransactionAggregate).values(rows)))
+        if any(row["transaction_count"] < 0 for row in rows):
+            await db.execute(
+                delete(TransactionAggregate).where(
+                    TransactionAggregate.user_id.in_({row["user_id"] for row in rows}),
+                    TransactionAggregate.transaction_count <= 0
+                )
+            )
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+
+
+async def get_summary(
+    db: AsyncSession,
+    user_id: int,
+    from_month: Optional[date] = None,
+    to_month: Optional[date] = None,
+    transaction_type: Optional[TransactionType] = None
+) -> List[TransactionAggregate]:
+    """A user's aggregate rows, oldest month first; bounds are inclusive months."""
+    query = select(TransactionAggregate).where(TransactionAggregate.user_id == user_id)
+    if from_month is not None:
+        query = query.where(TransactionAggregate.month >= month_start(from_month))
+    if to_month is not None:
+        query = query.where(TransactionAggregate.month <= month_start(to_month))
+    if transaction_type is not None:
+        query = query.where(TransactionAggregate.type == transaction_type)
+    result = await db.execute(
+        query.order_by(TransactionAggregate.month, TransactionAggregate.category_id, TransactionAggregate.type)
+    )
+    return list(result.scalars().all())
+
+
+async def uncategorize(db: AsyncSession, category_id: int, commit: bool = True) -> None:
+    """
+    Fold a category's rows into the uncategorized bucket, mirroring the
+    ON DELETE SET NULL of transactions.category_id. Call before deleting the category.
+    """
+    source = select(
+        TransactionAggregate.user_id,
+        TransactionAggregate.month,
+        null(),
+        TransactionAggregate.type,
+        TransactionAggregate.total_amount,
+        TransactionAggregate.transaction_count
+    ).where(TransactionAggregate.category_id == category_id)
+    await db.execute(_accumulate(insert(TransactionAggregate).from_select(AGGREGATE_COLUMNS, source)))
+    await db.execute(delete(TransactionAggregate).where(TransactionAggregate.category_id == category_id))
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+
+
+async def rebuild_aggregates(db: AsyncSession, user_id: Optional[int] = None, commit: bool = True) -> int:
+    """
+    Recompute aggregate rows from `transactions`, for all users or one.
+    The table is locked in EXCLUSIVE mode (reads continue, writers wait), so a
+    transaction written concurrently is counted exactly once: either it is
+    committed before the rebuild reads it, or its delta is applied after.
+    Returns the number of rows written. PostgreSQL only.
+    """
+    await db.execute(text("LOCK TABLE transaction_aggregates IN EXCLUSIVE MODE"))
+    # Literal arguments so SELECT and GROUP BY render the same expression
+    month = cast(
+        func.date_trunc(literal_column("'month'"), func.timezone(literal_column("'UTC'"), Transaction.occurred_at)),
+        Date
+    )
+    source = select(
+        Transaction.user_id,
+        month,
+        Transaction.category_id,
+        Transaction.type,
+        func.sum(Transaction.amount),
+        func.count()
+    ).group_by(Transaction.user_id, month, Transaction.category_id, Transaction.type)
+    clear = delete(TransactionAggregate)
+    if user_id is not None:
+        source = source.where(Transaction.user_id == user_id)
+        clear = clear.where(TransactionAggregate.user_id == user_id)
+
+    await db.execute(clear)
+    result = await db.execute(insert(TransactionAggregate).from_select(AGGREGATE_COLUMNS, source))
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+    return result.rowcount
@@ -1,11 +1,12 @@
 from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor, keyset_paginate
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
 
-async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
+async def create_user(db: AsyncSession, user_in: UserCreate, commit: bool = True) -> User:
     db_user = User(
         name=user_in.name,
         username=user_in.username,
@@ -14,8 +15,11 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
         role_id=getattr(user_in, 'role_id', 2) # Default to 2 (user) for now
     )
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    if commit:
+        await db.commit()
+        await db.refresh(db_user)
+    else:
+        await db.flush()
     return db_user
 
 
@@ -29,12 +33,14 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     return result.scalars().first()
 
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
-    result = await db.execute(select(User).offset(skip).limit(limit))
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None) -> List[User]:
+    # Newest first for skip callers too (previously unordered); see the API reference
+    query = keyset_paginate(select(User), User.created_at, User.id, cursor)
+    result = await db.execute(query.offset(skip).limit(limit))
     return list(result.scalars().all())
 
 
-async def update_user(db: AsyncSession, db_user: User, user_in: UserUpdate) -> User:
+async def update_user(db: AsyncSession, db_user: User, user_in: UserUpdate, commit: bool = True) -> User:
     user_data = user_in.model_dump(exclude_unset=True)
     if "password" in user_data:
         user_data["password_hash"] = user_data.pop("password")
@@ -43,15 +49,21 @@ async def update_user(db: AsyncSession, db_user: User, user_in: UserUpdate) -> U
         setattr(db_user, field, value)
     
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    if commit:
+        await db.commit()
+        await db.refresh(db_user)
+    else:
+        await db.flush()
     return db_user
 
 
-async def delete_user(db: AsyncSession, user_id: int) -> bool:
+async def delete_user(db: AsyncSession, user_id: int, commit: bool = True) -> bool:
     db_user = await get_user(db, user_id)
     if db_user:
         await db.delete(db_user)
-        await db.commit()
+        if commit:
+            await db.commit()
+        else:
+            await db.flush()
         return True
     return False
@@ -1,51 +1,91 @@
-from typing import Optional
+from typing import Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import decode_token
 from app.crud.auth import get_user_by_id
-from app.models.user import User
-from app.schemas.auth import TokenData
+from app.schemas.auth import CurrentUser
+from app.services.auth_cache import auth_user_cache
+from app.services.auth_revocation import revocation_list
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _decode_access_token(token: str) -> Tuple[int, dict]:
+    """User id and claims of a valid access token; raises 401 otherwise."""
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
         
     user_id_str: str = payload.get("sub")
     token_type: str = payload.get("type")
     
     if user_id_str is None or token_type != "access":
-        raise credentials_exception
+        raise _credentials_exception()
         
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str), payload
     except ValueError:
-        raise credentials_exception
-        
-    user = await get_user_by_id(db, user_id)
-    if user is None:
-        raise credentials_exception
-        
+        raise _credentials_exception()
+
+
+def _check_active(user: CurrentUser) -> CurrentUser:
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Inactive user"
         )
-        
     return user
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> CurrentUser:
+    """The user from the auth user cache; the users/roles lookup only runs on a miss."""
+    user = await auth_user_cache.get(user_id)
+    if user is None:
+        db_user = await get_user_by_id(db, user_id)
+        if db_user is None:
+            raise _credentials_exception()
+        user = await auth_user_cache.set(db_user)
+    return _check_active(user)
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> CurrentUser:
+    """
+    The user of the bearer token.
+    With AUTH_STATELESS_MODE the principal is built from the token claims (no
+    cache or DB access) unless the user's tokens have been revoked since it was
+    issued; only `id` and `role` are set. Tokens without `iat` (issued before
+    it was added) take the regular path.
+    """
+    user_id, payload = _decode_access_token(token)
+
+    if settings.AUTH_STATELESS_MODE and payload.get("iat") is not None and payload.get("role"):
+        if revocation_list.is_revoked(user_id, int(payload["iat"])):
+            raise _credentials_exception()
+        return CurrentUser(id=user_id, role=payload["role"])
+
+    return await _load_user(db, user_id)
+
+
+async def get_current_user_profile(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> CurrentUser:
+    """The user of the bearer token with its profile fields, in every mode (e.g. for /users/me)."""
+    user_id, _ = _decode_access_token(token)
+    return await _load_user(db, user_id)
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from fastapi import HTTPException, Query, Request, status
+
+from app.core.pagination import Cursor, InvalidCursorError, decode_cursor
+
+
+async def get_cursor(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
+) -> Optional[Cursor]:
+    if cursor is None:
+        return None
+    # The cursor already marks where the page starts; an offset on top would silently skip rows
+    if "skip" in request.query_params:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either skip or cursor, not both")
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,10 +1,16 @@
-from .exceptions import EmailProviderError, EmailAuthError, EmailFetchError, EmailRateLimitError
-from .dto import EmailMessage
+from .exceptions import (
+    EmailProviderError, EmailAuthError, EmailFetchError, EmailRateLimitError, EmailSyncExpiredError, EmailSendError
+)
+from .dto import EmailMessage, EmailPage, OutgoingEmail
 
 __all__ = [
     "EmailProviderError",
     "EmailAuthError",
     "EmailFetchError",
     "EmailRateLimitError",
+    "EmailSyncExpiredError",
+    "EmailSendError",
     "EmailMessage",
+    "EmailPage",
+    "OutgoingEmail",
 ]
@@ -17,3 +17,17 @@ class EmailMessage(BaseModel):
     checksum: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class EmailPage(BaseModel):
+    """One page of a mailbox listing; next_page_token resumes the listing after it (None on the last page)."""
+    messages: List[EmailMessage]
+    next_page_token: Optional[str] = None
+
+
+class OutgoingEmail(BaseModel):
+    """An email to send through an EmailSender."""
+    to_email: str
+    subject: str
+    body_text: str
+    body_html: Optional[str] = None
@@ -16,6 +16,21 @@ class EmailFetchError(EmailProviderError):
     pass
 
 
+class EmailSyncExpiredError(EmailFetchError):
+    """Raised when an incremental sync checkpoint has expired and a full resync is needed."""
+    pass
+
+
 class EmailRateLimitError(EmailProviderError):
     """Raised when the provider rate limits requests."""
     pass
+
+
+class EmailSendError(EmailProviderError):
+    """
+    Raised when an email could not be sent.
+    `permanent` marks rejections a retry won't fix (e.g. recipient refused).
+    """
+    def __init__(self, message: str, provider: str = None, permanent: bool = False):
+        super().__init__(message, provider)
+        self.permanent = permanent
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any
-from app.email.dto import EmailMessage
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Any, Tuple
+from app.email.dto import EmailMessage, EmailPage
 
 
 class EmailProvider(ABC):
@@ -9,6 +10,10 @@ class EmailProvider(ABC):
     Implementations must be stateless and accept credentials at runtime.
     """
 
+    # Providers that can list only changes since a checkpoint override this
+    # together with get_sync_checkpoint() and fetch_changes().
+    supports_incremental_sync: bool = False
+
     @abstractmethod
     async def connect(self, credentials: Any) -> None:
         """
@@ -31,6 +36,25 @@ class EmailProvider(ABC):
         """
         pass
 
+    async def iter_messages(
+        self,
+        since: Optional[datetime] = None,
+        page_size: int = 100,
+        page_token: Optional[str] = None
+    ) -> AsyncIterator[EmailPage]:
+        """
+        Lazily walk the whole mailbox, one page of messages at a time.
+        Providers with server-side paging override this; the default yields a single page.
+        :param since: Only messages received after this time.
+        :param page_size: Messages per yielded page.
+        :param page_token: next_page_token of an earlier page, to resume the listing after it.
+        :return: Async iterator of EmailPage, each carrying the token of the page after it.
+        """
+        messages = await self.fetch_messages(cursor=page_token, limit=page_size)
+        if since:
+            messages = [m for m in messages if m.received_at > since]
+        yield EmailPage(messages=messages)
+
     @abstractmethod
     async def fetch_message_body(self, message_id: str) -> Optional[EmailMessage]:
         """
@@ -40,6 +64,22 @@ class EmailProvider(ABC):
         """
         pass
 
+    async def get_sync_checkpoint(self) -> Optional[str]:
+        """
+        Return an opaque checkpoint describing the mailbox's current state.
+        :return: Checkpoint to pass to fetch_changes(), or None if unsupported.
+        """
+        return None
+
+    async def fetch_changes(self, checkpoint: str) -> Tuple[List[EmailMessage], str]:
+        """
+        Fetch messages added since a checkpoint.
+        :param checkpoint: Value from get_sync_checkpoint() or a previous fetch_changes().
+        :return: Tuple of (new messages, checkpoint to store for the next sync).
+        :raises EmailSyncExpiredError: If the checkpoint is too old; a full resync is required.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support incremental sync")
+
     @abstractmethod
     async def disconnect(self) -> None:
         """Close connections and cleanup resources."""
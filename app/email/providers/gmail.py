@@ -1,13 +1,122 @@
+import asyncio
 import base64
-from typing import List, Optional, Any, Dict
+import functools
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, List, Optional, Any, Dict, Tuple, TypeVar
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build, Resource
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document, Resource
+from googleapiclient.errors import HttpError
 from google.auth.transport.requests import Request
 from app.email.providers.base import EmailProvider
-from app.email.dto import EmailMessage
-from app.email.exceptions import EmailAuthError, EmailFetchError
+from app.email.dto import EmailMessage, EmailPage
+from app.email.exceptions import (
+    EmailProviderError, EmailAuthError, EmailFetchError, EmailRateLimitError, EmailSyncExpiredError
+)
+from app.core.config import settings
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Gmail rejects batch requests with more than 100 sub-requests.
+GMAIL_MAX_BATCH_SIZE = 100
+# Per-user quota is 250 units/second; messages.get costs 5 units.
+GMAIL_USER_QUOTA_UNITS_PER_SECOND = 250
+GMAIL_MESSAGE_GET_UNITS = 5
+GMAIL_MAX_LIST_PAGE_SIZE = 500  # users.messages.list maxResults limit
+GMAIL_RATE_LIMIT_MAX_RETRIES = 3
+
+# The Google client library is synchronous (httplib2). All of its calls run on this
+# executor so the worker's event loop keeps heartbeating and running other jobs.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.GMAIL_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="gmail"
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Google client call on the dedicated executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor() -> None:
+    """Stop the Google client executor (called on worker shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+@functools.lru_cache(maxsize=None)
+def load_discovery_document() -> Dict[str, Any]:
+    """
+    Gmail v1 discovery document bundled with google-api-python-client.
+    Parsed once per process; build() would re-read and re-parse it on every call.
+    """
+    return json.loads(discovery_cache.get_static_doc("gmail", "v1"))
+
+
+class GmailServiceCache:
+    """
+    Process-level LRU of built Gmail services keyed by connected account.
+    A service is checked out for the duration of a session and returned on
+    disconnect, so concurrent jobs never share the (non thread-safe) HTTP
+    transport. Entries whose credentials fingerprint no longer matches the
+    stored tokens are dropped, which evicts services after credentials rotate.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[str, Resource, Credentials]]" = OrderedDict()
+
+    def checkout(self, account_id: int, fingerprint: str) -> Optional[Tuple[Resource, Credentials]]:
+        entry = self._entries.pop(account_id, None)
+        if entry is None:
+            return None
+        cached_fingerprint, service, creds = entry
+        if cached_fingerprint != fingerprint:
+            logger.info(f"Credentials rotated for account {account_id}, discarding cached Gmail service")
+            return None
+        return service, creds
+
+    def checkin(self, account_id: int, fingerprint: str, service: Resource, creds: Credentials) -> None:
+        self._entries[account_id] = (fingerprint, service, creds)
+        self._entries.move_to_end(account_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+service_cache = GmailServiceCache(settings.GMAIL_SERVICE_CACHE_SIZE)
+
+
+def _credentials_fingerprint(credentials_data: Dict[str, Any]) -> str:
+    raw = "|".join(
+        str(credentials_data.get(key) or "")
+        for key in ("access_token", "refresh_token", "client_id", "client_secret")
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
 
 class GmailProvider(EmailProvider):
     """
@@ -15,32 +124,49 @@ class GmailProvider(EmailProvider):
     Stateless per session: credentials must be provided to connect().
     """
 
-    def __init__(self):
+    supports_incremental_sync = True
+
+    def __init__(self, batch_size: int = 50):
         self._service: Optional[Resource] = None
         self._creds: Optional[Credentials] = None
+        self._cache_key: Optional[Tuple[int, str]] = None
+        # Metadata gets are grouped into Gmail batch requests of this size
+        self._batch_size = max(1, min(batch_size, GMAIL_MAX_BATCH_SIZE))
 
     async def connect(self, credentials_data: Dict[str, Any]) -> None:
         """
         Connect to Gmail using OAuth2 credentials.
-        :param credentials_data: Dict with access_token, refresh_token, client_id, client_secret.
+        :param credentials_data: Dict with access_token, refresh_token, client_id, client_secret
+            and optionally account_id, which enables reuse of a cached service.
         """
         try:
-            self._creds = Credentials(
-                token=credentials_data.get("access_token"),
-                refresh_token=credentials_data.get("refresh_token"),
-                client_id=credentials_data.get("client_id"),
-                client_secret=credentials_data.get("client_secret"),
-                token_uri="https://oauth2.googleapis.com/token"
-            )
+            account_id = credentials_data.get("account_id")
+            fingerprint = _credentials_fingerprint(credentials_data)
+
+            cached = service_cache.checkout(account_id, fingerprint) if account_id is not None else None
+            if cached:
+                self._service, self._creds = cached
+            else:
+                self._creds = Credentials(
+                    token=credentials_data.get("access_token"),
+                    refresh_token=credentials_data.get("refresh_token"),
+                    client_id=credentials_data.get("client_id"),
+                    client_secret=credentials_data.get("client_secret"),
+                    token_uri="https://oauth2.googleapis.com/token"
+                )
 
             # Refresh token if expired
             if self._creds.expired and self._creds.refresh_token:
-                self._creds.refresh(Request())
+                await run_blocking(self._creds.refresh, Request())
+
+            if not cached:
+                self._service = await run_blocking(
+                    build_from_document, load_discovery_document(), credentials=self._creds
+                )
+
+            if account_id is not None:
+                self._cache_key = (account_id, fingerprint)
 
-            # build() is a synchronous call, in a real production app we might offload
-            # it to a thread if latency is critical, but for workers it's fine.
-            self._service = build("gmail", "v1", credentials=self._creds)
-            
         except Exception as e:
             raise EmailAuthError(f"Oauth2 connection failed: {str(e)}", provider="gmail")
 
@@ -57,30 +183,198 @@ class GmailProvider(EmailProvider):
 
         try:
             # Note: q parameter can be added for filtering in future (e.g. 'label:INBOX')
-            results = self._service.users().messages().list(
-                userId='me', 
-                maxResults=limit, 
-                pageToken=cursor
-            ).execute()
+            results = await run_blocking(
+                self._service.users().messages().list(
+                    userId='me',
+                    maxResults=limit,
+                    pageToken=cursor
+                ).execute
+            )
 
             messages_meta = results.get('messages', [])
-            email_messages = []
-
-            for meta in messages_meta:
-                # Get basic metadata for the summary
-                msg = self._service.users().messages().get(
-                    userId='me', 
-                    id=meta['id'], 
-                    format='metadata'
-                ).execute()
-                
-                email_messages.append(self._map_to_dto(msg))
+            gmail_msgs = await self._fetch_metadata_batch([meta['id'] for meta in messages_meta])
 
-            return email_messages
-            
+            return [self._map_to_dto(msg) for msg in gmail_msgs]
+
+        except EmailProviderError:
+            raise
         except Exception as e:
             raise EmailFetchError(f"Fetch failed: {str(e)}", provider="gmail")
 
+    async def iter_messages(
+        self,
+        since: Optional[datetime] = None,
+        page_size: int = 100,
+        page_token: Optional[str] = None
+    ) -> AsyncIterator[EmailPage]:
+        """
+        Walk users.messages.list page by page via nextPageToken, starting after
+        `page_token` if given, yielding the metadata of each page (with the token
+        of the next one) before the next one is requested.
+        """
+        if not self._service:
+            raise EmailAuthError("Provider not connected", provider="gmail")
+
+        page_size = max(1, min(page_size, GMAIL_MAX_LIST_PAGE_SIZE))
+        query = f"after:{int(since.timestamp())}" if since else None
+
+        while True:
+            try:
+                results = await run_blocking(
+                    self._service.users().messages().list(
+                        userId='me',
+                        maxResults=page_size,
+                        pageToken=page_token,
+                        q=query
+                    ).execute
+                )
+                messages_meta = results.get('messages', [])
+                gmail_msgs = await self._fetch_metadata_batch([meta['id'] for meta in messages_meta])
+            except EmailProviderError:
+                raise
+            except Exception as e:
+                raise EmailFetchError(f"Fetch failed: {str(e)}", provider="gmail")
+
+            page_token = results.get('nextPageToken')
+            yield EmailPage(messages=[self._map_to_dto(msg) for msg in gmail_msgs], next_page_token=page_token)
+            if not page_token:
+                break
+
+    async def get_sync_checkpoint(self) -> Optional[str]:
+        """Current mailbox historyId, the starting point for the next incremental sync."""
+        if not self._service:
+            raise EmailAuthError("Provider not connected", provider="gmail")
+
+        try:
+            profile = await run_blocking(self._service.users().getProfile(userId='me').execute)
+            return str(profile['historyId'])
+        except Exception as e:
+            raise EmailFetchError(f"Profile fetch failed: {str(e)}", provider="gmail")
+
+    async def fetch_changes(self, checkpoint: str) -> Tuple[List[EmailMessage], str]:
+        """
+        Fetch messages added since the given historyId via users.history.list.
+        Raises EmailSyncExpiredError when Gmail no longer has history that old (404).
+        """
+        if not self._service:
+            raise EmailAuthError("Provider not connected", provider="gmail")
+
+        try:
+            message_ids: List[str] = []
+            seen = set()
+            latest_history_id = checkpoint
+            page_token = None
+
+            while True:
+                try:
+                    response = await run_blocking(
+                        self._service.users().history().list(
+                            userId='me',
+                            startHistoryId=checkpoint,
+                            historyTypes=['messageAdded'],
+                            pageToken=page_token
+                        ).execute
+                    )
+                except HttpError as e:
+                    if e.status_code == 404:
+                        raise EmailSyncExpiredError(
+                            f"History {checkpoint} is no longer available", provider="gmail"
+                        )
+                    raise
+
+                for record in response.get('history', []):
+                    for added in record.get('messagesAdded', []):
+                        message_id = added['message']['id']
+                        if message_id not in seen:
+                            seen.add(message_id)
+                            message_ids.append(message_id)
+
+                latest_history_id = response.get('historyId', latest_history_id)
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+
+            gmail_msgs = await self._fetch_metadata_batch(message_ids)
+            return [self._map_to_dto(msg) for msg in gmail_msgs], str(latest_history_id)
+
+        except EmailProviderError:
+            raise
+        except Exception as e:
+            raise EmailFetchError(f"History fetch failed: {str(e)}", provider="gmail")
+
+    async def _fetch_metadata_batch(self, message_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch message metadata using Gmail batch HTTP requests.
+        Sub-requests that hit the per-user rate limit are retried with exponential
+        backoff; messages deleted since listing (404) are skipped.
+        Results are returned in the order of message_ids.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = list(message_ids)
+        attempt = 0
+
+        while pending:
+            rate_limited: List[str] = []
+
+            for start in range(0, len(pending), self._batch_size):
+                chunk = pending[start:start + self._batch_size]
+                errors: Dict[str, HttpError] = {}
+
+                def _on_response(request_id, response, exception):
+                    if exception is not None:
+                        errors[request_id] = exception
+                    else:
+                        results[request_id] = response
+
+                batch = self._service.new_batch_http_request(callback=_on_response)
+                for message_id in chunk:
+                    batch.add(
+                        self._service.users().messages().get(
+                            userId='me',
+                            id=message_id,
+                            format='metadata'
+                        ),
+                        request_id=message_id
+                    )
+
+                started = time.monotonic()
+                await run_blocking(batch.execute)
+
+                for message_id, error in errors.items():
+                    if self._is_rate_limited(error):
+                        rate_limited.append(message_id)
+                    elif getattr(error, 'status_code', None) == 404:
+                        logger.warning(f"Gmail message {message_id} disappeared before metadata fetch")
+                    else:
+                        raise EmailFetchError(f"Metadata fetch failed for {message_id}: {error}", provider="gmail")
+
+                # Pace consecutive batches to stay within the per-user quota
+                if start + self._batch_size < len(pending):
+                    min_interval = len(chunk) * GMAIL_MESSAGE_GET_UNITS / GMAIL_USER_QUOTA_UNITS_PER_SECOND
+                    remaining = min_interval - (time.monotonic() - started)
+                    if remaining > 0:
+                        await asyncio.sleep(remaining)
+
+            if rate_limited:
+                attempt += 1
+                if attempt > GMAIL_RATE_LIMIT_MAX_RETRIES:
+                    raise EmailRateLimitError(
+                        f"Rate limited on {len(rate_limited)} messages after {GMAIL_RATE_LIMIT_MAX_RETRIES} retries",
+                        provider="gmail"
+                    )
+                await asyncio.sleep(2 ** attempt)
+            pending = rate_limited
+
+        return [results[message_id] for message_id in message_ids if message_id in results]
+
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        """Gmail signals quota exhaustion as 429 or 403 with a rateLimitExceeded reason."""
+        status = getattr(error, 'status_code', None)
+        if status == 429:
+            return True
+        return status == 403 and 'ratelimitexceeded' in str(getattr(error, 'reason', '')).lower().replace(' ', '')
+
     async def fetch_message_body(self, message_id: str) -> Optional[EmailMessage]:
         """
         Fetch full content for a specific message.
@@ -89,11 +383,13 @@ class GmailProvider(EmailProvider):
             raise EmailAuthError("Provider not connected", provider="gmail")
 
         try:
-            msg = self._service.users().messages().get(
-                userId='me', 
-                id=message_id, 
-                format='full'
-            ).execute()
+            msg = await run_blocking(
+                self._service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    format='full'
+                ).execute
+            )
             
             return self._map_to_dto(msg, include_body=True)
             
@@ -101,9 +397,12 @@ class GmailProvider(EmailProvider):
             raise EmailFetchError(f"Body fetch failed: {str(e)}", provider="gmail")
 
     async def disconnect(self) -> None:
-        """Clear session data."""
+        """Return the service to the cache and clear session data."""
+        if self._cache_key and self._service and self._creds:
+            service_cache.checkin(*self._cache_key, self._service, self._creds)
         self._service = None
         self._creds = None
+        self._cache_key = None
 
     def _map_to_dto(self, gmail_msg: Dict[str, Any], include_body: bool = False) -> EmailMessage:
         """Internal helper to convert Gmail API response to EmailMessage DTO."""
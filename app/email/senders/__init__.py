@@ -0,0 +1,6 @@
+from .base import EmailSender
+from .console import ConsoleEmailSender
+from .smtp import SMTPEmailSender
+from .factory import EmailSenderFactory
+
+__all__ = ["EmailSender", "ConsoleEmailSender", "SMTPEmailSender", "EmailSenderFactory"]
@@ -0,0 +1,37 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+from app.email.dto import OutgoingEmail
+
+
+class EmailSender(ABC):
+    """
+    Abstract Base Class for outgoing email transports.
+    One instance lives for the whole worker process (created on startup, closed on
+    shutdown), so implementations may keep connections open between jobs.
+    """
+
+    name: str = "unknown"
+
+    async def open(self) -> None:
+        """Prepare the transport ahead of the first message (e.g. connect). Optional."""
+        pass
+
+    @abstractmethod
+    async def send(self, message: OutgoingEmail) -> None:
+        """
+        Deliver one message.
+        :raises EmailSendError: if the message could not be sent.
+        """
+        pass
+
+    async def send_many(self, messages: Sequence[OutgoingEmail]) -> List[Optional[Exception]]:
+        """
+        Deliver several messages concurrently over the sender's connections.
+        Results keep input order: None when sent, otherwise the exception raised.
+        """
+        return await asyncio.gather(*(self.send(message) for message in messages), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Release connections."""
+        pass
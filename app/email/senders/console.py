@@ -0,0 +1,15 @@
+from app.email.dto import OutgoingEmail
+from app.email.senders.base import EmailSender
+
+
+class ConsoleEmailSender(EmailSender):
+    """Prints messages instead of sending them (local development)."""
+
+    name = "console"
+
+    async def send(self, message: OutgoingEmail) -> None:
+        print("--- EMAIL ---")
+        print(f"To: {message.to_email}")
+        print(f"Subject: {message.subject}")
+        print(message.body_text)
+        print("-------------")
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional, Type
+from app.core.config import settings
+from app.email.senders.base import EmailSender
+from app.email.senders.console import ConsoleEmailSender
+from app.email.senders.smtp import SMTPEmailSender
+
+class EmailSenderFactory:
+    _senders: Dict[str, Type[EmailSender]] = {}
+
+    @classmethod
+    def register(cls, name: str, sender_cls: Type[EmailSender]):
+        cls._senders[name.lower()] = sender_cls
+
+    @classmethod
+    def get_sender(cls, name: Optional[str] = None, **kwargs: Any) -> EmailSender:
+        """Instantiate a sender by name (defaults to EMAIL_SENDER)."""
+        name = name or settings.EMAIL_SENDER
+        sender_cls = cls._senders.get(name.lower())
+        if not sender_cls:
+            raise ValueError(f"Unsupported email sender: {name}")
+        return sender_cls(**kwargs)
+
+# Register initial senders
+EmailSenderFactory.register("console", ConsoleEmailSender)
+EmailSenderFactory.register("smtp", SMTPEmailSender)
@@ -0,0 +1,43 @@
+from string import Template
+from typing import Optional
+
+from app.core.otp import OTP_EXPIRY
+from app.email.dto import OutgoingEmail
+
+
+class EmailTemplate:
+    """
+    Subject and bodies parsed once at import; rendering only substitutes values.
+    Placeholders use string.Template syntax ($name).
+    """
+
+    def __init__(self, subject: str, body_text: str, body_html: Optional[str] = None):
+        self.subject = Template(subject)
+        self.body_text = Template(body_text)
+        self.body_html = Template(body_html) if body_html else None
+
+    def render(self, to_email: str, **values: str) -> OutgoingEmail:
+        return OutgoingEmail(
+            to_email=to_email,
+            subject=self.subject.substitute(values),
+            body_text=self.body_text.substitute(values),
+            body_html=self.body_html.substitute(values) if self.body_html else None
+        )
+
+
+OTP_EMAIL = EmailTemplate(
+    subject="Your password reset code: $otp",
+    body_text=(
+        "Your password reset code is $otp.\n\n"
+        f"It is valid for {OTP_EXPIRY // 60} minutes. If you did not ask to reset your password, ignore this email.\n"
+    ),
+    body_html=(
+        "<p>Your password reset code is <strong>$otp</strong>.</p>"
+        f"<p>It is valid for {OTP_EXPIRY // 60} minutes. If you did not ask to reset your password, ignore this email.</p>"
+    )
+)
+
+NOTIFICATION_EMAIL = EmailTemplate(
+    subject="$subject",
+    body_text="Hi $name,\n\n$body\n"
+)
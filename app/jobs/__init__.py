@@ -1,10 +1,11 @@
-from .base import BaseJob, JobRunner
+from .base import BaseJob, JobRunner, JobRetryError
 from .email_fetch import EmailFetchJob
 from .email_extraction import EmailExtractionJob
 
 __all__ = [
     "BaseJob",
     "JobRunner",
+    "JobRetryError",
     "EmailFetchJob",
     "EmailExtractionJob"
 ]
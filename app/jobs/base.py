@@ -1,16 +1,50 @@
 import abc
 import json
 import logging
+import random
 import traceback
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import unit_of_work
 from app.models.job import Job
 from app.services.job_service import JobService
 from app.schemas.job import JobUpdate
 
 logger = logging.getLogger(__name__)
 
+# Records in these states are never picked up again by a worker
+TERMINAL_STATUSES = ("SUCCESS", "FAILED", "DEAD_LETTER", "CANCELLED")
+
+
+class JobRetryError(Exception):
+    """
+    Raised by JobRunner when a failed job has been put back to QUEUED.
+    The worker re-schedules the task after `defer_seconds`.
+    """
+
+    def __init__(self, job_id: int, attempt: int, defer_seconds: float):
+        super().__init__(f"Job {job_id} failed on attempt {attempt}, retrying in {defer_seconds:.1f}s")
+        self.job_id = job_id
+        self.attempt = attempt
+        self.defer_seconds = defer_seconds
+
+
+def retry_backoff(
+    attempt: int,
+    base_delay: float = settings.JOB_RETRY_BASE_DELAY_SECONDS,
+    max_delay: float = settings.JOB_RETRY_MAX_DELAY_SECONDS
+) -> float:
+    """
+    Delay before retrying after the given failed attempt: exponential, capped, with jitter.
+    Half of the delay is fixed and half random, so jobs that failed together
+    (e.g. during a provider outage) do not all come back at the same moment.
+    """
+    delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
 class BaseJob(abc.ABC):
     """
     Abstract base class for all jobs.
@@ -41,6 +75,13 @@ class BaseJob(abc.ABC):
         logger.error(f"Job {self.job_record.id} failed: {str(error)}")
         logger.error(traceback.format_exc())
 
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Whether a failed run is worth retrying.
+        ValueError signals bad input (missing account, invalid payload), which a retry won't fix.
+        """
+        return not isinstance(error, ValueError)
+
 
 class JobRunner:
     """
@@ -58,64 +99,109 @@ class JobRunner:
         job_type: str, 
         input_payload: Dict[str, Any],
         triggered_by: str = "SYSTEM",
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        job_id: Optional[int] = None,
+        arq_job_id: Optional[str] = None,
+        attempt: int = 1,
+        max_retries: int = 0
     ) -> Job:
         """
-        Creates a job record and executes the job lifecycle.
+        Executes the job lifecycle against its job record.
+        The record is the QUEUED one created at enqueue time (`job_id`, or the active
+        record linked to `arq_job_id`); one is created when there is none.
+        Everything the job writes is committed together with its SUCCESS status;
+        on failure those writes are rolled back. A retryable failure on attempt
+        `attempt` <= `max_retries` puts the record back to QUEUED and raises
+        JobRetryError; once retries are exhausted it is stored as DEAD_LETTER,
+        and non-retryable failures as FAILED.
         """
-        # 1. Create Job Record
-        job_record = await self.job_service.create_job_raw(
-            job_type=job_type,
-            input_payload=input_payload,
-            triggered_by=triggered_by,
-            user_id=user_id,
-            status="RUNNING"
-        )
-        await self.db.commit()
-        await self.db.refresh(job_record)
+        # 1. Resolve the job record and mark it RUNNING
+        async with unit_of_work(self.db):
+            job_record = None
+            if job_id is not None:
+                job_record = await self.job_service.get_job_db(job_id)
+            elif arq_job_id is not None:
+                job_record = await self.job_service.get_active_job_by_arq_id_db(arq_job_id)
+
+            if job_record is not None and job_record.status in TERMINAL_STATUSES:
+                logger.warning(f"Skipping job {job_record.id}: already {job_record.status}")
+                return job_record
+
+            running = JobUpdate(
+                status="RUNNING",
+                started_at=datetime.now(timezone.utc),
+                retry_count=attempt - 1,
+                arq_job_id=arq_job_id
+            )
+            if job_record is None:
+                job_record = await self.job_service.create_job_raw(
+                    job_type=job_type,
+                    input_payload=input_payload,
+                    triggered_by=triggered_by,
+                    user_id=user_id,
+                    **running.model_dump(exclude_none=True),
+                    commit=False
+                )
+            else:
+                await self.job_service.update_job_db(job_record, running, commit=False)
 
         job_instance = job_class(self.db, input_payload)
         
         try:
             # 2. Lifecycle: before_run
             await job_instance.before_run(job_record)
-            
-            # Update start time
-            await self.job_service.update_job(
-                job_record.id, 
-                JobUpdate(status="RUNNING", started_at=datetime.now(timezone.utc))
-            )
-            await self.db.commit()
 
-            # 3. Lifecycle: run
-            result = await job_instance.run()
-
-            # 4. Lifecycle: after_run
-            await job_instance.after_run(result)
-
-            # 5. Mark SUCCESS
-            await self.job_service.update_job(
-                job_record.id, 
-                JobUpdate(
-                    status="SUCCESS", 
-                    finished_at=datetime.now(timezone.utc),
-                    output_payload=result if isinstance(result, dict) else {"result": str(result)}
+            async with unit_of_work(self.db):
+                # 3. Lifecycle: run
+                result = await job_instance.run()
+
+                # 4. Lifecycle: after_run
+                await job_instance.after_run(result)
+
+                # 5. Mark SUCCESS
+                await self.job_service.update_job_db(
+                    job_record,
+                    JobUpdate(
+                        status="SUCCESS", 
+                        finished_at=datetime.now(timezone.utc),
+                        output_payload=result if isinstance(result, dict) else {"result": str(result)}
+                    ),
+                    commit=False
                 )
-            )
-            await self.db.commit()
 
         except Exception as e:
+            # The rollback expired the record; reload it before touching attributes
+            await self.db.refresh(job_record)
+
             # 6. Lifecycle: on_failure
             await job_instance.on_failure(e)
 
-            # 7. Mark FAILED
-            await self.job_service.update_job(
-                job_record.id, 
+            error_payload = {"error": str(e), "traceback": traceback.format_exc(), "attempt": attempt}
+            retryable = job_instance.is_retryable(e)
+
+            if retryable and attempt <= max_retries:
+                # 7a. Back to QUEUED; the worker re-schedules the task after the backoff
+                defer_seconds = retry_backoff(attempt)
+                await self.job_service.update_job_db(
+                    job_record,
+                    JobUpdate(status="QUEUED", error_payload={**error_payload, "retry_in_seconds": defer_seconds}),
+                    commit=False
+                )
+                await self.db.commit()
+                raise JobRetryError(job_record.id, attempt, defer_seconds) from e
+
+            # 7b. Mark DEAD_LETTER (retries exhausted) or FAILED (not retryable)
+            final_status = "DEAD_LETTER" if retryable and max_retries > 0 else "FAILED"
+            if final_status == "DEAD_LETTER":
+                logger.error(f"Job {job_record.id} dead-lettered after {attempt} attempts")
+            await self.job_service.update_job_db(
+                job_record,
                 JobUpdate(
-                    status="FAILED", 
+                    status=final_status, 
                     finished_at=datetime.now(timezone.utc),
-                    error_payload={"error": str(e), "traceback": traceback.format_exc()}
-                )
+                    error_payload=error_payload
+                ),
+                commit=False
             )
             await self.db.commit()
             
@@ -1,10 +1,14 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.core.config import settings
 from app.jobs.base import BaseJob
 from app.models.email import Email
-from app.services.llm import MockLLMService
+from app.llm import LLMResponse, estimate_cost
+from app.llm.providers import LLMProviderFactory
+from app.llm.rate_limiter import RateLimitedLLMProvider
+from app.services.llm_cache import CachedLLMService
+from app.services.email_service import EmailService
 from app.services.email_extraction_service import EmailExtractionService
 from app.services.llm_transaction_service import LLMTransactionService
 from app.services.transaction_service import TransactionService
@@ -12,105 +16,174 @@ from app.services.category_service import CategoryService
 from app.schemas.email_extraction import EmailExtractionCreate
 from app.schemas.llm_transaction import LLMTransactionCreate
 from app.schemas.transaction import TransactionCreate
+from app.schemas.category import CategoryCreate
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 class EmailExtractionJob(BaseJob):
     """
     Job to process PENDING emails using LLM and create financial transactions.
+    Claims batches until none are left (or EXTRACTION_SLICE_SECONDS have passed).
+    LLM calls for a batch run concurrently; the resulting rows are written
+    afterwards and committed together, one transaction per batch.
     """
 
     async def run(self) -> Dict[str, Any]:
         batch_size = self.input_payload.get("batch_size", 10)
         reprocess = self.input_payload.get("reprocess", False)
-        
-        # 1. Fetch emails to process
-        query = select(Email)
-        if not reprocess:
-            query = query.where(Email.extraction_status == "PENDING")
-        
-        query = query.limit(batch_size)
-        result = await self.db.execute(query)
-        emails = result.scalars().all()
-        
-        logger.info(f"Processing batch of {len(emails)} emails")
-
-        llm = MockLLMService()
-        ext_service = EmailExtractionService(self.db)
-        llm_tx_service = LLMTransactionService(self.db)
-        tx_service = TransactionService(self.db)
-        cat_service = CategoryService(self.db)
+        concurrency = self.input_payload.get("concurrency", settings.EXTRACTION_CONCURRENCY)
+        use_cache = self.input_payload.get("use_cache", True)
+
+        # Wrapper order: cache -> rate limiter -> provider, so hits never wait for capacity
+        llm = RateLimitedLLMProvider(LLMProviderFactory.get_provider(self.input_payload.get("llm_provider")))
+        if use_cache:
+            llm = CachedLLMService(llm)
+
+        totals = {
+            "processed_count": 0,
+            "transaction_count": 0,
+            "failed_count": 0,
+            "cache_hit_count": 0,
+            "rate_limit_wait_ms": 0
+        }
+        batches = 0
+        deadline = time.monotonic() + settings.EXTRACTION_SLICE_SECONDS
+        complete = False
+        try:
+            # Drain the PENDING emails batch by batch, so a trigger coalesced into this
+            # job is served too. Reprocessing claims any email, so it runs a single batch.
+            while True:
+                # 1. Claim emails to process (committed, so parallel jobs skip them)
+                emails = await EmailService(self.db).claim_pending_emails_db(
+                    limit=batch_size,
+                    lease_seconds=settings.EXTRACTION_LEASE_SECONDS,
+                    reprocess=reprocess
+                )
+                if not emails:
+                    complete = True
+                    break
+
+                batches += 1
+                for key, value in (await self._process_batch(emails, llm, concurrency)).items():
+                    totals[key] += value
+                # Each batch is committed on its own; JobRunner commits the job status at the end
+                await self.db.commit()
+
+                if reprocess:
+                    complete = True
+                    break
+                if time.monotonic() >= deadline:
+                    logger.info(f"Extraction paused after {batches} batches, continuing in a new job")
+                    break
+        finally:
+            await llm.close()
+
+        return {**totals, "batches": batches, "complete": complete}
 
+    async def _process_batch(self, emails: List[Email], llm, concurrency: int) -> Dict[str, int]:
+        """Run the LLM over one claimed batch and write the results (flushed, not committed)."""
+        logger.info(f"Processing batch of {len(emails)} emails (concurrency {concurrency})")
+
+        # 2. Extract Data via LLM, concurrently. This phase must not touch the session:
+        #    an AsyncSession is not safe for concurrent use.
+        # (In a real app, we'd fetch the full body here if needed)
+        email_texts = [f"Subject: {email.subject}" for email in emails]
+        llm_results = await llm.extract_batch(email_texts, concurrency=concurrency)
+
+        # 3. Persist results sequentially, one savepoint per email, flushed only
         processed_count = 0
         transaction_count = 0
+        failed_count = 0
+        cache_hit_count = 0
+        rate_limit_wait_ms = sum(r.rate_limit_wait_ms for r in llm_results if not isinstance(r, Exception))
+        if rate_limit_wait_ms:
+            logger.info(f"Waited {rate_limit_wait_ms}ms in total for LLM rate limit capacity")
+
+        for email, llm_res in zip(emails, llm_results):
+            if isinstance(llm_res, Exception):
+                logger.error(f"Failed to process email {email.id}: {str(llm_res)}")
+                email.extraction_status = "FAILED"
+                email.extraction_lease_expires_at = None
+                failed_count += 1
+                continue
 
-        for email in emails:
             try:
-                # 2. Extract Data via LLM
-                # (In a real app, we'd fetch the full body here if needed)
-                email_text = f"Subject: {email.subject}"
-                llm_res = await llm.extract_financial_data(email_text)
-
-                # 3. Record LLM Transaction
-                llm_tx_in = LLMTransactionCreate(
-                    job_id=self.job_record.id,
-                    model_name=llm_res.model_name,
-                    provider="openai", # Mock
-                    prompt_hash=llm_res.prompt_hash,
-                    input_tokens=llm_res.input_tokens,
-                    output_tokens=llm_res.output_tokens,
-                    total_tokens=llm_res.input_tokens + llm_res.output_tokens,
-                    latency_ms=llm_res.latency_ms
-                )
-                await llm_tx_service.create_transaction(llm_tx_in)
-
-                # 4. Save Extraction result
-                ext_in = EmailExtractionCreate(
-                    email_id=email.id,
-                    status="SUCCESS" if llm_res.content.get("is_transaction") else "SKIPPED",
-                    extracted_json=llm_res.content,
-                    model_used=llm_res.model_name,
-                    prompt_hash=llm_res.prompt_hash
-                )
-                await ext_service.create_extraction(ext_in)
-
-                # 5. Create Financial Transaction if applicable
-                if llm_res.content.get("is_transaction"):
-                    # Find or create category
-                    cat_name = llm_res.content.get("category", "General")
-                    cat = await cat_service.get_category_by_name(email.user_id, cat_name)
-                    if not cat:
-                        # Simple mock: just use a default or create it
-                        from app.schemas.category import CategoryCreate
-                        cat = await cat_service.create_category(CategoryCreate(
-                            name=cat_name,
-                            type="expense"
-                        ), email.user_id)
-
-                    tx_in = TransactionCreate(
-                        user_id=email.user_id,
-                        amount=llm_res.content.get("amount"),
-                        type="expense",
-                        occurred_at=email.received_at, # Use email date as default
-                        category_id=cat.id,
-                        notes=f"Auto-extracted from email: {email.subject}"
-                    )
-                    await tx_service.create_transaction(tx_in, email.user_id)
-                    transaction_count += 1
-
-                # 6. Update Email Status
+                async with self.db.begin_nested():
+                    if await self._store_result(email, llm_res, llm.name):
+                        transaction_count += 1
                 email.extraction_status = "COMPLETED"
+                email.extraction_lease_expires_at = None
                 processed_count += 1
-                
-                await self.db.commit()
-
+                cache_hit_count += llm_res.cache_hit
             except Exception as e:
                 logger.error(f"Failed to process email {email.id}: {str(e)}")
                 email.extraction_status = "FAILED"
-                await self.db.commit()
+                email.extraction_lease_expires_at = None
+                failed_count += 1
 
         return {
             "processed_count": processed_count,
-            "transaction_count": transaction_count
+            "transaction_count": transaction_count,
+            "failed_count": failed_count,
+            "cache_hit_count": cache_hit_count,
+            "rate_limit_wait_ms": rate_limit_wait_ms
         }
+
+    async def _store_result(self, email: Email, llm_res: LLMResponse, provider_name: str) -> bool:
+        """
+        Write the LLM transaction, extraction and (if applicable) financial
+        transaction for one email without committing.
+        Returns True if a financial transaction was created.
+        """
+        # Record LLM Transaction
+        llm_tx_in = LLMTransactionCreate(
+            job_id=self.job_record.id,
+            model_name=llm_res.model_name,
+            provider=provider_name,
+            prompt_version=llm_res.prompt_version,
+            prompt_hash=llm_res.prompt_hash,
+            input_tokens=llm_res.input_tokens,
+            output_tokens=llm_res.output_tokens,
+            total_tokens=llm_res.input_tokens + llm_res.output_tokens,
+            estimated_cost=estimate_cost(llm_res.model_name, llm_res.input_tokens, llm_res.output_tokens),
+            latency_ms=llm_res.latency_ms,
+            cache_hit=llm_res.cache_hit
+        )
+        await LLMTransactionService(self.db).create_transaction(llm_tx_in, commit=False)
+
+        # Save Extraction result
+        ext_in = EmailExtractionCreate(
+            email_id=email.id,
+            status="SUCCESS" if llm_res.content.get("is_transaction") else "SKIPPED",
+            extracted_json=llm_res.content,
+            model_used=llm_res.model_name,
+            prompt_hash=llm_res.prompt_hash
+        )
+        await EmailExtractionService(self.db).create_extraction(ext_in, commit=False)
+
+        if not llm_res.content.get("is_transaction"):
+            return False
+
+        # Create Financial Transaction: find or create category
+        cat_service = CategoryService(self.db)
+        cat_name = llm_res.content.get("category", "General")
+        cat = await cat_service.get_category_by_name(email.user_id, cat_name)
+        if not cat:
+            # Simple mock: just use a default or create it
+            cat = await cat_service.create_category(CategoryCreate(
+                name=cat_name,
+                type="expense"
+            ), email.user_id, commit=False)
+
+        tx_in = TransactionCreate(
+            user_id=email.user_id,
+            amount=llm_res.content.get("amount"),
+            type="expense",
+            occurred_at=email.received_at, # Use email date as default
+            category_id=cat.id,
+            notes=f"Auto-extracted from email: {email.subject}"
+        )
+        await TransactionService(self.db).create_transaction(tx_in, email.user_id, commit=False)
+        return True
@@ -1,13 +1,22 @@
+from app.email.exceptions import EmailSyncExpiredError
 from app.email.providers import ProviderFactory
 from app.services.email_service import EmailService
 from app.services.connected_account_service import ConnectedAccountService
 from app.schemas.email import EmailCreate
 from app.jobs.base import BaseJob
-from typing import Dict, Any
+from app.core.config import settings
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# A resync lists from a little before the last sync; re-fetched messages are
+# skipped by the upsert, while anything between the checkpoint and last_synced_at is not lost
+RESYNC_OVERLAP = timedelta(hours=1)
+
 class EmailFetchJob(BaseJob):
     """
     Job to fetch emails from a provider and store them in the database.
@@ -19,6 +28,8 @@ class EmailFetchJob(BaseJob):
         limit = self.input_payload.get("limit", 20)
         cursor = self.input_payload.get("cursor")
         account_id = self.input_payload.get("account_id")
+        backfill = self.input_payload.get("backfill", False)
+        since = self.input_payload.get("since")
 
         if not user_id:
             raise ValueError("user_id is required in input_payload")
@@ -48,9 +59,9 @@ class EmailFetchJob(BaseJob):
 
         try:
             # 3. Connect (using tokens from DB)
-            from app.core.config import settings
             # Mapping credentials dynamically based on provider could be handled in factory or here
             creds = {
+                "account_id": account.id,
                 "access_token": account.access_token,
                 "refresh_token": account.refresh_token,
             }
@@ -64,42 +75,159 @@ class EmailFetchJob(BaseJob):
             
             await provider.connect(creds)
 
-            # 4. Fetch
-            messages = await provider.fetch_messages(cursor=cursor, limit=limit)
-            logger.info(f"Fetched {len(messages)} messages for user {user_id}")
+            if backfill:
+                since_dt = datetime.fromisoformat(since) if since else None
+                if since_dt and since_dt.tzinfo is None:
+                    since_dt = since_dt.replace(tzinfo=timezone.utc)
+                return await self._backfill(provider, account, user_id, since_dt)
+
+            # 4. Fetch: only changes since the stored checkpoint when possible,
+            #    otherwise list from the top (or the caller-supplied cursor)
+            messages = None
+            new_checkpoint = None
+            sync_mode = "full"
+
+            if account.sync_history_id and not cursor and provider.supports_incremental_sync:
+                try:
+                    messages, new_checkpoint = await provider.fetch_changes(account.sync_history_id)
+                    sync_mode = "incremental"
+                except EmailSyncExpiredError:
+                    # Page through everything since the last sync; the checkpoint
+                    # moves only once the last page is stored
+                    logger.warning(f"Sync checkpoint expired for account {account.id}, running paged resync")
+                    since_dt = account.last_synced_at - RESYNC_OVERLAP if account.last_synced_at else None
+                    if since_dt and since_dt.tzinfo is None:
+                        since_dt = since_dt.replace(tzinfo=timezone.utc)
+                    result = await self._backfill(provider, account, user_id, since_dt, sync_mode="resync")
+                    conn_service.record_poll_result(account, found_new_mail=result["saved_count"] > 0)
+                    return result
+
+            if messages is None:
+                if not cursor:
+                    # Taken before listing so nothing arriving meanwhile is missed next time
+                    new_checkpoint = await provider.get_sync_checkpoint()
+                messages = await provider.fetch_messages(cursor=cursor, limit=limit)
+
+            logger.info(f"Fetched {len(messages)} messages for user {user_id} ({sync_mode} sync)")
+
+            if new_checkpoint:
+                # Committed together with the emails below
+                account.sync_history_id = new_checkpoint
+                account.last_synced_at = datetime.now(timezone.utc)
 
-            # 5. Store & Deduplicate
+            # 5. Store & Deduplicate (single round trip per chunk, conflicts are skipped).
+            #    Not committed here: JobRunner commits the emails, checkpoint and job status at once.
             email_service = EmailService(self.db)
-            saved_count = 0
-            
-            for msg in messages:
-                # Check if exists
-                existing = await email_service.get_email_by_provider_id(
-                    user_id=user_id, 
-                    provider=msg.provider, 
-                    provider_message_id=msg.provider_message_id
-                )
-                if not existing:
-                    email_in = EmailCreate(
-                        user_id=user_id,
-                        connected_account_id=account.id,
-                        provider=msg.provider,
-                        provider_message_id=msg.provider_message_id,
-                        thread_id=msg.thread_id,
-                        subject=msg.subject,
-                        received_at=msg.received_at
-                    )
-                    await email_service.create_email(email_in)
-                    saved_count += 1
-
-            await self.db.commit()
-            
+            emails_in = [self._to_email_create(msg, user_id, account.id) for msg in messages]
+            upsert_result = await email_service.bulk_upsert_emails(emails_in, commit=False)
+            saved_count = upsert_result.inserted
+
+            # Busy inboxes are polled more often, quiet ones less (committed with the emails)
+            conn_service.record_poll_result(account, found_new_mail=saved_count > 0)
+
             return {
                 "fetched_count": len(messages),
                 "saved_count": saved_count,
+                "skipped_count": upsert_result.skipped,
+                "sync_mode": sync_mode,
                 "user_id": user_id
             }
 
         finally:
             # Always disconnect
             await provider.disconnect()
+
+    async def _backfill(
+        self, provider, account, user_id: int, since: Optional[datetime], sync_mode: str = "backfill"
+    ) -> Dict[str, Any]:
+        """
+        Ingest the whole mailbox (or everything after `since`) page by page.
+        Each page is committed together with the position reached
+        (account.backfill_state), so memory stays bounded by the page size and an
+        interrupted backfill resumes from the last committed page instead of page 1.
+        After EMAIL_BACKFILL_SLICE_SECONDS the job stops with complete=False and the
+        worker enqueues the next part. The incremental sync checkpoint, taken when
+        the backfill started, is stored only with the last page.
+        """
+        page_size = self.input_payload.get("page_size", 100)
+        part = self.input_payload.get("part", 1)
+        since_key = since.isoformat() if since else None
+
+        state = account.backfill_state or {}
+        if state.get("page_token") and state.get("since") == since_key:
+            page_token, checkpoint = state["page_token"], state.get("history_id")
+            logger.info(f"Resuming backfill for account {account.id} from part {state.get('part')}")
+        else:
+            # Taken up front so incremental syncs resume from the start of the backfill
+            page_token, checkpoint = None, await provider.get_sync_checkpoint()
+
+        email_service = EmailService(self.db)
+        fetched_count = saved_count = skipped_count = pages = 0
+        deadline = time.monotonic() + settings.EMAIL_BACKFILL_SLICE_SECONDS
+        complete = False
+
+        async with aclosing(provider.iter_messages(since=since, page_size=page_size, page_token=page_token)) as pages_iter:
+            async for page in pages_iter:
+                upsert_result = await email_service.bulk_upsert_emails(
+                    [self._to_email_create(msg, user_id, account.id) for msg in page.messages],
+                    commit=False
+                )
+                pages += 1
+                fetched_count += len(page.messages)
+                saved_count += upsert_result.inserted
+                skipped_count += upsert_result.skipped
+
+                if page.next_page_token:
+                    account.backfill_state = {
+                        "since": since_key, "page_token": page.next_page_token, "history_id": checkpoint, "part": part
+                    }
+                else:
+                    self._finish_backfill(account, checkpoint)
+                    complete = True
+                # The page and the position reached are committed together
+                await self.db.commit()
+                logger.info(
+                    f"Backfill page {pages} for account {account.id}: "
+                    f"{upsert_result.inserted} saved, {fetched_count} fetched so far"
+                )
+
+                if page.next_page_token and time.monotonic() >= deadline:
+                    logger.info(f"Backfill of account {account.id} paused after part {part}, continuing in a new job")
+                    break
+            else:
+                if not complete:
+                    # Provider yielded no pages at all
+                    self._finish_backfill(account, checkpoint)
+                    complete = True
+
+        return {
+            "fetched_count": fetched_count,
+            "saved_count": saved_count,
+            "skipped_count": skipped_count,
+            "pages": pages,
+            "part": part,
+            "complete": complete,
+            "since": since_key,
+            "account_id": account.id,
+            "sync_mode": sync_mode,
+            "user_id": user_id
+        }
+
+    @staticmethod
+    def _finish_backfill(account, checkpoint: Optional[str]) -> None:
+        account.backfill_state = None
+        if checkpoint:
+            account.sync_history_id = checkpoint
+            account.last_synced_at = datetime.now(timezone.utc)
+
+    @staticmethod
+    def _to_email_create(msg, user_id: int, account_id: int) -> EmailCreate:
+        return EmailCreate(
+            user_id=user_id,
+            connected_account_id=account_id,
+            provider=msg.provider,
+            provider_message_id=msg.provider_message_id,
+            thread_id=msg.thread_id,
+            subject=msg.subject,
+            received_at=msg.received_at
+        )
@@ -0,0 +1,16 @@
+from .exceptions import LLMProviderError, LLMAuthError, LLMRequestError, LLMRateLimitError, LLMResponseError
+from .dto import LLMResponse
+from .prompts import PROMPT_VERSION, compute_prompt_hash
+from .pricing import estimate_cost
+
+__all__ = [
+    "LLMProviderError",
+    "LLMAuthError",
+    "LLMRequestError",
+    "LLMRateLimitError",
+    "LLMResponseError",
+    "LLMResponse",
+    "PROMPT_VERSION",
+    "compute_prompt_hash",
+    "estimate_cost",
+]
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Any
+
+from app.llm.prompts import PROMPT_VERSION
+
+
+@dataclass
+class LLMResponse:
+    """Normalized result of one extraction call, independent of the provider."""
+    content: Any
+    model_name: str
+    prompt_hash: str
+    input_tokens: int
+    output_tokens: int
+    latency_ms: int
+    prompt_version: str = PROMPT_VERSION
+    cache_hit: bool = False
+    # Time spent waiting for rate limit capacity before/while calling the provider
+    rate_limit_wait_ms: int = 0
@@ -0,0 +1,26 @@
+class LLMProviderError(Exception):
+    """Base exception for all LLM provider errors."""
+    def __init__(self, message: str, provider: str = None):
+        self.message = message
+        self.provider = provider
+        super().__init__(self.message)
+
+
+class LLMAuthError(LLMProviderError):
+    """Raised when the LLM provider rejects the API key."""
+    pass
+
+
+class LLMRequestError(LLMProviderError):
+    """Raised when a completion request fails (connection, timeout, 4xx/5xx)."""
+    pass
+
+
+class LLMRateLimitError(LLMProviderError):
+    """Raised when the provider rate limits requests."""
+    pass
+
+
+class LLMResponseError(LLMProviderError):
+    """Raised when the model's output cannot be parsed."""
+    pass
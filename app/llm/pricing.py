@@ -0,0 +1,13 @@
+from typing import Dict, Tuple
+
+# USD per 1M tokens (input, output)
+MODEL_PRICING: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of a call; 0.0 for models without known pricing."""
+    input_price, output_price = MODEL_PRICING.get(model_name, (0.0, 0.0))
+    return round((input_tokens * input_price + output_tokens * output_price) / 1_000_000, 6)
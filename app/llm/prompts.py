@@ -0,0 +1,26 @@
+import hashlib
+from typing import Dict, List
+
+# Bump whenever the extraction prompt or output schema changes; cached results
+# from older versions are then ignored.
+PROMPT_VERSION = "extraction-v1"
+
+EXTRACTION_SYSTEM_PROMPT = (
+    "You extract financial transactions from emails. "
+    "Reply with a single JSON object with the keys: "
+    "is_transaction (bool), amount (number or null), currency (ISO 4217 code or null), "
+    "merchant (string or null), category (short category name, e.g. Transport, Shopping, General)."
+)
+
+
+def compute_prompt_hash(email_text: str) -> str:
+    """Stable hash of the prompt input, used for caching and auditing."""
+    return hashlib.sha256(email_text.encode()).hexdigest()[:16]
+
+
+def build_extraction_messages(email_text: str) -> List[Dict[str, str]]:
+    """Chat messages for the financial data extraction prompt."""
+    return [
+        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+        {"role": "user", "content": email_text},
+    ]
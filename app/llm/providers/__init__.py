@@ -0,0 +1,6 @@
+from .base import LLMProvider
+from .mock import MockLLMProvider
+from .openai import OpenAIProvider, close_client
+from .factory import LLMProviderFactory
+
+__all__ = ["LLMProvider", "MockLLMProvider", "OpenAIProvider", "LLMProviderFactory", "close_client"]
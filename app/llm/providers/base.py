@@ -0,0 +1,47 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Union
+from app.llm.dto import LLMResponse
+
+
+class LLMProvider(ABC):
+    """
+    Abstract Base Class for LLM providers.
+    Implementations share connections per process, so instances are cheap to create per job.
+    """
+
+    # Stored in LLMTransaction.provider
+    name: str = "unknown"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @abstractmethod
+    async def extract_financial_data(self, email_text: str) -> LLMResponse:
+        """
+        Extract financial data from an email.
+        :param email_text: Prompt input (subject and/or body).
+        :return: LLMResponse with the parsed JSON content and usage.
+        """
+        pass
+
+    async def extract_batch(
+        self,
+        email_texts: Sequence[str],
+        concurrency: int = 10
+    ) -> List[Union[LLMResponse, Exception]]:
+        """
+        Submit many prompts with at most `concurrency` requests in flight.
+        Results keep input order; a failed call yields its exception instead of a response.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def extract(email_text: str) -> LLMResponse:
+            async with semaphore:
+                return await self.extract_financial_data(email_text)
+
+        return await asyncio.gather(*(extract(text) for text in email_texts), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Release per-instance resources. Shared connection pools stay open."""
+        pass
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional, Type
+from app.core.config import settings
+from app.llm.providers.base import LLMProvider
+from app.llm.providers.mock import MockLLMProvider
+from app.llm.providers.openai import OpenAIProvider
+
+class LLMProviderFactory:
+    _providers: Dict[str, Type[LLMProvider]] = {}
+
+    @classmethod
+    def register(cls, name: str, provider_cls: Type[LLMProvider]):
+        cls._providers[name.lower()] = provider_cls
+
+    @classmethod
+    def get_provider(cls, name: Optional[str] = None, **kwargs: Any) -> LLMProvider:
+        """Instantiate a provider by name (defaults to LLM_PROVIDER)."""
+        name = name or settings.LLM_PROVIDER
+        provider_cls = cls._providers.get(name.lower())
+        if not provider_cls:
+            raise ValueError(f"Unsupported LLM provider: {name}")
+        return provider_cls(**kwargs)
+
+# Register initial providers
+LLMProviderFactory.register("mock", MockLLMProvider)
+LLMProviderFactory.register("openai", OpenAIProvider)
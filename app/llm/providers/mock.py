@@ -1,27 +1,29 @@
+import asyncio
 import logging
 import random
-import hashlib
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from app.core.config import settings
+from app.llm.dto import LLMResponse
+from app.llm.prompts import compute_prompt_hash
+from app.llm.providers.base import LLMProvider
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class LLMResponse:
-    content: Any
-    model_name: str
-    prompt_hash: str
-    input_tokens: int
-    output_tokens: int
-    latency_ms: int
 
-class MockLLMService:
+class MockLLMProvider(LLMProvider):
     """
-    Mock LLM Service for demonstrating email extraction.
+    Mock LLM provider for demonstrating email extraction.
     """
 
-    def __init__(self, model_name: str = "gpt-4o"):
-        self.model_name = model_name
+    name = "mock"
+
+    def __init__(self, model_name: str = None, latency_scale: float = None):
+        """
+        :param latency_scale: Fraction of the reported latency_ms to actually sleep
+            (0 returns immediately, 1.0 mimics real 800-2500ms round trips).
+            Defaults to MOCK_LLM_LATENCY_SCALE.
+        """
+        super().__init__(model_name or settings.LLM_MODEL)
+        self.latency_scale = settings.MOCK_LLM_LATENCY_SCALE if latency_scale is None else latency_scale
 
     async def extract_financial_data(self, email_text: str) -> LLMResponse:
         """
@@ -30,7 +32,7 @@ class MockLLMService:
         logger.info(f"Mock LLM: Processing email with model {self.model_name}")
         
         # Simulate some logic based on text
-        prompt_hash = hashlib.sha256(email_text.encode()).hexdigest()[:16]
+        prompt_hash = compute_prompt_hash(email_text)
         
         # Mock result
         content = {
@@ -48,11 +50,15 @@ class MockLLMService:
             content["merchant"] = "Amazon"
             content["category"] = "Shopping"
 
+        latency_ms = random.randint(800, 2500)
+        if self.latency_scale > 0:
+            await asyncio.sleep(latency_ms / 1000 * self.latency_scale)
+
         return LLMResponse(
             content=content,
             model_name=self.model_name,
             prompt_hash=prompt_hash,
             input_tokens=random.randint(500, 1500),
             output_tokens=random.randint(200, 500),
-            latency_ms=random.randint(800, 2500)
+            latency_ms=latency_ms
         )
@@ -0,0 +1,94 @@
+import json
+import logging
+import time
+from typing import Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.llm.dto import LLMResponse
+from app.llm.exceptions import (
+    LLMAuthError, LLMRequestError, LLMRateLimitError, LLMResponseError
+)
+from app.llm.prompts import build_extraction_messages, compute_prompt_hash
+from app.llm.providers.base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+# One pooled HTTP client per process: every provider instance (one per job)
+# reuses its keep-alive connections instead of opening new TLS sessions.
+_client: Optional[AsyncOpenAI] = None
+
+
+def get_client() -> AsyncOpenAI:
+    """Process-wide AsyncOpenAI client on a connection-pooled httpx client."""
+    global _client
+    if _client is None:
+        http_client = openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS
+            ),
+            timeout=settings.LLM_TIMEOUT_SECONDS
+        )
+        _client = AsyncOpenAI(
+            api_key=settings.LLM_API_KEY or "not-set",
+            base_url=settings.LLM_BASE_URL,
+            http_client=http_client
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client's connection pool (worker shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+class OpenAIProvider(LLMProvider):
+    """
+    OpenAI-compatible chat completions provider (OpenAI, Azure-style proxies,
+    vLLM, local stub server) selected by LLM_BASE_URL.
+    """
+
+    name = "openai"
+
+    def __init__(self, model_name: str = None, client: Optional[AsyncOpenAI] = None):
+        super().__init__(model_name or settings.LLM_MODEL)
+        self._client = client or get_client()
+
+    async def extract_financial_data(self, email_text: str) -> LLMResponse:
+        start = time.perf_counter()
+        try:
+            completion = await self._client.chat.completions.create(
+                model=self.model_name,
+                messages=build_extraction_messages(email_text),
+                response_format={"type": "json_object"},
+                temperature=0
+            )
+        except openai.AuthenticationError as e:
+            raise LLMAuthError(f"Authentication failed: {str(e)}", provider=self.name)
+        except openai.RateLimitError as e:
+            raise LLMRateLimitError(f"Rate limited: {str(e)}", provider=self.name)
+        except openai.OpenAIError as e:
+            raise LLMRequestError(f"Completion failed: {str(e)}", provider=self.name)
+        latency_ms = int((time.perf_counter() - start) * 1000)
+
+        try:
+            content = json.loads(completion.choices[0].message.content)
+        except (IndexError, TypeError, ValueError) as e:
+            raise LLMResponseError(f"Invalid JSON output: {str(e)}", provider=self.name)
+
+        usage = completion.usage
+        return LLMResponse(
+            content=content,
+            model_name=completion.model or self.model_name,
+            prompt_hash=compute_prompt_hash(email_text),
+            input_tokens=usage.prompt_tokens if usage else 0,
+            output_tokens=usage.completion_tokens if usage else 0,
+            latency_ms=latency_ms
+        )
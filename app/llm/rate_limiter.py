@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import random
+from dataclasses import replace
+from typing import Optional
+
+from app.core import redis as redis_core
+from app.core.config import settings
+from app.llm.dto import LLMResponse
+from app.llm.exceptions import LLMRateLimitError
+from app.llm.prompts import EXTRACTION_SYSTEM_PROMPT
+from app.llm.providers.base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "llm_rate"
+# Upper bound for a single sleep while waiting for capacity; waiters re-check after it
+MAX_WAIT_STEP_SECONDS = 5.0
+# Expected completion size used when reserving tokens before a call
+ESTIMATED_OUTPUT_TOKENS = 200
+
+# Two token buckets per model, refilled continuously at capacity/minute.
+# Time comes from the Redis server so all workers share one clock.
+# KEYS[1]: request bucket, KEYS[2]: token bucket
+# ARGV[1]: requests per minute (0 = unlimited), ARGV[2]: tokens per minute (0 = unlimited)
+# ARGV[3]: tokens to take, ARGV[4]: "acquire" (all-or-nothing) or "adjust" (token bucket only, may go negative)
+# Returns 0 when taken, otherwise the milliseconds until enough capacity is available.
+TOKEN_BUCKET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local tokens = tonumber(ARGV[3])
+
+local function level(key, capacity)
+    local state = redis.call('HMGET', key, 'level', 'ts')
+    local current = tonumber(state[1])
+    if current == nil then
+        return capacity
+    end
+    return math.min(capacity, current + (now - tonumber(state[2])) * capacity / 60000)
+end
+
+local function store(key, value)
+    redis.call('HSET', key, 'level', value, 'ts', now)
+    redis.call('PEXPIRE', key, 120000)
+end
+
+if ARGV[4] == 'adjust' then
+    if tpm > 0 then
+        store(KEYS[2], level(KEYS[2], tpm) - tokens)
+    end
+    return 0
+end
+
+local wait = 0
+local requests_left = 0
+local tokens_left = 0
+if rpm > 0 then
+    requests_left = level(KEYS[1], rpm)
+    if requests_left < 1 then
+        wait = math.max(wait, (1 - requests_left) * 60000 / rpm)
+    end
+end
+if tpm > 0 then
+    tokens_left = level(KEYS[2], tpm)
+    if tokens_left < tokens then
+        wait = math.max(wait, (tokens - tokens_left) * 60000 / tpm)
+    end
+end
+if wait > 0 then
+    return math.ceil(wait)
+end
+
+if rpm > 0 then
+    store(KEYS[1], requests_left - 1)
+end
+if tpm > 0 then
+    store(KEYS[2], tokens_left - tokens)
+end
+return 0
+"""
+
+
+def estimate_tokens(email_text: str) -> int:
+    """Rough prompt + completion size (~4 characters per token) reserved before a call."""
+    return (len(EXTRACTION_SYSTEM_PROMPT) + len(email_text)) // 4 + ESTIMATED_OUTPUT_TOKENS
+
+
+class LLMRateLimiter:
+    """
+    Redis token-bucket limiter for requests/minute and tokens/minute per model,
+    shared by every worker using the same Redis. Without Redis it does not limit.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._script = None
+        self._script_client = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute > 0 or self.tokens_per_minute > 0
+
+    @staticmethod
+    def _keys(model_name: str):
+        return [f"{RATE_LIMIT_KEY_PREFIX}:{model_name}:requests", f"{RATE_LIMIT_KEY_PREFIX}:{model_name}:tokens"]
+
+    async def _run(self, model_name: str, tokens: int, mode: str) -> Optional[int]:
+        client = redis_core.redis_client
+        if client is None:
+            return None
+        if self._script_client is not client:
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = client
+        try:
+            return int(await self._script(
+                keys=self._keys(model_name),
+                args=[self.requests_per_minute, self.tokens_per_minute, tokens, mode]
+            ))
+        except Exception as e:
+            logger.warning(f"LLM rate limiter unavailable, not limiting: {str(e)}")
+            return None
+
+    async def acquire(self, model_name: str, tokens: int) -> float:
+        """
+        Wait until one request and `tokens` tokens are available, then take them.
+        :return: Seconds spent waiting.
+        """
+        if not self.enabled:
+            return 0.0
+        if self.tokens_per_minute > 0:
+            # A single call larger than the whole bucket could never be admitted
+            tokens = min(tokens, self.tokens_per_minute)
+
+        waited = 0.0
+        while True:
+            wait_ms = await self._run(model_name, tokens, "acquire")
+            if not wait_ms:
+                return waited
+            # Jitter spreads waiters that were blocked on the same refill
+            delay = min(wait_ms / 1000, MAX_WAIT_STEP_SECONDS) * random.uniform(1.0, 1.2)
+            await asyncio.sleep(delay)
+            waited += delay
+
+    async def adjust(self, model_name: str, tokens: int) -> None:
+        """Correct the token bucket once actual usage is known (negative refunds)."""
+        if self.tokens_per_minute > 0 and tokens:
+            await self._run(model_name, tokens, "adjust")
+
+
+# Process-wide instance configured from settings
+llm_rate_limiter = LLMRateLimiter(settings.LLM_REQUESTS_PER_MINUTE, settings.LLM_TOKENS_PER_MINUTE)
+
+
+class RateLimitedLLMProvider(LLMProvider):
+    """
+    Wraps an LLM provider so every call first waits for rate limit capacity.
+    Provider-side 429s are retried with backoff instead of failing the email.
+    Time spent waiting is reported in LLMResponse.rate_limit_wait_ms.
+    """
+
+    def __init__(self, llm: LLMProvider, limiter: LLMRateLimiter = llm_rate_limiter):
+        super().__init__(llm.model_name)
+        self.llm = llm
+        self.limiter = limiter
+        self.name = llm.name
+
+    async def extract_financial_data(self, email_text: str) -> LLMResponse:
+        reserved = estimate_tokens(email_text)
+        waited = 0.0
+
+        for attempt in range(settings.LLM_RATE_LIMIT_MAX_RETRIES + 1):
+            waited += await self.limiter.acquire(self.model_name, reserved)
+            try:
+                response = await self.llm.extract_financial_data(email_text)
+                break
+            except LLMRateLimitError:
+                if attempt == settings.LLM_RATE_LIMIT_MAX_RETRIES:
+                    raise
+                delay = 2 ** attempt + random.uniform(0, 1)
+                logger.warning(f"LLM rate limited by provider, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                waited += delay
+
+        await self.limiter.adjust(self.model_name, response.input_tokens + response.output_tokens - reserved)
+        return replace(response, rate_limit_wait_ms=int(waited * 1000))
+
+    async def close(self) -> None:
+        await self.llm.close()
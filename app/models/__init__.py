@@ -2,6 +2,7 @@ from app.models.user import User
 from app.models.role import Role
 from app.models.category import Category
 from app.models.transaction import Transaction
+from app.models.transaction_aggregate import TransactionAggregate
 from app.models.connected_account import ConnectedAccount
 from app.models.email import Email
 from app.models.email_extraction import EmailExtraction
@@ -13,6 +14,7 @@ __all__ = [
     "Role", 
     "Category", 
     "Transaction", 
+    "TransactionAggregate", 
     "ConnectedAccount", 
     "Email", 
     "EmailExtraction", 
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime, timezone
-from typing import Optional, List
-from sqlalchemy import String, Boolean, DateTime, text, ForeignKey, Enum, UniqueConstraint, Text, JSON
+from typing import Any, Dict, Optional, List
+from sqlalchemy import String, Boolean, Integer, DateTime, text, ForeignKey, Enum, UniqueConstraint, Text, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -30,6 +30,15 @@ class ConnectedAccount(Base):
     token_expiry: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Incremental sync checkpoint (Gmail historyId) from the last successful fetch
+    sync_history_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Position of an unfinished backfill: {"since", "page_token", "history_id", "part"}; NULL when none
+    backfill_state: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    # Periodic fetch schedule: adaptive interval (NULL = EMAIL_POLL_DEFAULT_INTERVAL_SECONDS)
+    # and when the scheduler enqueues the next fetch (NULL = not scheduled yet)
+    poll_interval_seconds: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    next_poll_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         server_default=text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
@@ -47,4 +56,6 @@ class ConnectedAccount(Base):
 
     __table_args__ = (
         UniqueConstraint("provider", "email", name="uq_connected_account_provider_email"),
+        # Scheduler scan: active accounts due for a fetch
+        Index("ix_connected_accounts_next_poll_at", "next_poll_at", postgresql_where=text("is_active")),
     )
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional, List
-from sqlalchemy import String, DateTime, text, ForeignKey, UniqueConstraint
+from sqlalchemy import String, DateTime, text, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -28,7 +28,9 @@ class Email(Base):
         default=lambda: datetime.now(timezone.utc)
     )
     
+    # PENDING -> IN_PROGRESS (claimed, leased) -> COMPLETED | FAILED
     extraction_status: Mapped[str] = mapped_column(String, default="PENDING", nullable=False)
+    extraction_lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     extraction_version: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     
     created_at: Mapped[datetime] = mapped_column(
@@ -39,6 +41,18 @@ class Email(Base):
 
     __table_args__ = (
         UniqueConstraint("provider", "provider_message_id", name="uq_email_provider_message_id"),
+        # Per-user listing ordered by received_at (scanned backwards for DESC)
+        Index("ix_emails_user_id_received_at", "user_id", "received_at"),
+        # Extraction claim scan: only the (small) PENDING slice, in id order
+        Index(
+            "ix_emails_pending_extraction", "id",
+            postgresql_where=text("extraction_status = 'PENDING'")
+        ),
+        # Expired-lease requeue
+        Index(
+            "ix_emails_extraction_lease", "extraction_lease_expires_at",
+            postgresql_where=text("extraction_status = 'IN_PROGRESS'")
+        ),
     )
 
     user: Mapped["User"] = relationship("User", back_populates="emails")
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional, Any, List
-from sqlalchemy import String, DateTime, text, JSON, Integer, ForeignKey
+from sqlalchemy import String, DateTime, text, JSON, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -12,8 +12,10 @@ class Job(Base):
     user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     
     job_type: Mapped[str] = mapped_column(String, nullable=False)  # EMAIL_FETCH, EMAIL_EXTRACTION, EMAIL_REPROCESS
-    status: Mapped[str] = mapped_column(String, default="QUEUED", nullable=False)  # QUEUED, RUNNING, SUCCESS, FAILED, CANCELLED
+    status: Mapped[str] = mapped_column(String, default="QUEUED", nullable=False)  # QUEUED, RUNNING, SUCCESS, FAILED, DEAD_LETTER, CANCELLED
     triggered_by: Mapped[str] = mapped_column(String, nullable=False)  # CRON, MANUAL, API, RETRY
+    # ARQ job id of the queued task executing this record
+    arq_job_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
     
     input_payload: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
     output_payload: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)
@@ -32,3 +34,14 @@ class Job(Base):
 
     llm_transactions: Mapped[List["LLMTransaction"]] = relationship("LLMTransaction", back_populates="job", cascade="all, delete-orphan")
     user: Mapped[Optional["User"]] = relationship("User")
+
+    __table_args__ = (
+        # Keyset pagination of the job list, newest first
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        # At most one active record per ARQ job id: concurrent enqueues of the same
+        # job race on this index instead of both creating a record (see TaskService)
+        Index(
+            "uq_jobs_active_arq_job_id", "arq_job_id", unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')")
+        ),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import String, DateTime, text, ForeignKey, Integer, Float
+from sqlalchemy import String, Boolean, DateTime, text, ForeignKey, Integer, Float
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -23,6 +23,8 @@ class LLMTransaction(Base):
     
     estimated_cost: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
     latency_ms: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Served from the result cache: no tokens were spent
+    cache_hit: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("false"), nullable=False)
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
@@ -0,0 +1,48 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Date, ForeignKey, Enum, Numeric, Integer, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.transaction import TransactionType
+
+
+class TransactionAggregate(Base):
+    """
+    Running totals of a user's transactions per (month, category, type).
+    Maintained incrementally by TransactionService; rebuilt from `transactions`
+    by app/scripts/rebuild_transaction_aggregates.py.
+    """
+    __tablename__ = "transaction_aggregates"
+
+    id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        "user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # First day of the month (UTC) of occurred_at
+    month: Mapped[date] = mapped_column(Date, nullable=False)
+    # NULL = uncategorized. A category's rows must be folded into it (uncategorize) before
+    # the category is deleted, mirroring SET NULL on transactions: the FK has no ON DELETE
+    # action, so a delete that skips CategoryService.delete_category fails instead of
+    # silently dropping the totals
+    category_id: Mapped[Optional[int]] = mapped_column(
+        "category_id", ForeignKey("categories.id"), index=True, nullable=True
+    )
+    type: Mapped[TransactionType] = mapped_column(
+        Enum(TransactionType, name="transaction_type"), nullable=False
+    )
+    total_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+# One row per key; coalesce makes the uncategorized bucket unique too (NULLs are distinct otherwise)
+Index(
+    "uq_transaction_aggregates_key",
+    TransactionAggregate.user_id,
+    TransactionAggregate.month,
+    func.coalesce(TransactionAggregate.category_id, 0),
+    TransactionAggregate.type,
+    unique=True
+)
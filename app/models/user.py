@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import String, Boolean, DateTime, text, ForeignKey
+from sqlalchemy import String, Boolean, DateTime, text, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -23,11 +23,6 @@ class User(Base):
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"), nullable=False)
     role: Mapped["Role"] = relationship("Role", back_populates="users")
 
-    otp: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    otp_expires_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime(timezone=True), nullable=True
-    )
-
     refresh_token: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     refresh_token_expiry: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -52,3 +47,8 @@ class User(Base):
         "Email", back_populates="user", cascade="all, delete-orphan"
     )
 
+
+    __table_args__ = (
+        # Keyset pagination of the user list, newest first
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
@@ -16,6 +16,22 @@ class TokenData(BaseModel):
     type: Optional[str] = None
 
 
+class CurrentUser(BaseModel):
+    """
+    The authenticated user as seen by route handlers: identity, role name and
+    the profile fields of /users/me. Cached by get_current_user, so it carries
+    no ORM state and no secrets. In AUTH_STATELESS_MODE it is built from the
+    token claims and only `id`, `role` and `is_active` are set.
+    """
+    id: int
+    role: str
+    is_active: bool = True
+    username: Optional[str] = None
+    name: Optional[str] = None
+    primary_email: Optional[EmailStr] = None
+    created_at: Optional[datetime] = None
+
+
 class UserBase(BaseModel):
     username: str
     primary_email: EmailStr
@@ -28,6 +28,9 @@ class ConnectedAccountResponse(ConnectedAccountBase):
     id: int
     user_id: int
     token_expiry: Optional[datetime] = None
+    last_synced_at: Optional[datetime] = None
+    poll_interval_seconds: Optional[int] = None
+    next_poll_at: Optional[datetime] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -34,3 +34,8 @@ class EmailRead(EmailBase):
     connected_account_id: int
     fetched_at: datetime
     created_at: datetime
+
+
+class EmailBulkUpsertResult(BaseModel):
+    inserted: int
+    skipped: int
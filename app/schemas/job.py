@@ -12,10 +12,11 @@ class JobBase(BaseModel):
     output_payload: Optional[Any] = None
     error_payload: Optional[Any] = None
     retry_count: int = 0
+    arq_job_id: Optional[str] = None
 
 
 class JobCreate(JobBase):
-    pass
+    started_at: Optional[datetime] = None
 
 
 class JobUpdate(BaseModel):
@@ -23,6 +24,7 @@ class JobUpdate(BaseModel):
     output_payload: Optional[Any] = None
     error_payload: Optional[Any] = None
     retry_count: Optional[int] = None
+    arq_job_id: Optional[str] = None
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
 
@@ -34,3 +36,9 @@ class JobRead(JobBase):
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     created_at: datetime
+
+
+class JobEnqueued(BaseModel):
+    job: JobRead
+    # True when an identical job was already pending and `job` is that one
+    coalesced: bool = False
@@ -13,6 +13,7 @@ class LLMTransactionBase(BaseModel):
     total_tokens: int = 0
     estimated_cost: float = 0.0
     latency_ms: int = 0
+    cache_hit: bool = False
 
 
 class LLMTransactionCreate(LLMTransactionBase):
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from pydantic import BaseModel, ConfigDict, Field
 from app.models.transaction import TransactionType, TransactionSource
@@ -34,3 +34,13 @@ class TransactionResponse(TransactionBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TransactionSummaryResponse(BaseModel):
+    month: date
+    category_id: Optional[int] = None
+    type: TransactionType
+    total_amount: float
+    transaction_count: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,93 @@
+"""
+Benchmark: overhead of the get_current_user dependency per request, by mode.
+
+Calls the dependency --requests times with one access token in each mode:
+
+  * db         — every call looks the user up (auth user cache cleared before each call)
+  * cached     — warm auth user cache (in-process tier hit)
+  * stateless  — AUTH_STATELESS_MODE: principal built from the token claims,
+                 checked against the in-memory revocation list
+
+Reports mean/p50/p99 latency and SQL statements per call. Creates a throwaway
+user and removes it afterwards. Redis is not used (in-process tiers only).
+
+Usage:
+    python -m app.scripts.benchmark_auth_dependency --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import delete, event
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import create_access_token
+from app.crud.auth import create_user
+from app.dependencies.auth import get_current_user
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.services.auth_cache import auth_user_cache
+
+MODES = ("db", "cached", "stateless")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+async def main(requests: int) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    statements = 0
+
+    def on_statement(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, UserRegister(
+            name="Auth Benchmark",
+            username=f"bench_auth_{run_id}",
+            primary_email=f"bench_auth_{run_id}@example.com",
+            password="benchmark"
+        ))
+        user_id = user.id
+        token = create_access_token(user.id, user.role.name)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_statement)
+    stateless_mode = settings.AUTH_STATELESS_MODE
+    try:
+        for mode in MODES:
+            settings.AUTH_STATELESS_MODE = mode == "stateless"
+            auth_user_cache.clear()
+            samples = []
+            statements = 0
+            # One session per call, like one request
+            for _ in range(requests):
+                if mode == "db":
+                    auth_user_cache.clear()
+                async with AsyncSessionLocal() as db:
+                    start = time.perf_counter()
+                    await get_current_user(db=db, token=token)
+                    samples.append((time.perf_counter() - start) * 1_000_000)
+            samples.sort()
+            print(
+                f"{mode:<10} mean: {statistics.mean(samples):8.1f}us  p50: {percentile(samples, 0.50):8.1f}us  "
+                f"p99: {percentile(samples, 0.99):8.1f}us  statements/call: {statements / requests:4.2f}"
+            )
+    finally:
+        settings.AUTH_STATELESS_MODE = stateless_mode
+        event.remove(engine.sync_engine, "before_cursor_execute", on_statement)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,150 @@
+"""
+Benchmark: query plans for the emails indexes.
+
+Seeds --rows emails (default 1M) server-side across several throwaway users,
+with ~1% PENDING and ~0.1% IN_PROGRESS with an expired lease, then runs EXPLAIN
+on the hot queries and asserts each one uses its index:
+
+  * claim scan      — crud.email.claim_candidates_query  -> ix_emails_pending_extraction
+  * lease requeue   — crud.email.expired_leases_query     -> ix_emails_extraction_lease
+  * user listing    — crud.email.get_emails_by_user query -> ix_emails_user_id_received_at
+
+Needs the PostgreSQL database in DATABASE_URL with migrations applied. Seeded
+rows are removed afterwards.
+
+Usage:
+    python -m app.scripts.benchmark_email_indexes
+    python -m app.scripts.benchmark_email_indexes --rows 200000 --users 10
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, List, Set
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import AsyncSessionLocal
+from app.crud.auth import create_user
+from app.crud.email import claim_candidates_query, expired_leases_query
+from app.models.connected_account import ConnectedAccount
+from app.models.email import Email
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.schemas.connected_account import ConnectedAccountCreate
+from app.services.connected_account_service import ConnectedAccountService
+
+SEED_SQL = text("""
+    INSERT INTO emails (
+        user_id, connected_account_id, provider, provider_message_id, subject,
+        received_at, fetched_at, extraction_status, extraction_lease_expires_at, created_at
+    )
+    SELECT
+        (CAST(:user_ids AS integer[]))[1 + g % :user_count],
+        (CAST(:account_ids AS integer[]))[1 + g % :user_count],
+        'gmail',
+        CAST(:prefix AS text) || g,
+        'Receipt #' || g,
+        now() - make_interval(secs => g),
+        now(),
+        CASE WHEN g % 100 = 0 THEN 'PENDING' WHEN g % 1000 = 1 THEN 'IN_PROGRESS' ELSE 'COMPLETED' END,
+        CASE WHEN g % 1000 = 1 THEN now() - interval '1 hour' END,
+        now()
+    FROM generate_series(1, :rows) AS g
+""")
+
+
+def index_names(plan: Any) -> Set[str]:
+    """All index names referenced anywhere in an EXPLAIN (FORMAT JSON) plan tree."""
+    names: Set[str] = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            names.add(plan["Index Name"])
+        for value in plan.values():
+            names |= index_names(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            names |= index_names(item)
+    return names
+
+
+async def explain(db, label: str, stmt, expected_index: str, analyze: bool) -> None:
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+    options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+    raw = (await db.execute(text(f"EXPLAIN ({options}) {sql}"))).scalar()
+    # EXPLAIN ANALYZE of a locking SELECT takes row locks; never keep them
+    await db.rollback()
+
+    plan = raw if isinstance(raw, list) else json.loads(raw)
+    used = index_names(plan)
+    timing = f"{plan[0]['Execution Time']:8.2f}ms" if analyze else "   (plan only)"
+    print(f"{label:<14} {timing}  indexes: {', '.join(sorted(used)) or 'none (seq scan)'}")
+    assert expected_index in used, f"{label}: expected {expected_index}, plan used {sorted(used) or 'a seq scan'}"
+
+
+async def main(rows: int, users: int) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    user_ids: List[int] = []
+    account_ids: List[int] = []
+
+    async with AsyncSessionLocal() as db:
+        for i in range(users):
+            user = await create_user(db, UserRegister(
+                name="Index Benchmark",
+                username=f"bench_idx_{run_id}_{i}",
+                primary_email=f"bench_idx_{run_id}_{i}@example.com",
+                password="benchmark"
+            ))
+            account = await ConnectedAccountService(db).create_account(
+                ConnectedAccountCreate(provider="gmail", email=f"bench_idx_{run_id}_{i}@gmail.com"),
+                user_id=user.id
+            )
+            user_ids.append(user.id)
+            account_ids.append(account.id)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await db.execute(SEED_SQL, {
+                "user_ids": user_ids,
+                "account_ids": account_ids,
+                "user_count": users,
+                "prefix": f"bench-idx-{run_id}-",
+                "rows": rows,
+            })
+            await db.commit()
+            print(f"Seeded {rows} emails for {users} users in {time.perf_counter() - start:.1f}s")
+
+            await db.execute(text("ANALYZE emails"))
+            await db.commit()
+
+            await explain(db, "claim scan", claim_candidates_query(100), "ix_emails_pending_extraction", analyze=True)
+            await explain(
+                db, "lease requeue", expired_leases_query(datetime.now(timezone.utc)),
+                "ix_emails_extraction_lease", analyze=False
+            )
+            listing = (
+                select(Email)
+                .where(Email.user_id == user_ids[0])
+                .offset(0).limit(100)
+                .order_by(Email.received_at.desc())
+            )
+            await explain(db, "user listing", listing, "ix_emails_user_id_received_at", analyze=True)
+            print("Index usage verification PASSED")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Email).where(Email.user_id.in_(user_ids)))
+            await db.execute(delete(ConnectedAccount).where(ConnectedAccount.id.in_(account_ids)))
+            await db.execute(delete(User).where(User.id.in_(user_ids)))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.users))
@@ -0,0 +1,52 @@
+"""
+Benchmark: sequential vs. concurrent LLM phase of EmailExtractionJob.
+
+Runs LLMProvider.extract_batch() against MockLLMProvider with a real
+sleep, so no database or API key is needed. Each mock call sleeps its
+reported latency (800-2500ms) multiplied by --latency-scale; use 1.0 for
+real-world figures (the sequential run then takes minutes).
+
+Usage:
+    python -m app.scripts.benchmark_extraction_pipeline
+    python -m app.scripts.benchmark_extraction_pipeline --emails 100 --latency-scale 1.0 --concurrency 1 10 50
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from app.llm.providers import MockLLMProvider
+
+
+async def run(emails: int, concurrency: int, latency_scale: float) -> float:
+    llm = MockLLMProvider(latency_scale=latency_scale)
+    texts = [f"Subject: Your Uber receipt #{i}" for i in range(emails)]
+
+    start = time.perf_counter()
+    results = await llm.extract_batch(texts, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    assert not failures, f"{len(failures)} mock calls failed"
+    return elapsed
+
+
+async def main(emails: int, concurrencies: List[int], latency_scale: float) -> None:
+    print(f"{emails} emails, mock latency 800-2500ms x {latency_scale}")
+    baseline = None
+    for concurrency in concurrencies:
+        elapsed = await run(emails, concurrency, latency_scale)
+        baseline = baseline or elapsed
+        print(
+            f"concurrency {concurrency:>4} | {elapsed:8.2f}s "
+            f"| {emails / elapsed:8.1f} emails/s | speedup: {baseline / elapsed:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latency-scale", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.emails, args.concurrency, args.latency_scale))
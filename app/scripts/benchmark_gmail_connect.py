@@ -0,0 +1,89 @@
+"""
+Benchmark: Gmail provider startup and per-job connect latency.
+
+Reports:
+  * startup   — first parse of the bundled Gmail discovery document
+  * legacy    — googleapiclient build() per connect (re-reads and parses the document)
+  * document  — build_from_document() with the process-level parsed document
+  * cached    — GmailProvider.connect() served from the per-account service LRU
+
+Runs offline: credentials carry a non-expiring access token, so no refresh or
+HTTP request happens.
+
+Usage:
+    python -m app.scripts.benchmark_gmail_connect --iterations 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build, build_from_document
+
+from app.email.providers import gmail
+from app.email.providers.gmail import GmailProvider
+
+CREDENTIALS = {
+    "account_id": 1,
+    "access_token": "benchmark-access-token",
+    "refresh_token": "benchmark-refresh-token",
+    "client_id": "benchmark-client",
+    "client_secret": "benchmark-secret",
+}
+
+
+def report(label: str, samples: List[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1] if len(samples_ms) > 1 else samples_ms[0]
+    print(
+        f"{label:<10} mean: {statistics.mean(samples_ms):8.3f}ms  "
+        f"p50: {statistics.median(samples_ms):8.3f}ms  p95: {p95:8.3f}ms"
+    )
+
+
+def time_sync(func: Callable[[], object], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def time_cached_connect(iterations: int) -> List[float]:
+    # Prime the cache with one connect/disconnect cycle
+    provider = GmailProvider()
+    await provider.connect(CREDENTIALS)
+    await provider.disconnect()
+
+    samples = []
+    for _ in range(iterations):
+        provider = GmailProvider()
+        start = time.perf_counter()
+        await provider.connect(CREDENTIALS)
+        samples.append(time.perf_counter() - start)
+        await provider.disconnect()
+    return samples
+
+
+async def main(iterations: int) -> None:
+    creds = Credentials(token=CREDENTIALS["access_token"])
+
+    start = time.perf_counter()
+    document = gmail.load_discovery_document()
+    report("startup", [time.perf_counter() - start])
+
+    report("legacy", time_sync(lambda: build("gmail", "v1", credentials=creds), iterations))
+    report("document", time_sync(lambda: build_from_document(document, credentials=creds), iterations))
+    report("cached", await time_cached_connect(iterations))
+
+    gmail.shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
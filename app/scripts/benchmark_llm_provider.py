@@ -0,0 +1,87 @@
+"""
+Benchmark: OpenAIProvider throughput against the local stub server.
+
+Starts app.scripts.llm_stub_server in-process and compares:
+  * unpooled   — a new AsyncOpenAI/httpx client per request (new connection each time)
+  * pooled     — one shared client, requests sent one after another
+  * batch      — one shared client, extract_batch() with --concurrency in flight
+
+Runs offline; no API key needed.
+
+Usage:
+    python -m app.scripts.benchmark_llm_provider --requests 200 --delay-ms 50 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.llm.providers import OpenAIProvider
+from app.scripts.llm_stub_server import run_stub_server
+
+MODEL = "gpt-4o-mini"
+
+
+def report(label: str, requests: int, elapsed: float) -> None:
+    print(f"{label:<10} {requests:>5} requests in {elapsed:7.2f}s | {requests / elapsed:8.1f} req/s")
+
+
+async def bench_unpooled(base_url: str, texts) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        client = AsyncOpenAI(api_key="stub", base_url=base_url, http_client=openai.DefaultAsyncHttpxClient())
+        await OpenAIProvider(MODEL, client=client).extract_financial_data(text)
+        await client.close()
+    return time.perf_counter() - start
+
+
+async def bench_pooled(client: AsyncOpenAI, texts) -> float:
+    provider = OpenAIProvider(MODEL, client=client)
+    start = time.perf_counter()
+    for text in texts:
+        await provider.extract_financial_data(text)
+    return time.perf_counter() - start
+
+
+async def bench_batch(client: AsyncOpenAI, texts, concurrency: int) -> float:
+    provider = OpenAIProvider(MODEL, client=client)
+    start = time.perf_counter()
+    results = await provider.extract_batch(texts, concurrency=concurrency)
+    elapsed = time.perf_counter() - start
+    failures = [r for r in results if isinstance(r, Exception)]
+    assert not failures, f"{len(failures)} requests failed: {failures[0]}"
+    return elapsed
+
+
+async def main(requests: int, delay_ms: int, concurrency: int, port: int) -> None:
+    base_url = f"http://127.0.0.1:{port}/v1"
+    texts = [f"Subject: Your Uber receipt #{i}" for i in range(requests)]
+
+    async with run_stub_server(port=port, delay_ms=delay_ms) as stub:
+        # Same shape as app.llm.providers.openai.get_client(), sized to the concurrency
+        client = AsyncOpenAI(
+            api_key="stub",
+            base_url=base_url,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+            )
+        )
+        print(f"Stub delay {delay_ms}ms, concurrency {concurrency}")
+        report("unpooled", requests, await bench_unpooled(base_url, texts))
+        report("pooled", requests, await bench_pooled(client, texts))
+        report("batch", requests, await bench_batch(client, texts, concurrency))
+        await client.close()
+        print(f"Stub served {stub.state.requests} requests")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay-ms", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.delay_ms, args.concurrency, args.port))
@@ -0,0 +1,124 @@
+"""
+Benchmark: OFFSET vs. keyset (cursor) pagination of a user's emails.
+
+Seeds --pages * --limit emails for a throwaway user, then times
+crud.email.get_emails_by_user for page 1 and the last page both ways:
+
+  * offset — skip=(page - 1) * limit, the legacy `skip` parameter
+  * cursor — cursor of the row just before that page (what X-Next-Cursor returns)
+
+Needs the PostgreSQL database in DATABASE_URL with migrations applied. The
+throwaway user and its emails are removed afterwards.
+
+Usage:
+    python -m app.scripts.benchmark_pagination --pages 1000 --limit 100 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import delete, select, text
+
+from app.core.database import AsyncSessionLocal
+from app.core.pagination import Cursor
+from app.crud.auth import create_user
+from app.crud.email import get_emails_by_user
+from app.models.connected_account import ConnectedAccount
+from app.models.email import Email
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.schemas.connected_account import ConnectedAccountCreate
+from app.services.connected_account_service import ConnectedAccountService
+
+SEED_SQL = text("""
+    INSERT INTO emails (
+        user_id, connected_account_id, provider, provider_message_id, subject,
+        received_at, fetched_at, extraction_status, created_at
+    )
+    SELECT
+        :user_id, :account_id, 'gmail', CAST(:prefix AS text) || g, 'Receipt #' || g,
+        now() - make_interval(secs => g), now(), 'COMPLETED', now()
+    FROM generate_series(1, :rows) AS g
+""")
+
+
+async def time_query(query: Callable[[], Awaitable[list]], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await query()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    print(f"{label:<18} mean: {statistics.mean(samples_ms):8.2f}ms  p50: {statistics.median(samples_ms):8.2f}ms")
+
+
+async def main(pages: int, limit: int, repeat: int) -> None:
+    run_id = uuid.uuid4().hex[:8]
+
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, UserRegister(
+            name="Pagination Benchmark",
+            username=f"bench_page_{run_id}",
+            primary_email=f"bench_page_{run_id}@example.com",
+            password="benchmark"
+        ))
+        account = await ConnectedAccountService(db).create_account(
+            ConnectedAccountCreate(provider="gmail", email=f"bench_page_{run_id}@gmail.com"),
+            user_id=user.id
+        )
+        user_id, account_id = user.id, account.id
+
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = pages * limit
+            await db.execute(SEED_SQL, {
+                "user_id": user_id, "account_id": account_id, "prefix": f"bench-page-{run_id}-", "rows": rows
+            })
+            await db.commit()
+            await db.execute(text("ANALYZE emails"))
+            await db.commit()
+            print(f"Seeded {rows} emails ({pages} pages of {limit})")
+
+            # Position of the row just before the last page, as a client holding the cursor would have it
+            skip = (pages - 1) * limit
+            before_last = (await db.execute(
+                select(Email.received_at, Email.id)
+                .where(Email.user_id == user_id)
+                .order_by(Email.received_at.desc(), Email.id.desc())
+                .offset(skip - 1).limit(1)
+            )).one()
+            cursor: Cursor = (before_last.received_at, before_last.id)
+
+            offset_page = await get_emails_by_user(db, user_id, skip=skip, limit=limit)
+            cursor_page = await get_emails_by_user(db, user_id, limit=limit, cursor=cursor)
+            assert [e.id for e in offset_page] == [e.id for e in cursor_page], "Cursor page differs from offset page"
+
+            report("page 1", await time_query(lambda: get_emails_by_user(db, user_id, limit=limit), repeat))
+            report(f"page {pages} offset", await time_query(
+                lambda: get_emails_by_user(db, user_id, skip=skip, limit=limit), repeat
+            ))
+            report(f"page {pages} cursor", await time_query(
+                lambda: get_emails_by_user(db, user_id, limit=limit, cursor=cursor), repeat
+            ))
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Email).where(Email.user_id == user_id))
+            await db.execute(delete(ConnectedAccount).where(ConnectedAccount.id == account_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.limit, args.repeat))
@@ -0,0 +1,140 @@
+"""
+Benchmark: round trips for persisting extraction results, per-call commit vs. unit of work.
+
+For --emails emails, writes what EmailExtractionJob stores for each one
+(LLM transaction, extraction, financial transaction, email status) twice:
+
+  * per-call   — every CRUD call commits and refreshes (commit=True)
+  * unit       — CRUD calls only flush (commit=False), one commit via unit_of_work()
+
+Counts the SQL statements and commits each mode issues. Creates a throwaway
+user, account and emails and removes them afterwards.
+
+Usage:
+    python -m app.scripts.benchmark_unit_of_work --emails 100
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlalchemy import delete, event
+
+from app.core.database import AsyncSessionLocal, engine, unit_of_work
+from app.crud.auth import create_user
+from app.models.connected_account import ConnectedAccount
+from app.models.email import Email
+from app.models.email_extraction import EmailExtraction
+from app.models.job import Job
+from app.models.llm_transaction import LLMTransaction
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.schemas.connected_account import ConnectedAccountCreate
+from app.schemas.email import EmailCreate, EmailUpdate
+from app.schemas.email_extraction import EmailExtractionCreate
+from app.schemas.llm_transaction import LLMTransactionCreate
+from app.schemas.transaction import TransactionCreate
+from app.services.connected_account_service import ConnectedAccountService
+from app.services.email_extraction_service import EmailExtractionService
+from app.services.email_service import EmailService
+from app.services.job_service import JobService
+from app.services.llm_transaction_service import LLMTransactionService
+from app.services.transaction_service import TransactionService
+
+
+class RoundTripCounter:
+    def __init__(self):
+        self.counts: Dict[str, int] = {"statements": 0, "commits": 0}
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+
+    def _on_statement(self, *args) -> None:
+        self.counts["statements"] += 1
+
+    def _on_commit(self, *args) -> None:
+        self.counts["commits"] += 1
+
+    def reset(self) -> None:
+        self.counts = {"statements": 0, "commits": 0}
+
+
+async def store_results(db, job_id: int, user_id: int, email_ids: List[int], commit: bool) -> None:
+    email_service = EmailService(db)
+    for email_id in email_ids:
+        await LLMTransactionService(db).create_transaction(LLMTransactionCreate(
+            job_id=job_id, model_name="mock-model", provider="mock", prompt_hash="benchmark",
+            input_tokens=100, output_tokens=50, total_tokens=150, latency_ms=10
+        ), commit=commit)
+        await EmailExtractionService(db).create_extraction(EmailExtractionCreate(
+            email_id=email_id, status="SUCCESS", extracted_json={"is_transaction": True},
+            model_used="mock-model", prompt_hash="benchmark"
+        ), commit=commit)
+        await TransactionService(db).create_transaction(TransactionCreate(
+            amount=12.5, type="expense", occurred_at=datetime.now(timezone.utc),
+            notes="Benchmark transaction"
+        ), user_id, commit=commit)
+        await email_service.update_email(email_id, EmailUpdate(extraction_status="COMPLETED"), commit=commit)
+
+
+async def main(email_count: int) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    counter = RoundTripCounter()
+
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, UserRegister(
+            name="Unit Of Work Benchmark",
+            username=f"bench_uow_{run_id}",
+            primary_email=f"bench_uow_{run_id}@example.com",
+            password="benchmark"
+        ))
+        account = await ConnectedAccountService(db).create_account(
+            ConnectedAccountCreate(provider="gmail", email=f"bench_uow_{run_id}@gmail.com"),
+            user_id=user.id
+        )
+        job = await JobService(db).create_job_raw(job_type="BENCHMARK", triggered_by="MANUAL")
+        user_id, account_id, job_id = user.id, account.id, job.id
+
+        async with unit_of_work(db):
+            emails = [
+                await EmailService(db).create_email(EmailCreate(
+                    user_id=user_id, connected_account_id=account_id, provider="gmail",
+                    provider_message_id=f"bench-uow-{run_id}-{i}", subject=f"Receipt #{i}",
+                    received_at=datetime.now(timezone.utc)
+                ), commit=False)
+                for i in range(email_count)
+            ]
+        email_ids = [email.id for email in emails]
+
+    try:
+        for label, commit in (("per-call", True), ("unit", False)):
+            async with AsyncSessionLocal() as db:
+                counter.reset()
+                start = time.perf_counter()
+                if commit:
+                    await store_results(db, job_id, user_id, email_ids, commit=True)
+                else:
+                    async with unit_of_work(db):
+                        await store_results(db, job_id, user_id, email_ids, commit=False)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{label:<9} {elapsed * 1000:9.1f}ms  statements: {counter.counts['statements']:6d}  "
+                    f"commits: {counter.counts['commits']:5d}"
+                )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(EmailExtraction).where(EmailExtraction.email_id.in_(email_ids)))
+            await db.execute(delete(LLMTransaction).where(LLMTransaction.job_id == job_id))
+            await db.execute(delete(Email).where(Email.user_id == user_id))
+            await db.execute(delete(ConnectedAccount).where(ConnectedAccount.id == account_id))
+            await db.execute(delete(Job).where(Job.id == job_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.emails))
@@ -1,10 +1,11 @@
 import asyncio
 import logging
 import argparse
-from sqlalchemy import text, delete
+from sqlalchemy import text, delete, select
 from app.core.database import AsyncSessionLocal, engine, Base
+from app.crud.transaction_aggregate import uncategorize
 from app.models import (
-    User, Role, Category, Transaction, ConnectedAccount,
+    User, Role, Category, Transaction, TransactionAggregate, ConnectedAccount,
     Email, EmailExtraction, Job, LLMTransaction
 )
 
@@ -24,6 +25,10 @@ class DatabaseCleaner:
         logger.info("Cleaning Email Extractions...")
         await self.session.execute(delete(EmailExtraction))
 
+    async def clean_transaction_aggregates(self):
+        logger.info("Cleaning Transaction Aggregates...")
+        await self.session.execute(delete(TransactionAggregate))
+
     async def clean_transactions(self):
         logger.info("Cleaning Financial Transactions...")
         await self.session.execute(delete(Transaction))
@@ -38,6 +43,10 @@ class DatabaseCleaner:
 
     async def clean_categories(self):
         logger.info("Cleaning Categories...")
+        # Aggregate rows left behind (transactionaggregate skipped) move to the uncategorized bucket
+        category_ids = (await self.session.execute(select(Category.id))).scalars().all()
+        for category_id in category_ids:
+            await uncategorize(self.session, category_id, commit=False)
         await self.session.execute(delete(Category))
 
     async def clean_jobs(self):
@@ -83,6 +92,7 @@ async def run_cleanup(skip_models: list = None, force: bool = False):
         tasks = [
             ("llmtransaction", cleaner.clean_llm_transactions),
             ("emailextraction", cleaner.clean_email_extractions),
+            ("transactionaggregate", cleaner.clean_transaction_aggregates),
             ("transaction", cleaner.clean_transactions),
             ("email", cleaner.clean_emails),
             ("connectedaccount", cleaner.clean_connected_accounts),
@@ -0,0 +1,85 @@
+"""
+Local OpenAI-compatible stub server for offline LLM tests and benchmarks.
+
+Serves POST /v1/chat/completions with a canned extraction result after a fixed
+delay, so OpenAIProvider can be exercised without network access or an API key.
+Point the app at it with:
+
+    LLM_PROVIDER=openai LLM_BASE_URL=http://127.0.0.1:8100/v1
+
+Usage:
+    python -m app.scripts.llm_stub_server --port 8100 --delay-ms 200
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def create_stub_app(delay_ms: int) -> FastAPI:
+    app = FastAPI(title="LLM stub")
+    app.state.requests = 0
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        await asyncio.sleep(delay_ms / 1000)
+
+        email_text = body["messages"][-1]["content"]
+        is_uber = "uber" in email_text.lower()
+        content = {
+            "is_transaction": True,
+            "amount": 23.5,
+            "currency": "USD",
+            "merchant": "Uber" if is_uber else "Stub Merchant",
+            "category": "Transport" if is_uber else "General",
+        }
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(content)},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(email_text) // 4 + 80,
+                "completion_tokens": 40,
+                "total_tokens": len(email_text) // 4 + 120,
+            },
+        }
+
+    return app
+
+
+@asynccontextmanager
+async def run_stub_server(host: str = "127.0.0.1", port: int = 8100, delay_ms: int = 200) -> AsyncIterator[FastAPI]:
+    """Run the stub inside the current event loop (for scripts and benchmarks)."""
+    app = create_stub_app(delay_ms)
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        yield app
+    finally:
+        server.should_exit = True
+        await task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--delay-ms", type=int, default=200)
+    args = parser.parse_args()
+    uvicorn.run(create_stub_app(args.delay_ms), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,158 @@
+"""
+Load test: request throughput and latency percentiles of a running API server.
+
+Registers throwaway users, then --concurrency clients call the chosen
+scenarios in a loop for --duration seconds and report requests/second and
+p50/p95/p99 latency per scenario. The users (and anything they created) are
+removed from the database in DATABASE_URL afterwards.
+
+Compare engine configurations by starting the server with each and running
+the same load, e.g. the previous defaults against the current ones:
+
+    DB_ECHO=true DB_POOL_SIZE=5 DB_MAX_OVERFLOW=10 DB_POOL_PRE_PING=false \\
+        uvicorn app.main:app --workers 1          # before
+    uvicorn app.main:app --workers 1              # after
+
+Usage:
+    python -m app.scripts.loadtest_api --base-url http://localhost:8000 --concurrency 50 --duration 30
+    python -m app.scripts.loadtest_api --scenario me transactions
+    python -m app.scripts.loadtest_api --scenario login refresh --concurrency 16
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import delete, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.transaction import Transaction
+from app.models.user import User
+
+PASSWORD = "loadtest-password"
+
+
+@dataclass
+class Session:
+    access_token: str
+    refresh_token: str
+    # Login replaces the stored refresh token, so logins use their own user
+    login_username: str
+
+
+# name -> (method, path, extra request arguments); every request carries the access token
+SCENARIOS: Dict[str, Tuple[str, str, Callable[[Session], Dict[str, Any]]]] = {
+    "me": ("GET", "/api/v1/users/me", lambda session: {}),
+    "transactions": ("GET", "/api/v1/transactions/?limit=20", lambda session: {}),
+    "summary": ("GET", "/api/v1/transactions/summary", lambda session: {}),
+    "categories": ("GET", "/api/v1/categories/", lambda session: {}),
+    "login": ("POST", "/api/auth/login", lambda session: {
+        "data": {"username": session.login_username, "password": PASSWORD}
+    }),
+    "refresh": ("POST", "/api/auth/refresh", lambda session: {
+        "params": {"refresh_token": session.refresh_token}
+    }),
+}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+async def register(client: httpx.AsyncClient, username: str) -> Dict[str, Any]:
+    response = await client.post("/api/auth/register", json={
+        "name": "Load Test",
+        "username": username,
+        "primary_email": f"{username}@example.com",
+        "password": PASSWORD
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+def request(client: httpx.AsyncClient, session: Session, name: str):
+    method, path, extra = SCENARIOS[name]
+    return client.request(method, path, **extra(session))
+
+
+async def client_loop(
+    client: httpx.AsyncClient,
+    session: Session,
+    scenarios: List[str],
+    deadline: float,
+    latencies: Dict[str, List[float]],
+    statuses: Counter
+) -> None:
+    i = 0
+    while time.perf_counter() < deadline:
+        name = scenarios[i % len(scenarios)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await request(client, session, name)
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+            continue
+        latencies[name].append(time.perf_counter() - start)
+
+
+async def main(base_url: str, concurrency: int, duration: float, scenarios: List[str]) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        tokens = await register(client, f"loadtest_{run_id}")
+        await register(client, f"loadtest_{run_id}_login")
+        session = Session(tokens["access_token"], tokens["refresh_token"], f"loadtest_{run_id}_login")
+        client.headers["Authorization"] = f"Bearer {session.access_token}"
+
+        try:
+            # Warm-up: open connections on both sides before measuring
+            await asyncio.gather(*(request(client, session, scenarios[0]) for _ in range(concurrency)))
+
+            latencies: Dict[str, List[float]] = defaultdict(list)
+            statuses: Counter = Counter()
+            start = time.perf_counter()
+            deadline = start + duration
+            await asyncio.gather(*(
+                client_loop(client, session, scenarios, deadline, latencies, statuses) for _ in range(concurrency)
+            ))
+            elapsed = time.perf_counter() - start
+        finally:
+            async with AsyncSessionLocal() as db:
+                user_ids = (await db.execute(
+                    select(User.id).where(User.username.in_([f"loadtest_{run_id}", f"loadtest_{run_id}_login"]))
+                )).scalars().all()
+                if user_ids:
+                    await db.execute(delete(Transaction).where(Transaction.user_id.in_(user_ids)))
+                    await db.execute(delete(User).where(User.id.in_(user_ids)))
+                    await db.commit()
+
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"{concurrency} clients, {elapsed:.1f}s: {total} requests, {total / elapsed:.1f} req/s")
+    for name in scenarios:
+        samples_ms = sorted(s * 1000 for s in latencies[name])
+        if not samples_ms:
+            continue
+        print(
+            f"  {name:<14} {len(samples_ms):7d} req  {len(samples_ms) / elapsed:8.1f} req/s  "
+            f"mean: {statistics.mean(samples_ms):7.1f}ms  p50: {percentile(samples_ms, 0.50):7.1f}ms  "
+            f"p95: {percentile(samples_ms, 0.95):7.1f}ms  p99: {percentile(samples_ms, 0.99):7.1f}ms"
+        )
+    print(f"  status codes: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["me", "transactions"])
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.concurrency, args.duration, args.scenario))
@@ -0,0 +1,38 @@
+"""
+Rebuild transaction_aggregates from the transactions table.
+
+The aggregates are maintained incrementally by TransactionService; run this
+after writing transactions outside the service (bulk imports, manual SQL) or to
+repair drift. Writers wait on a table lock while it runs; GET /transactions/summary
+keeps serving the previous totals until it commits.
+
+Usage:
+    python -m app.scripts.rebuild_transaction_aggregates
+    python -m app.scripts.rebuild_transaction_aggregates --user-id 42
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from app.core.database import AsyncSessionLocal, engine
+from app.crud.transaction_aggregate import rebuild_aggregates
+
+
+async def main(user_id: Optional[int]) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            rows = await rebuild_aggregates(db, user_id=user_id)
+            elapsed = time.perf_counter() - start
+        scope = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Rebuilt transaction aggregates for {scope}: {rows} row(s) in {elapsed * 1000:.0f}ms")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
@@ -0,0 +1,112 @@
+"""
+Verifies that parallel extraction workers never claim the same email.
+
+Seeds PENDING emails, then runs several claimers concurrently (each on its own
+session/connection, like separate workers) until the queue is drained. Every
+email must be claimed exactly once. Finally expires the leases and checks that
+the rows are reclaimed. Needs the PostgreSQL database in DATABASE_URL.
+"""
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import delete, select, update
+
+from app.core.database import AsyncSessionLocal
+from app.crud.auth import create_user
+from app.crud.email import claim_pending_emails
+from app.models.connected_account import ConnectedAccount
+from app.models.email import Email
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.schemas.connected_account import ConnectedAccountCreate
+from app.schemas.email import EmailCreate
+from app.services.connected_account_service import ConnectedAccountService
+from app.services.email_service import EmailService
+
+EMAILS = 500
+WORKERS = 8
+CLAIM_SIZE = 20
+
+
+async def claimer(claims: list) -> None:
+    async with AsyncSessionLocal() as db:
+        while True:
+            emails = await claim_pending_emails(db, limit=CLAIM_SIZE, lease_seconds=600)
+            # Only this run's rows count; other PENDING rows in the database are released below
+            claims.extend(e.id for e in emails)
+            if not emails:
+                return
+            await asyncio.sleep(0)
+
+
+async def test_extraction_claiming():
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, UserRegister(
+            name="Claim Tester",
+            username=f"claim_tester_{run_id}",
+            primary_email=f"claim_tester_{run_id}@example.com",
+            password="SecurePassword123!"
+        ))
+        account = await ConnectedAccountService(db).create_account(
+            ConnectedAccountCreate(provider="gmail", email=f"claim_{run_id}@gmail.com"),
+            user_id=user.id
+        )
+        user_id, account_id = user.id, account.id
+        await EmailService(db).bulk_upsert_emails([
+            EmailCreate(
+                user_id=user_id,
+                connected_account_id=account_id,
+                provider="gmail",
+                provider_message_id=f"claim-{run_id}-{i}",
+                subject=f"Receipt {i}",
+                received_at=datetime.now(timezone.utc)
+            )
+            for i in range(EMAILS)
+        ])
+
+    claims: list = []
+    try:
+        await asyncio.gather(*(claimer(claims) for _ in range(WORKERS)))
+
+        async with AsyncSessionLocal() as db:
+            own_ids = set((await db.execute(select(Email.id).where(Email.user_id == user_id))).scalars().all())
+
+        counts = Counter(i for i in claims if i in own_ids)
+        duplicates = [i for i, n in counts.items() if n > 1]
+        print(f"{WORKERS} workers claimed {len(counts)}/{EMAILS} emails, duplicates: {len(duplicates)}")
+        assert not duplicates, f"Emails claimed twice: {duplicates[:10]}"
+        assert len(counts) == EMAILS, "Some emails were never claimed"
+
+        # Simulate crashed workers: expired leases must be claimable again
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Email)
+                .where(Email.user_id == user_id)
+                .values(extraction_lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+            await db.commit()
+            reclaimed = await claim_pending_emails(db, limit=EMAILS * 10, lease_seconds=600)
+            claims.extend(e.id for e in reclaimed)
+            reclaimed_own = [e for e in reclaimed if e.user_id == user_id]
+        print(f"Reclaimed {len(reclaimed_own)} emails with expired leases")
+        assert len(reclaimed_own) == EMAILS, "Expired leases were not reclaimed"
+        print("Claiming verification PASSED")
+    finally:
+        async with AsyncSessionLocal() as db:
+            # Rows of other users claimed by this test go back to the queue
+            await db.execute(
+                update(Email)
+                .where(Email.id.in_(claims), Email.user_id != user_id)
+                .values(extraction_status="PENDING", extraction_lease_expires_at=None)
+            )
+            await db.execute(delete(Email).where(Email.user_id == user_id))
+            await db.execute(delete(ConnectedAccount).where(ConnectedAccount.id == account_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(test_extraction_claiming())
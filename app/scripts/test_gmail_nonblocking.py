@@ -0,0 +1,84 @@
+"""
+Verifies that GmailProvider does not block the event loop.
+
+A fake Gmail endpoint answers every HTTP request after a fixed delay. While the
+provider lists messages and fetches a body, a ticker coroutine runs alongside;
+if the Google client calls ran on the event loop the ticker would stall for the
+whole duration of each request.
+"""
+import asyncio
+import json
+import time
+
+import httplib2
+from googleapiclient.discovery import build
+
+from app.email.providers.gmail import GmailProvider
+
+ENDPOINT_DELAY = 0.5  # seconds per HTTP request
+TICK_INTERVAL = 0.01
+
+
+class SlowGmailHttp:
+    """httplib2-compatible fake that sleeps before answering like a slow Gmail API."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.requests = 0
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=None, connection_type=None):
+        self.requests += 1
+        time.sleep(self.delay)
+        if "/messages/" in uri:
+            payload = {
+                "id": uri.split("/messages/")[1].split("?")[0],
+                "threadId": "thread-1",
+                "internalDate": str(int(time.time() * 1000)),
+                "payload": {
+                    "mimeType": "text/plain",
+                    "headers": [{"name": "Subject", "value": "Slow receipt"}],
+                    "body": {"data": "SGVsbG8gV29ybGQ="},
+                },
+            }
+        else:
+            payload = {"messages": [], "resultSizeEstimate": 0}
+        return httplib2.Response({"status": "200"}), json.dumps(payload).encode()
+
+
+async def ticker(stop: asyncio.Event, ticks: list) -> None:
+    while not stop.is_set():
+        ticks.append(time.monotonic())
+        await asyncio.sleep(TICK_INTERVAL)
+
+
+async def test_gmail_nonblocking():
+    http = SlowGmailHttp(ENDPOINT_DELAY)
+    provider = GmailProvider()
+    provider._service = build("gmail", "v1", http=http, static_discovery=True)
+
+    stop = asyncio.Event()
+    ticks: list = []
+    ticker_task = asyncio.create_task(ticker(stop, ticks))
+
+    start = time.monotonic()
+    await provider.fetch_messages(limit=10)
+    message = await provider.fetch_message_body("msg-1")
+    elapsed = time.monotonic() - start
+
+    stop.set()
+    await ticker_task
+    await provider.disconnect()
+
+    max_gap = max((b - a for a, b in zip(ticks, ticks[1:])), default=elapsed)
+    print(f"HTTP requests: {http.requests}, elapsed: {elapsed:.2f}s")
+    print(f"Ticker ran {len(ticks)} times, longest gap between ticks: {max_gap * 1000:.1f}ms")
+
+    assert message and message.body_text == "Hello World", "Body was not fetched"
+    # The loop must keep scheduling the ticker while each slow request is in flight
+    assert max_gap < ENDPOINT_DELAY / 2, "Event loop was blocked by a Gmail call"
+    assert len(ticks) > (elapsed / TICK_INTERVAL) * 0.5, "Ticker was starved"
+    print("Non-blocking verification PASSED")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_gmail_nonblocking())
@@ -0,0 +1,177 @@
+"""
+Verifies the idempotent enqueueing in app/services/task_service.py (TaskService._enqueue).
+
+Enqueues email fetches for throwaway account ids on a private ARQ queue (no worker
+picks them up) and checks that:
+
+  * concurrent triggers for the same account create one job; the rest coalesce into it
+  * a QUEUED record within ENQUEUE_GRACE whose job ARQ does not know yet is still pending
+  * a record whose job ARQ has lost is marked FAILED and a new job is enqueued
+  * a job finalised by its worker while its pending check runs (record read as
+    RUNNING, SUCCESS committed and ARQ id released before the status check) keeps
+    its SUCCESS status and output; it is not overwritten as FAILED
+
+Needs the PostgreSQL database in DATABASE_URL, and the Redis in REDIS_URL or an
+in-memory fakeredis with --fake (pip install fakeredis; not a project dependency).
+
+Usage:
+    python -m app.scripts.test_job_enqueue
+    python -m app.scripts.test_job_enqueue --fake --triggers 20
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from arq.connections import ArqRedis, create_pool
+from arq.jobs import Job as ArqJob, JobStatus
+from sqlalchemy import delete, update
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.worker.email_settings import WorkerSettings as EmailWorkerSettings
+from app.crud.auth import create_user
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.auth import UserRegister
+from app.services import task_service
+from app.services.task_service import TaskService
+
+
+async def enqueue(pool: ArqRedis, user_id: int, account_id: int):
+    async with AsyncSessionLocal() as db:
+        return await TaskService(db, pool=pool).enqueue_email_fetch(
+            user_id=user_id, account_id=account_id, triggered_by="MANUAL"
+        )
+
+
+async def get_record(job_id: int) -> Job:
+    async with AsyncSessionLocal() as db:
+        return await db.get(Job, job_id)
+
+
+async def release(pool: ArqRedis, arq_job_id: str) -> None:
+    """What ARQ does once a job ends with keep_result=0: the id is free again."""
+    await pool.delete(f"arq:job:{arq_job_id}", f"arq:in-progress:{arq_job_id}")
+    await pool.zrem(pool.default_queue_name, arq_job_id)
+
+
+async def check_concurrent_triggers(pool: ArqRedis, user_id: int, account_id: int, triggers: int) -> None:
+    results = await asyncio.gather(*(enqueue(pool, user_id, account_id) for _ in range(triggers)))
+    job_ids = {result.job.id for result in results}
+    coalesced = Counter(result.coalesced for result in results)
+    assert len(job_ids) == 1, f"Concurrent triggers created {len(job_ids)} jobs"
+    assert coalesced == {False: 1, True: triggers - 1}, f"Concurrent triggers: {dict(coalesced)}"
+    print(f"Concurrent triggers: {triggers} triggers, one job")
+
+
+async def check_enqueue_grace(pool: ArqRedis, user_id: int, account_id: int) -> None:
+    first = await enqueue(pool, user_id, account_id)
+    # The caller has committed the record but not enqueued its ARQ job yet
+    await release(pool, first.job.arq_job_id)
+    second = await enqueue(pool, user_id, account_id)
+    assert second.coalesced and second.job.id == first.job.id, "A record within ENQUEUE_GRACE was not pending"
+    assert (await get_record(first.job.id)).status == "QUEUED", "A record within ENQUEUE_GRACE was failed"
+    print("Enqueue grace: a fresh QUEUED record ARQ does not know yet is still pending")
+
+
+async def check_lost_job(pool: ArqRedis, user_id: int, account_id: int) -> None:
+    first = await enqueue(pool, user_id, account_id)
+    await release(pool, first.job.arq_job_id)
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(Job).where(Job.id == first.job.id)
+            .values(created_at=datetime.now(timezone.utc) - task_service.ENQUEUE_GRACE - timedelta(seconds=1))
+        )
+        await db.commit()
+
+    second = await enqueue(pool, user_id, account_id)
+    lost = await get_record(first.job.id)
+    assert not second.coalesced and second.job.id != first.job.id, "No new job replaced the lost one"
+    assert lost.status == "FAILED" and "no longer in the queue" in lost.error_payload["error"], (
+        f"Lost job: {lost.status} {lost.error_payload}"
+    )
+    print("Lost job: marked FAILED, new job enqueued")
+
+
+async def check_completed_while_checking(pool: ArqRedis, user_id: int, account_id: int) -> None:
+    first = await enqueue(pool, user_id, account_id)
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Job).where(Job.id == first.job.id).values(status="RUNNING"))
+        await db.commit()
+
+    output = {"fetched": 3}
+    arq_status = ArqJob.status
+
+    async def finish_then_status(self: ArqJob) -> JobStatus:
+        # The record has been read as RUNNING: the worker now commits its result and
+        # ARQ releases the id before the status is looked up
+        if self.job_id == first.job.arq_job_id:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(Job).where(Job.id == first.job.id)
+                    .values(status="SUCCESS", output_payload=output, finished_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+            await release(pool, first.job.arq_job_id)
+        return await arq_status(self)
+
+    ArqJob.status = finish_then_status
+    try:
+        second = await enqueue(pool, user_id, account_id)
+    finally:
+        ArqJob.status = arq_status
+
+    finished = await get_record(first.job.id)
+    assert finished.status == "SUCCESS" and finished.output_payload == output, (
+        f"A finished job was overwritten: {finished.status} {finished.output_payload} {finished.error_payload}"
+    )
+    assert not second.coalesced and second.job.id != first.job.id, "No new job after the finished one"
+    print("Completed while checking: SUCCESS kept, new job enqueued")
+
+
+async def main(fake: bool, triggers: int) -> None:
+    queue_name = f"arq:test-job-enqueue:{uuid.uuid4().hex[:8]}"
+    if fake:
+        import fakeredis
+        pool = ArqRedis(connection_pool=fakeredis.FakeAsyncRedis().connection_pool, default_queue_name=queue_name)
+    else:
+        pool = await create_pool(EmailWorkerSettings.redis_settings, default_queue_name=queue_name)
+
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, UserRegister(
+            name="Enqueue Tester",
+            username=f"enqueue_tester_{run_id}",
+            primary_email=f"enqueue_tester_{run_id}@example.com",
+            password="SecurePassword123!"
+        ))
+        user_id = user.id
+
+    # Account ids no real account has, so the ARQ job ids are never shared
+    account_ids = [random.randint(10 ** 9, 2 * 10 ** 9) for _ in range(4)]
+    try:
+        await check_concurrent_triggers(pool, user_id, account_ids[0], triggers)
+        await check_enqueue_grace(pool, user_id, account_ids[1])
+        await check_lost_job(pool, user_id, account_ids[2])
+        await check_completed_while_checking(pool, user_id, account_ids[3])
+        print("Job enqueue verification PASSED")
+    finally:
+        for account_id in account_ids:
+            await release(pool, TaskService.fetch_job_id(account_id))
+        await pool.delete(queue_name)
+        await pool.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Job).where(Job.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fake", action="store_true", help="Use an in-memory fakeredis instead of REDIS_URL")
+    parser.add_argument("--triggers", type=int, default=20, help="Concurrent triggers for the same account")
+    args = parser.parse_args()
+    asyncio.run(main(args.fake, args.triggers))
@@ -0,0 +1,149 @@
+"""
+Verifies the password reset OTP checks in app/core/otp.py (CONSUME_OTP_SCRIPT).
+
+Runs store_otp() / consume_otp() for throwaway user ids and checks that:
+
+  * a matching OTP is accepted once; reusing it, or one never requested, is MISSING
+  * wrong guesses are INVALID and counted; store_otp() resets the count
+  * the OTP_MAX_ATTEMPTS-th wrong guess burns the OTP (TOO_MANY_ATTEMPTS),
+    after which even the right code is MISSING
+  * concurrent submissions of the right code succeed exactly once, and
+    concurrent wrong guesses never get more than OTP_MAX_ATTEMPTS tries
+  * the OTP and its attempts counter expire at the same millisecond (equal
+    PEXPIRETIME) after OTP_EXPIRY (shortened to --ttl seconds for the run)
+
+Uses the Redis (7+) in REDIS_URL, or an in-memory fakeredis with --fake
+(pip install "fakeredis[lua]"; not a project dependency).
+
+Usage:
+    python -m app.scripts.test_otp
+    python -m app.scripts.test_otp --fake --ttl 1
+"""
+import argparse
+import asyncio
+import random
+from collections import Counter
+
+from app.core import otp
+from app.core import redis as redis_core
+from app.core.otp import OTPCheck, consume_otp, store_otp
+
+
+def wrong_code(code: str) -> str:
+    return f"{(int(code) + 1) % 10 ** len(code):0{len(code)}d}"
+
+
+async def attempts(user_id: int) -> int:
+    return int(await redis_core.redis_client.get(otp._keys(user_id)[1]) or 0)
+
+
+async def expect(user_id: int, code: str, expected: OTPCheck, label: str) -> None:
+    result = await consume_otp(user_id, code)
+    assert result == expected, f"{label}: expected {expected.value}, got {result.value}"
+
+
+async def check_single_use(user_id: int) -> None:
+    code = otp.generate_otp()
+    await expect(user_id, code, OTPCheck.MISSING, "OTP never requested")
+    await store_otp(user_id, code)
+    await expect(user_id, code, OTPCheck.VALID, "Matching OTP")
+    await expect(user_id, code, OTPCheck.MISSING, "Reused OTP")
+    print("Single use: matching OTP accepted once, reuse rejected")
+
+
+async def check_wrong_guesses(user_id: int) -> None:
+    code = otp.generate_otp()
+    await store_otp(user_id, code)
+    for i in range(otp.OTP_MAX_ATTEMPTS - 1):
+        await expect(user_id, wrong_code(code), OTPCheck.INVALID, f"Wrong guess {i + 1}")
+    assert await attempts(user_id) == otp.OTP_MAX_ATTEMPTS - 1, "Wrong guesses were not counted"
+
+    # A new OTP starts with a clean slate
+    code = otp.generate_otp()
+    await store_otp(user_id, code)
+    assert await attempts(user_id) == 0, "store_otp() kept the previous failed attempts"
+    for i in range(otp.OTP_MAX_ATTEMPTS - 1):
+        await expect(user_id, wrong_code(code), OTPCheck.INVALID, f"Wrong guess {i + 1} on the new OTP")
+    await expect(user_id, code, OTPCheck.VALID, "Matching OTP after wrong guesses")
+    assert await attempts(user_id) == 0, "The attempts counter outlived the consumed OTP"
+    print(f"Wrong guesses: {otp.OTP_MAX_ATTEMPTS - 1} counted, reset by store_otp(), cleared on success")
+
+
+async def check_lockout(user_id: int) -> None:
+    code = otp.generate_otp()
+    await store_otp(user_id, code)
+    for i in range(otp.OTP_MAX_ATTEMPTS - 1):
+        await expect(user_id, wrong_code(code), OTPCheck.INVALID, f"Wrong guess {i + 1}")
+    await expect(user_id, wrong_code(code), OTPCheck.TOO_MANY_ATTEMPTS, "Last allowed wrong guess")
+    await expect(user_id, code, OTPCheck.MISSING, "Matching OTP after lockout")
+    assert await attempts(user_id) == 0, "The attempts counter outlived the burned OTP"
+    print(f"Lockout: wrong guess {otp.OTP_MAX_ATTEMPTS} burns the OTP")
+
+
+async def check_concurrency(user_id: int, submissions: int) -> None:
+    code = otp.generate_otp()
+    await store_otp(user_id, code)
+    results = Counter(await asyncio.gather(*(consume_otp(user_id, code) for _ in range(submissions))))
+    assert results == {OTPCheck.VALID: 1, OTPCheck.MISSING: submissions - 1}, f"Concurrent right code: {results}"
+
+    await store_otp(user_id, code)
+    results = Counter(await asyncio.gather(
+        *(consume_otp(user_id, wrong_code(code)) for _ in range(submissions))
+    ))
+    expected = {
+        OTPCheck.INVALID: otp.OTP_MAX_ATTEMPTS - 1,
+        OTPCheck.TOO_MANY_ATTEMPTS: 1,
+        OTPCheck.MISSING: submissions - otp.OTP_MAX_ATTEMPTS
+    }
+    assert results == expected, f"Concurrent wrong guesses: {dict(results)}"
+    print(f"Concurrency: {submissions} simultaneous submissions, one success / {otp.OTP_MAX_ATTEMPTS} guesses at most")
+
+
+async def check_expiry(user_id: int, ttl: int) -> None:
+    client = redis_core.redis_client
+    otp_key, attempts_key = otp._keys(user_id)
+    code = otp.generate_otp()
+    await store_otp(user_id, code)
+    await expect(user_id, wrong_code(code), OTPCheck.INVALID, "Wrong guess before expiry")
+    otp_expiry, attempts_expiry = await client.pexpiretime(otp_key), await client.pexpiretime(attempts_key)
+    assert otp_expiry > 0 and attempts_expiry == otp_expiry, (
+        f"Expiry times: OTP {otp_expiry}, attempts {attempts_expiry} (ms since epoch)"
+    )
+    assert 0 < await client.pttl(otp_key) <= ttl * 1000, "The OTP does not expire after OTP_EXPIRY"
+
+    await asyncio.sleep(ttl + 0.5)
+    assert not await client.exists(otp_key, attempts_key), "OTP keys outlived OTP_EXPIRY"
+    await expect(user_id, code, OTPCheck.MISSING, "Matching OTP after expiry")
+    print(f"Expiry: OTP and attempts counter gone after {ttl}s")
+
+
+async def main(fake: bool, ttl: int, submissions: int) -> None:
+    if fake:
+        import fakeredis
+        redis_core.redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    else:
+        await redis_core.init_redis()
+
+    user_ids = [random.randint(10 ** 9, 2 * 10 ** 9) for _ in range(5)]
+    otp_expiry = otp.OTP_EXPIRY
+    try:
+        await check_single_use(user_ids[0])
+        await check_wrong_guesses(user_ids[1])
+        await check_lockout(user_ids[2])
+        await check_concurrency(user_ids[3], submissions)
+        otp.OTP_EXPIRY = ttl
+        await check_expiry(user_ids[4], ttl)
+        print("OTP verification PASSED")
+    finally:
+        otp.OTP_EXPIRY = otp_expiry
+        await redis_core.redis_client.delete(*(key for user_id in user_ids for key in otp._keys(user_id)))
+        await redis_core.close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fake", action="store_true", help="Use an in-memory fakeredis instead of REDIS_URL")
+    parser.add_argument("--ttl", type=int, default=2, help="OTP_EXPIRY for the expiry check, in seconds")
+    parser.add_argument("--submissions", type=int, default=50, help="Concurrent submissions per concurrency check")
+    args = parser.parse_args()
+    asyncio.run(main(args.fake, args.ttl, args.submissions))
@@ -0,0 +1,196 @@
+"""
+Verifies SMTPEmailSender against a local in-process SMTP sink.
+
+The sink speaks just enough SMTP (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)
+to accept messages and records every connection and message. Checks that:
+
+  * a single message on a warm connection, and every message of a wave of
+    --burst OTP emails arriving at --rate per second (password reset spike),
+    is delivered within --max-p99-ms at the 99th percentile, waiting for a
+    free connection included; the script fails otherwise
+  * the same burst sent all at once is delivered over at most --pool-size
+    connections (connections are reused, not opened per message); its latency
+    is bounded by throughput (burst / messages per second), so only throughput
+    is reported
+  * a connection the server closed while idle is reopened transparently
+  * a message with a header that cannot be sent (CR/LF in the subject or the
+    address, several addresses) fails with a permanent EmailSendError, so it is
+    not retried, and nothing reaches the server
+
+Sender and sink share one event loop (and CPU), so the figures are an upper
+bound of the sender's own cost; a remote server adds its round trips.
+
+Usage:
+    python -m app.scripts.test_smtp_sender --burst 200 --rate 500 --pool-size 4 --max-p99-ms 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from email import message_from_bytes
+from typing import List
+
+from app.core.otp import generate_otp
+from app.email import EmailSendError, OutgoingEmail
+from app.email.senders import SMTPEmailSender
+from app.email.templates import OTP_EMAIL
+
+
+class SMTPSink:
+    """Minimal SMTP server collecting messages in memory."""
+
+    def __init__(self):
+        self.connections = 0
+        self.messages: List[bytes] = []
+        self._writers: List[asyncio.StreamWriter] = []
+        self.server = None
+
+    async def start(self, host: str = "127.0.0.1") -> int:
+        self.server = await asyncio.start_server(self._handle, host, 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.drop_connections()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def drop_connections(self) -> None:
+        """Close every open client connection, like a server idle timeout."""
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.append(writer)
+        writer.write(b"220 sink ESMTP\r\n")
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip().upper()
+                if command.startswith("EHLO"):
+                    writer.write(b"250-sink\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n")
+                elif command.startswith("DATA"):
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    data = b""
+                    while (chunk := await reader.readline()) != b".\r\n":
+                        data += chunk
+                    self.messages.append(data)
+                    writer.write(b"250 OK queued\r\n")
+                elif command.startswith("QUIT"):
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    # HELO, MAIL, RCPT, RSET, NOOP
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def summarize(latencies: List[float]) -> str:
+    return (
+        f"mean: {statistics.mean(latencies):.1f}ms  p50: {percentile(latencies, 0.5):.1f}ms  "
+        f"p99: {percentile(latencies, 0.99):.1f}ms"
+    )
+
+
+async def main(burst: int, rate: float, pool_size: int, max_p99_ms: float) -> None:
+    sink = SMTPSink()
+    port = await sink.start()
+    sender = SMTPEmailSender(host="127.0.0.1", port=port, use_tls=False, pool_size=pool_size, timeout=5.0)
+    latencies: List[float] = []
+
+    async def send_one(to_email: str) -> None:
+        start = time.perf_counter()
+        await sender.send(OTP_EMAIL.render(to_email, otp=generate_otp()))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        await sender.open()
+        print(f"Opened sender: {sink.connections} connection(s)")
+
+        # 1. One message at a time on the warm connection: the latency of an OTP on a quiet worker
+        for i in range(20):
+            await send_one(f"single{i}@example.com")
+        latencies.sort()
+        print(f"Single message: {summarize(latencies)}")
+        assert percentile(latencies, 0.99) <= max_p99_ms, f"single message p99 above {max_p99_ms}ms"
+
+        # 2. A wave of password resets: Poisson arrivals at `rate` per second
+        sink.messages.clear()
+        latencies.clear()
+        rng = random.Random(0)
+        tasks = []
+        start = time.perf_counter()
+        for i in range(burst):
+            await asyncio.sleep(rng.expovariate(rate))
+            tasks.append(asyncio.create_task(send_one(f"wave{i}@example.com")))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        assert len(sink.messages) == burst, f"expected {burst} messages, sink got {len(sink.messages)}"
+        print(f"Wave: {burst} emails at {rate:.0f}/s in {elapsed * 1000:.0f}ms  {summarize(latencies)}")
+        assert percentile(latencies, 0.99) <= max_p99_ms, (
+            f"p99 {percentile(latencies, 0.99):.1f}ms above the {max_p99_ms}ms target"
+        )
+
+        # 3. The whole burst at once: every message waits for a free pooled connection
+        sink.messages.clear()
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(send_one(f"user{i}@example.com") for i in range(burst)))
+        elapsed = time.perf_counter() - start
+        assert len(sink.messages) == burst, f"expected {burst} messages, sink got {len(sink.messages)}"
+        assert sink.connections <= pool_size, f"{sink.connections} connections for a pool of {pool_size}"
+        parsed = message_from_bytes(sink.messages[0])
+        assert parsed["Subject"].startswith("Your password reset code"), parsed["Subject"]
+        print(
+            f"All at once: {burst} emails in {elapsed * 1000:.0f}ms ({burst / elapsed:.0f}/s) "
+            f"over {sink.connections} connection(s)"
+        )
+
+        # 4. Server drops the idle connections; the next sends reconnect and succeed
+        connections_before = sink.connections
+        sink.drop_connections()
+        await asyncio.sleep(0.05)
+        await sender.send_many([OTP_EMAIL.render("after-drop@example.com", otp="123456")] * 3)
+        assert len(sink.messages) == burst + 3, "messages lost after the server closed idle connections"
+        print(f"Reconnect after idle close: OK ({sink.connections - connections_before} new connection(s))")
+
+        # 5. Headers that cannot be sent are rejected for good, before any SMTP exchange
+        invalid = [
+            OutgoingEmail(to_email="victim@example.com", subject="Hi\r\nBcc: spy@example.com", body_text="x"),
+            OutgoingEmail(to_email="victim@example.com\r\nBcc: spy@example.com", subject="Hi", body_text="x"),
+            OutgoingEmail(to_email="victim@example.com", subject="Line\nbreak", body_text="x"),
+            OutgoingEmail(to_email="victim@example.com, spy@example.com", subject="Hi", body_text="x"),
+        ]
+        for message, result in zip(invalid, await sender.send_many(invalid)):
+            assert isinstance(result, EmailSendError) and result.permanent, (
+                f"{message.to_email!r} / {message.subject!r}: expected a permanent EmailSendError, got {result!r}"
+            )
+        assert len(sink.messages) == burst + 3, "an invalid message reached the server"
+        print(f"Invalid headers: {len(invalid)} messages rejected as permanent failures")
+
+        print("SMTP sender checks passed.")
+    finally:
+        await sender.close()
+        await sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=200, help="OTP emails per burst")
+    parser.add_argument("--rate", type=float, default=500, help="Arrivals per second during the wave")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--max-p99-ms", type=float, default=50, help="Latency target for single and wave messages")
+    args = parser.parse_args()
+    asyncio.run(main(args.burst, args.rate, args.pool_size, args.max_p99_ms))
@@ -0,0 +1,241 @@
+"""
+Verifies that GET /transactions/summary always equals a GROUP BY over transactions.
+
+Runs the API in-process (httpx ASGI transport) as a throwaway user and compares
+the summary with a GROUP BY (UTC month, category, type) over the user's
+transactions after each step:
+
+  * random creates, updates (amount, category, month, type) and deletes, which
+    exercise the delta upsert and moving amounts between aggregate rows
+  * a transaction moved to another month and category: its old row disappears
+  * deleting the last transaction of a row: the zero-count row is removed
+  * deleting a category (CategoryService.delete_category): its rows are folded
+    into the uncategorized bucket, like ON DELETE SET NULL on transactions
+  * deleting a category with a raw DELETE (skipping the service) is refused by
+    the foreign key instead of dropping its rows
+  * rebuild_aggregates() after corrupting the user's rows restores them
+
+Needs the PostgreSQL database in DATABASE_URL.
+
+Usage:
+    python -m app.scripts.test_transaction_aggregates --operations 300 --seed 1
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import Date, cast, delete, func, literal_column, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import create_access_token
+from app.crud.auth import create_user
+from app.crud.transaction_aggregate import rebuild_aggregates
+from app.main import app
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.transaction_aggregate import TransactionAggregate
+from app.models.user import User
+from app.schemas.auth import UserRegister
+
+CENT = Decimal("0.01")
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+Key = Tuple[str, Optional[int], str]
+Totals = Dict[Key, Tuple[Decimal, int]]
+
+
+async def expected_totals(user_id: int) -> Totals:
+    """The user's totals computed straight from `transactions`."""
+    month = cast(
+        func.date_trunc(literal_column("'month'"), func.timezone(literal_column("'UTC'"), Transaction.occurred_at)),
+        Date
+    )
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(month, Transaction.category_id, Transaction.type, func.sum(Transaction.amount), func.count())
+            .where(Transaction.user_id == user_id)
+            .group_by(month, Transaction.category_id, Transaction.type)
+        )
+        return {
+            (row[0].isoformat(), row[1], row[2].value): (Decimal(row[3]).quantize(CENT), row[4])
+            for row in rows
+        }
+
+
+async def summary_totals(client: httpx.AsyncClient) -> Totals:
+    response = await client.get("/api/v1/transactions/summary")
+    assert response.status_code == 200, response.text
+    return {
+        (row["month"], row["category_id"], row["type"]): (
+            Decimal(str(row["total_amount"])).quantize(CENT), row["transaction_count"]
+        )
+        for row in response.json()
+    }
+
+
+async def check(client: httpx.AsyncClient, user_id: int, label: str) -> Totals:
+    got, expected = await summary_totals(client), await expected_totals(user_id)
+    if got != expected:
+        diff = {
+            key: (got.get(key), expected.get(key))
+            for key in got.keys() | expected.keys() if got.get(key) != expected.get(key)
+        }
+        raise AssertionError(f"{label}: summary differs from transactions (summary, expected): {diff}")
+
+    async with AsyncSessionLocal() as db:
+        empty = await db.scalar(
+            select(func.count()).select_from(TransactionAggregate)
+            .where(TransactionAggregate.user_id == user_id, TransactionAggregate.transaction_count <= 0)
+        )
+    assert empty == 0, f"{label}: {empty} aggregate row(s) left without transactions"
+    print(f"{label}: {len(got)} summary rows match")
+    return got
+
+
+def random_transaction(rng: random.Random, categories: List[Optional[int]]) -> dict:
+    return {
+        "amount": round(rng.uniform(0.01, 500), 2),
+        "type": rng.choice(["income", "expense"]),
+        "occurred_at": (START + timedelta(days=rng.randint(0, 180), seconds=rng.randint(0, 86399))).isoformat(),
+        "category_id": rng.choice(categories)
+    }
+
+
+def random_update(rng: random.Random, categories: List[Optional[int]]) -> dict:
+    fields = random_transaction(rng, categories)
+    # One to all four fields, so amounts move between rows in every combination
+    return {name: fields[name] for name in rng.sample(list(fields), rng.randint(1, len(fields)))}
+
+
+async def main(operations: int, seed: int) -> None:
+    rng = random.Random(seed)
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        user = await create_user(db, UserRegister(
+            name="Aggregate Tester",
+            username=f"aggregate_tester_{run_id}",
+            primary_email=f"aggregate_tester_{run_id}@example.com",
+            password="SecurePassword123!"
+        ))
+        user_id = user.id
+        token = create_access_token(user.id, user.role.name)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test", headers=headers
+        ) as client:
+            async def create(body: dict) -> int:
+                response = await client.post("/api/v1/transactions/", json=body)
+                assert response.status_code == 201, response.text
+                return response.json()["id"]
+
+            categories: List[Optional[int]] = [None]
+            for i in range(4):
+                response = await client.post("/api/v1/categories/", json={"name": f"Category {i}", "type": "expense"})
+                assert response.status_code == 201, response.text
+                categories.append(response.json()["id"])
+
+            # 1. Random creates, updates and deletes
+            ids: List[int] = []
+            counts = {"create": 0, "update": 0, "delete": 0}
+            for _ in range(operations):
+                op = "create" if len(ids) < 10 else rng.choices(["create", "update", "delete"], [4, 4, 2])[0]
+                if op == "create":
+                    ids.append(await create(random_transaction(rng, categories)))
+                elif op == "update":
+                    response = await client.patch(
+                        f"/api/v1/transactions/{rng.choice(ids)}", json=random_update(rng, categories)
+                    )
+                    assert response.status_code == 200, response.text
+                else:
+                    transaction_id = ids.pop(rng.randrange(len(ids)))
+                    response = await client.delete(f"/api/v1/transactions/{transaction_id}")
+                    assert response.status_code == 204, response.text
+                counts[op] += 1
+            print(f"Ran {counts['create']} creates, {counts['update']} updates, {counts['delete']} deletes")
+            await check(client, user_id, "After random operations")
+
+            # 2. A transaction moved to another month, category and type leaves its old row
+            moved = await create({"amount": 12.34, "type": "expense", "occurred_at": "2025-06-15T12:00:00+00:00",
+                                  "category_id": categories[1]})
+            response = await client.patch(f"/api/v1/transactions/{moved}", json={
+                "occurred_at": "2025-07-15T12:00:00+00:00", "category_id": categories[2], "type": "income"
+            })
+            assert response.status_code == 200, response.text
+            totals = await check(client, user_id, "After moving a transaction")
+            assert ("2025-06-01", categories[1], "expense") not in totals, "The old row was not removed"
+            assert totals[("2025-07-01", categories[2], "income")] == (Decimal("12.34"), 1)
+
+            # 3. Deleting the only transaction of a row removes the row
+            response = await client.delete(f"/api/v1/transactions/{moved}")
+            assert response.status_code == 204, response.text
+            totals = await check(client, user_id, "After deleting a row's last transaction")
+            assert not any(key[0].startswith("2025-") for key in totals), "A zero-count row was left behind"
+
+            # 4. Deleting a category folds its rows into the uncategorized bucket
+            doomed = categories[3]
+            for _ in range(5):
+                ids.append(await create({**random_transaction(rng, categories), "category_id": doomed}))
+            response = await client.delete(f"/api/v1/categories/{doomed}")
+            assert response.status_code == 204, response.text
+            totals = await check(client, user_id, "After deleting a category")
+            assert not any(key[1] == doomed for key in totals), "Rows of the deleted category remain"
+
+            # 5. A category delete that skips CategoryService is refused, not silently under-reported
+            kept = categories[1]
+            ids.append(await create({**random_transaction(rng, categories), "category_id": kept}))
+            async with AsyncSessionLocal() as db:
+                try:
+                    await db.execute(delete(Category).where(Category.id == kept))
+                    await db.commit()
+                except IntegrityError:
+                    await db.rollback()
+                else:
+                    raise AssertionError("A raw category delete went through and dropped its aggregate rows")
+            totals = await check(client, user_id, "After a refused raw category delete")
+            assert any(key[1] == kept for key in totals), "Rows of the kept category are gone"
+
+            # 6. rebuild_aggregates() repairs drifted rows
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(TransactionAggregate)
+                    .where(TransactionAggregate.user_id == user_id)
+                    .values(total_amount=TransactionAggregate.total_amount + 1)
+                )
+                first = await db.scalar(
+                    select(TransactionAggregate.id).where(TransactionAggregate.user_id == user_id).limit(1)
+                )
+                await db.execute(delete(TransactionAggregate).where(TransactionAggregate.id == first))
+                await db.commit()
+            assert await summary_totals(client) != await expected_totals(user_id), "Corrupting the rows had no effect"
+            async with AsyncSessionLocal() as db:
+                rebuilt = await rebuild_aggregates(db, user_id=user_id)
+            rebuilt_totals = await check(client, user_id, f"After rebuild_aggregates ({rebuilt} rows)")
+            assert rebuilt_totals == totals, "Rebuilt rows differ from the incrementally maintained ones"
+
+        print("Transaction aggregates verification PASSED")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Transaction).where(Transaction.user_id == user_id))
+            await db.execute(delete(TransactionAggregate).where(TransactionAggregate.user_id == user_id))
+            await db.execute(delete(Category).where(Category.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operations", type=int, default=300, help="Random create/update/delete operations")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed (default: random)")
+    args = parser.parse_args()
+    seed = args.seed if args.seed is not None else random.randrange(1_000_000)
+    print(f"Seed: {seed}")
+    asyncio.run(main(args.operations, seed))
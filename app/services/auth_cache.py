@@ -0,0 +1,109 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core import redis as redis_core
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.auth import CurrentUser
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "auth_user"
+
+
+class AuthUserCache:
+    """
+    Two-tier cache of authenticated users (user_id -> CurrentUser) for get_current_user.
+    Tier 1 is an in-process LRU with a short TTL, tier 2 is Redis (shared by all API
+    processes). `invalidate` drops the local entry and the Redis entry; other processes
+    keep their local copy for at most `local_ttl_seconds`. Redis failures degrade to a miss.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, local_ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = min(local_ttl_seconds, ttl_seconds)
+        self._local: "OrderedDict[int, Tuple[float, CurrentUser]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(user_id: int) -> str:
+        return f"{CACHE_KEY_PREFIX}:{user_id}"
+
+    async def get(self, user_id: int) -> Optional[CurrentUser]:
+        entry = self._local.get(user_id)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(user_id)
+                return value
+            del self._local[user_id]
+
+        client = redis_core.redis_client
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self.make_key(user_id))
+        except Exception as e:
+            logger.warning(f"Auth cache read failed: {str(e)}")
+            return None
+        if raw is None:
+            return None
+
+        value = CurrentUser.model_validate_json(raw)
+        self._store_local(user_id, value)
+        return value
+
+    async def set(self, user: User) -> CurrentUser:
+        """Cache a user loaded with its role; returns the cached principal."""
+        value = CurrentUser(
+            id=user.id,
+            username=user.username,
+            name=user.name,
+            primary_email=user.primary_email,
+            is_active=user.is_active,
+            role=user.role.name,
+            created_at=user.created_at
+        )
+        self._store_local(user.id, value)
+
+        client = redis_core.redis_client
+        if client is None:
+            return value
+        try:
+            await client.set(self.make_key(user.id), value.model_dump_json(), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Auth cache write failed: {str(e)}")
+        return value
+
+    async def invalidate(self, user_id: int) -> None:
+        """Call after any change to a user's profile, role, active flag or password."""
+        self._local.pop(user_id, None)
+
+        client = redis_core.redis_client
+        if client is None:
+            return
+        try:
+            await client.delete(self.make_key(user_id))
+        except Exception as e:
+            logger.warning(f"Auth cache invalidation failed: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        self._local.clear()
+
+    def _store_local(self, user_id: int, value: CurrentUser) -> None:
+        self._local[user_id] = (time.monotonic() + self.local_ttl_seconds, value)
+        self._local.move_to_end(user_id)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+# Process-wide instance so the local tier is shared by all requests in an API process
+auth_user_cache = AuthUserCache(
+    settings.AUTH_CACHE_MAX_SIZE, settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_LOCAL_TTL_SECONDS
+)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.core import redis as redis_core
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_KEY = "auth_revoked"
+
+
+class RevocationList:
+    """
+    Users whose access tokens issued up to a point in time are no longer valid
+    (deactivated, deleted, password changed), for AUTH_STATELESS_MODE.
+
+    Redis holds the shared map user_id -> revoked_at (epoch seconds); every API
+    process keeps a copy in memory, refreshed every `sync_seconds`, so checking a
+    token costs a dict lookup. Revocations made in this process apply at once,
+    others within one sync interval. Entries older than the access token lifetime
+    are dropped: every token they could reject has expired.
+    """
+
+    def __init__(self, sync_seconds: int, retention_seconds: int):
+        self.sync_seconds = sync_seconds
+        self.retention_seconds = retention_seconds
+        self._revoked: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, user_id: int, issued_at: int) -> bool:
+        """Whether a token issued at `issued_at` (epoch seconds) has been revoked."""
+        revoked_at = self._revoked.get(user_id)
+        # iat has one-second resolution: a token from the second of the revocation is rejected too
+        return revoked_at is not None and issued_at <= revoked_at
+
+    async def revoke(self, user_id: int) -> None:
+        """Reject every access token issued to the user until now."""
+        revoked_at = int(time.time())
+        self._revoked[user_id] = revoked_at
+
+        client = redis_core.redis_client
+        if client is None:
+            return
+        try:
+            await client.hset(REVOCATION_KEY, str(user_id), revoked_at)
+        except Exception as e:
+            logger.warning(f"Token revocation write failed: {str(e)}")
+
+    async def sync(self) -> None:
+        """Reload the map from Redis, pruning entries no live token can predate."""
+        client = redis_core.redis_client
+        if client is None:
+            return
+        cutoff = int(time.time()) - self.retention_seconds
+        try:
+            entries = await client.hgetall(REVOCATION_KEY)
+            expired = [user_id for user_id, revoked_at in entries.items() if int(revoked_at) < cutoff]
+            if expired:
+                await client.hdel(REVOCATION_KEY, *expired)
+        except Exception as e:
+            # Keep the last known map; it only ever misses revocations younger than the outage
+            logger.warning(f"Token revocation sync failed: {str(e)}")
+            return
+        self._revoked = {
+            int(user_id): int(revoked_at) for user_id, revoked_at in entries.items() if int(revoked_at) >= cutoff
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self.sync()
+            await asyncio.sleep(self.sync_seconds)
+
+    def start(self) -> None:
+        """Start the periodic sync (API startup, stateless mode only)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+# Process-wide instance shared by all requests in an API process
+revocation_list = RevocationList(
+    settings.AUTH_REVOCATION_SYNC_SECONDS, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
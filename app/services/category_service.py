@@ -1,6 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud import category as crud
+from app.crud import transaction_aggregate as aggregate_crud
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 
 
@@ -8,8 +9,8 @@ class CategoryService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_category(self, category_in: CategoryCreate, user_id: int) -> CategoryResponse:
-        db_obj = await crud.create_category(self.db, category_in, user_id)
+    async def create_category(self, category_in: CategoryCreate, user_id: int, commit: bool = True) -> CategoryResponse:
+        db_obj = await crud.create_category(self.db, category_in, user_id, commit=commit)
         return CategoryResponse.model_validate(db_obj)
 
     async def get_category(self, category_id: int) -> Optional[CategoryResponse]:
@@ -24,12 +25,14 @@ class CategoryService:
         db_obj = await crud.get_category_by_name(self.db, user_id, name)
         return CategoryResponse.model_validate(db_obj) if db_obj else None
 
-    async def update_category(self, category_id: int, category_in: CategoryUpdate) -> Optional[CategoryResponse]:
+    async def update_category(self, category_id: int, category_in: CategoryUpdate, commit: bool = True) -> Optional[CategoryResponse]:
         db_obj = await crud.get_category(self.db, category_id)
         if not db_obj:
             return None
-        updated_obj = await crud.update_category(self.db, db_obj, category_in)
+        updated_obj = await crud.update_category(self.db, db_obj, category_in, commit=commit)
         return CategoryResponse.model_validate(updated_obj)
 
-    async def delete_category(self, category_id: int) -> bool:
-        return await crud.delete_category(self.db, category_id)
+    async def delete_category(self, category_id: int, commit: bool = True) -> bool:
+        # Its transactions become uncategorized (SET NULL); move their aggregates along
+        await aggregate_crud.uncategorize(self.db, category_id, commit=False)
+        return await crud.delete_category(self.db, category_id, commit=commit)
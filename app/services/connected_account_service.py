@@ -1,5 +1,8 @@
+import random
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.crud import connected_account as crud
 from app.schemas.connected_account import ConnectedAccountCreate, ConnectedAccountUpdate, ConnectedAccountResponse
 
@@ -11,8 +14,8 @@ class ConnectedAccountService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_account(self, account_in: ConnectedAccountCreate, user_id: int) -> ConnectedAccountResponse:
-        db_obj = await crud.create_connected_account(self.db, account_in, user_id)
+    async def create_account(self, account_in: ConnectedAccountCreate, user_id: int, commit: bool = True) -> ConnectedAccountResponse:
+        db_obj = await crud.create_connected_account(self.db, account_in, user_id, commit=commit)
         return ConnectedAccountResponse.model_validate(db_obj)
 
     async def get_account(self, account_id: int) -> Optional[ConnectedAccountResponse]:
@@ -31,12 +34,45 @@ class ConnectedAccountService:
         """Internal use only: returns SQLAlchemy models with sensitive tokens."""
         return await crud.get_connected_accounts_by_user(self.db, user_id)
 
-    async def update_account(self, account_id: int, account_in: ConnectedAccountUpdate) -> Optional[ConnectedAccountResponse]:
+    async def get_active_account(self, user_id: int, provider: str) -> Optional[ConnectedAccountResponse]:
+        """The user's first active account for `provider`."""
+        accounts = await crud.get_connected_accounts_by_user(self.db, user_id)
+        db_obj = next((a for a in accounts if a.provider == provider and a.is_active), None)
+        return ConnectedAccountResponse.model_validate(db_obj) if db_obj else None
+
+    async def list_accounts_due_for_poll_db(self, until: datetime, limit: int) -> List[ConnectedAccount]:
+        """Internal use only: accounts the fetch scheduler should enqueue before `until`."""
+        return await crud.get_accounts_due_for_poll(self.db, until, limit)
+
+    @staticmethod
+    def poll_interval(account: ConnectedAccount) -> int:
+        return account.poll_interval_seconds or settings.EMAIL_POLL_DEFAULT_INTERVAL_SECONDS
+
+    def schedule_next_poll(self, account: ConnectedAccount, after: datetime) -> datetime:
+        """Set next_poll_at one poll interval (with jitter) after `after`. Committed by the caller."""
+        jitter = random.uniform(1 - settings.EMAIL_POLL_JITTER, 1 + settings.EMAIL_POLL_JITTER)
+        account.next_poll_at = after + timedelta(seconds=self.poll_interval(account) * jitter)
+        return account.next_poll_at
+
+    def record_poll_result(self, account: ConnectedAccount, found_new_mail: bool) -> None:
+        """
+        Adapt the poll interval to mailbox activity, then schedule the next poll from now.
+        Halved when the fetch found new mail, doubled when it found none, kept within
+        EMAIL_POLL_MIN/MAX_INTERVAL_SECONDS. Committed by the caller.
+        """
+        interval = self.poll_interval(account)
+        interval = interval // 2 if found_new_mail else interval * 2
+        account.poll_interval_seconds = max(
+            settings.EMAIL_POLL_MIN_INTERVAL_SECONDS, min(settings.EMAIL_POLL_MAX_INTERVAL_SECONDS, interval)
+        )
+        self.schedule_next_poll(account, datetime.now(timezone.utc))
+
+    async def update_account(self, account_id: int, account_in: ConnectedAccountUpdate, commit: bool = True) -> Optional[ConnectedAccountResponse]:
         db_obj = await crud.get_connected_account(self.db, account_id)
         if not db_obj:
             return None
-        updated_obj = await crud.update_connected_account(self.db, db_obj, account_in)
+        updated_obj = await crud.update_connected_account(self.db, db_obj, account_in, commit=commit)
         return ConnectedAccountResponse.model_validate(updated_obj)
 
-    async def delete_account(self, account_id: int) -> bool:
-        return await crud.delete_connected_account(self.db, account_id)
+    async def delete_account(self, account_id: int, commit: bool = True) -> bool:
+        return await crud.delete_connected_account(self.db, account_id, commit=commit)
@@ -8,8 +8,8 @@ class EmailExtractionService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_extraction(self, extraction_in: EmailExtractionCreate) -> EmailExtractionRead:
-        db_obj = await crud.create_email_extraction(self.db, extraction_in)
+    async def create_extraction(self, extraction_in: EmailExtractionCreate, commit: bool = True) -> EmailExtractionRead:
+        db_obj = await crud.create_email_extraction(self.db, extraction_in, commit=commit)
         return EmailExtractionRead.model_validate(db_obj)
 
     async def get_extraction(self, id: int) -> Optional[EmailExtractionRead]:
@@ -20,5 +20,5 @@ class EmailExtractionService:
         db_objs = await crud.get_extractions_by_email(self.db, email_id)
         return [EmailExtractionRead.model_validate(obj) for obj in db_objs]
 
-    async def delete_extraction(self, id: int) -> bool:
-        return await crud.delete_email_extraction(self.db, id)
+    async def delete_extraction(self, id: int, commit: bool = True) -> bool:
+        return await crud.delete_email_extraction(self.db, id, commit=commit)
@@ -1,17 +1,31 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor
 from app.crud import email as crud
-from app.schemas.email import EmailCreate, EmailUpdate, EmailRead
+from app.models.email import Email
+from app.schemas.email import EmailCreate, EmailUpdate, EmailRead, EmailBulkUpsertResult
 
 
 class EmailService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_email(self, email_in: EmailCreate) -> EmailRead:
-        db_obj = await crud.create_email(self.db, email_in)
+    async def create_email(self, email_in: EmailCreate, commit: bool = True) -> EmailRead:
+        db_obj = await crud.create_email(self.db, email_in, commit=commit)
         return EmailRead.model_validate(db_obj)
 
+    async def bulk_upsert_emails(self, emails_in: Sequence[EmailCreate], commit: bool = True) -> EmailBulkUpsertResult:
+        """Insert many emails at once; existing (provider, provider_message_id) rows are skipped."""
+        inserted_ids = await crud.bulk_upsert_emails(self.db, emails_in, commit=commit)
+        return EmailBulkUpsertResult(
+            inserted=len(inserted_ids),
+            skipped=len(emails_in) - len(inserted_ids)
+        )
+
+    async def claim_pending_emails_db(self, limit: int, lease_seconds: int, reprocess: bool = False) -> List[Email]:
+        """Internal use only: claims emails for extraction and returns SQLAlchemy models."""
+        return await crud.claim_pending_emails(self.db, limit, lease_seconds, reprocess)
+
     async def get_email(self, id: int) -> Optional[EmailRead]:
         db_obj = await crud.get_email(self.db, id)
         return EmailRead.model_validate(db_obj) if db_obj else None
@@ -20,16 +34,22 @@ class EmailService:
         db_obj = await crud.get_email_by_provider_id(self.db, user_id, provider, provider_message_id)
         return EmailRead.model_validate(db_obj) if db_obj else None
 
-    async def list_user_emails(self, user_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[EmailRead]:
-        db_objs = await crud.get_emails_by_user(self.db, user_id, skip, limit)
+    async def list_user_emails(
+        self,
+        user_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None
+    ) -> List[EmailRead]:
+        db_objs = await crud.get_emails_by_user(self.db, user_id, skip, limit, cursor)
         return [EmailRead.model_validate(obj) for obj in db_objs]
 
-    async def update_email(self, id: int, email_in: EmailUpdate) -> Optional[EmailRead]:
+    async def update_email(self, id: int, email_in: EmailUpdate, commit: bool = True) -> Optional[EmailRead]:
         db_obj = await crud.get_email(self.db, id)
         if not db_obj:
             return None
-        updated_obj = await crud.update_email(self.db, db_obj, email_in)
+        updated_obj = await crud.update_email(self.db, db_obj, email_in, commit=commit)
         return EmailRead.model_validate(updated_obj)
 
-    async def delete_email(self, id: int) -> bool:
-        return await crud.delete_email(self.db, id)
+    async def delete_email(self, id: int, commit: bool = True) -> bool:
+        return await crud.delete_email(self.db, id, commit=commit)
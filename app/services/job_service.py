@@ -1,6 +1,8 @@
 from typing import List, Optional, Any
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor
 from app.crud import job as crud
+from app.models.job import Job
 from app.schemas.job import JobCreate, JobUpdate, JobRead
 
 
@@ -8,36 +10,56 @@ class JobService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_job(self, job_in: JobCreate) -> JobRead:
-        db_obj = await crud.create_job(self.db, job_in)
+    async def create_job(self, job_in: JobCreate, commit: bool = True) -> JobRead:
+        db_obj = await crud.create_job(self.db, job_in, commit=commit)
         return JobRead.model_validate(db_obj)
 
-    async def create_job_raw(self, **kwargs) -> Any:
+    async def create_job_raw(self, commit: bool = True, **kwargs) -> Any:
         # Internal helper to create a job and return the model instance
         job_in = JobCreate(**kwargs)
-        return await crud.create_job(self.db, job_in)
+        return await crud.create_job(self.db, job_in, commit=commit)
+
+    async def create_active_job_raw(self, **kwargs) -> Optional[Job]:
+        """Internal use only: None when the ARQ job id already has an active record."""
+        return await crud.create_active_job(self.db, JobCreate(**kwargs))
 
     async def get_job(self, id: int) -> Optional[JobRead]:
         db_obj = await crud.get_job(self.db, id)
         return JobRead.model_validate(db_obj) if db_obj else None
 
+    async def get_job_db(self, id: int) -> Optional[Job]:
+        """Internal use only: returns the SQLAlchemy model (used by JobRunner)."""
+        return await crud.get_job(self.db, id)
+
+    async def get_active_job_by_arq_id_db(self, arq_job_id: str) -> Optional[Job]:
+        return await crud.get_active_job_by_arq_id(self.db, arq_job_id)
+
     async def list_jobs(
         self, 
         skip: int = 0, 
         limit: int = 100,
         status: Optional[str] = None,
         job_type: Optional[str] = None,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        cursor: Optional[Cursor] = None
     ) -> List[JobRead]:
-        db_objs = await crud.get_jobs(self.db, skip, limit, status, job_type, user_id)
+        db_objs = await crud.get_jobs(self.db, skip, limit, status, job_type, user_id, cursor)
         return [JobRead.model_validate(obj) for obj in db_objs]
 
-    async def update_job(self, id: int, job_in: JobUpdate) -> Optional[JobRead]:
+    async def update_job(self, id: int, job_in: JobUpdate, commit: bool = True) -> Optional[JobRead]:
         db_obj = await crud.get_job(self.db, id)
         if not db_obj:
             return None
-        updated_obj = await crud.update_job(self.db, db_obj, job_in)
+        updated_obj = await crud.update_job(self.db, db_obj, job_in, commit=commit)
         return JobRead.model_validate(updated_obj)
 
-    async def delete_job(self, id: int) -> bool:
-        return await crud.delete_job(self.db, id)
+    async def update_job_db(self, db_obj: Job, job_in: JobUpdate, commit: bool = True) -> Job:
+        """Internal use only: updates an already loaded job without looking it up again."""
+        return await crud.update_job(self.db, db_obj, job_in, commit=commit)
+
+    async def fail_active_job(self, id: int, error_payload: Any, commit: bool = True) -> bool:
+        """Internal use only: FAILED unless the job already finished; see crud.fail_active_job."""
+        return await crud.fail_active_job(self.db, id, error_payload, commit=commit)
+
+    async def delete_job(self, id: int, commit: bool = True) -> bool:
+        return await crud.delete_job(self.db, id, commit=commit)
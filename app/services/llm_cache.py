@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.core import redis as redis_core
+from app.core.config import settings
+from app.llm import LLMResponse, PROMPT_VERSION, compute_prompt_hash
+from app.llm.providers import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "llm_cache"
+
+
+class LLMResultCache:
+    """
+    Two-tier cache of LLM results keyed on (model_name, prompt_version, prompt_hash).
+    Tier 1 is an in-process LRU, tier 2 is Redis (shared across workers).
+    Both tiers expire entries after `ttl_seconds`. Redis failures degrade to a miss.
+    `in_flight` holds the pending LLM call of each key being computed in this process.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.in_flight: Dict[str, "asyncio.Future[LLMResponse]"] = {}
+
+    @staticmethod
+    def make_key(model_name: str, prompt_version: str, prompt_hash: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{model_name}:{prompt_version}:{prompt_hash}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                return value
+            del self._local[key]
+
+        client = redis_core.redis_client
+        if client is None:
+            return None
+        try:
+            raw = await client.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+            return None
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self._store_local(key, value)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._store_local(key, value)
+
+        client = redis_core.redis_client
+        if client is None:
+            return
+        try:
+            await client.set(key, json.dumps(value), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)."""
+        self._local.clear()
+
+    def _store_local(self, key: str, value: Dict[str, Any]) -> None:
+        self._local[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+
+# Process-wide instance so the local tier is shared by all jobs in a worker
+llm_result_cache = LLMResultCache(settings.LLM_CACHE_MAX_SIZE, settings.LLM_CACHE_TTL_SECONDS)
+
+
+class CachedLLMService(LLMProvider):
+    """
+    Wraps an LLM provider with the result cache.
+    Hits return the stored content with zero tokens and cache_hit=True, so the
+    recorded LLMTransaction shows no cost. Each prompt is sent at most once at a
+    time: copies within a batch, and misses on a key whose call is already in
+    flight (another batch or job in this worker), share that call's result as hits.
+    """
+
+    def __init__(self, llm: LLMProvider, cache: LLMResultCache = llm_result_cache):
+        super().__init__(llm.model_name)
+        self.llm = llm
+        self.cache = cache
+        self.name = llm.name
+
+    @staticmethod
+    def _as_hit(response: LLMResponse, start: float) -> LLMResponse:
+        return replace(
+            response,
+            input_tokens=0,
+            output_tokens=0,
+            latency_ms=int((time.perf_counter() - start) * 1000),
+            cache_hit=True,
+            rate_limit_wait_ms=0
+        )
+
+    async def extract_financial_data(self, email_text: str) -> LLMResponse:
+        start = time.perf_counter()
+        key = self.cache.make_key(self.model_name, PROMPT_VERSION, compute_prompt_hash(email_text))
+
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return self._as_hit(LLMResponse(**cached), start)
+
+        # Checked and claimed with no await in between, so one caller per key calls the LLM
+        pending = self.cache.in_flight.get(key)
+        if pending is not None:
+            # shield: a cancelled follower must not cancel the call others wait on
+            return self._as_hit(await asyncio.shield(pending), start)
+
+        future = asyncio.get_running_loop().create_future()
+        self.cache.in_flight[key] = future
+        try:
+            response = await self.llm.extract_financial_data(email_text)
+            await self.cache.set(key, asdict(response))
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            # Marks the exception retrieved, in case no follower awaits it
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self.cache.in_flight[key]
+
+    async def extract_batch(
+        self,
+        email_texts: Sequence[str],
+        concurrency: int = 10
+    ) -> List[Union[LLMResponse, Exception]]:
+        """Like LLMProvider.extract_batch, with each distinct prompt submitted once."""
+        distinct = list(dict.fromkeys(email_texts))
+        results = dict(zip(distinct, await super().extract_batch(distinct, concurrency=concurrency)))
+
+        seen = set()
+        batch: List[Union[LLMResponse, Exception]] = []
+        for email_text in email_texts:
+            result = results[email_text]
+            if email_text in seen and not isinstance(result, Exception):
+                result = self._as_hit(result, time.perf_counter())
+            seen.add(email_text)
+            batch.append(result)
+        return batch
+
+    async def close(self) -> None:
+        await self.llm.close()
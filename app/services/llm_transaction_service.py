@@ -8,8 +8,8 @@ class LLMTransactionService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_transaction(self, transaction_in: LLMTransactionCreate) -> LLMTransactionRead:
-        db_obj = await crud.create_llm_transaction(self.db, transaction_in)
+    async def create_transaction(self, transaction_in: LLMTransactionCreate, commit: bool = True) -> LLMTransactionRead:
+        db_obj = await crud.create_llm_transaction(self.db, transaction_in, commit=commit)
         return LLMTransactionRead.model_validate(db_obj)
 
     async def get_transaction(self, id: int) -> Optional[LLMTransactionRead]:
@@ -20,5 +20,5 @@ class LLMTransactionService:
         db_objs = await crud.get_llm_transactions_by_job(self.db, job_id)
         return [LLMTransactionRead.model_validate(obj) for obj in db_objs]
 
-    async def delete_transaction(self, id: int) -> bool:
-        return await crud.delete_llm_transaction(self.db, id)
+    async def delete_transaction(self, id: int, commit: bool = True) -> bool:
+        return await crud.delete_llm_transaction(self.db, id, commit=commit)
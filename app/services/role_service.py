@@ -19,16 +19,16 @@ class RoleService:
     async def list_roles(self, skip: int = 0, limit: int = 100) -> List[Role]:
         return await role_crud.get_multi(self.db, skip=skip, limit=limit)
 
-    async def create_role(self, role_in: RoleCreate) -> Role:
+    async def create_role(self, role_in: RoleCreate, commit: bool = True) -> Role:
         # Check if role already exists
         existing = await self.get_role_by_name(role_in.name)
         if existing:
             raise ValueError(f"Role with name '{role_in.name}' already exists.")
         
-        db_obj = await role_crud.create(self.db, obj_in=role_in)
+        db_obj = await role_crud.create(self.db, obj_in=role_in, commit=commit)
         return db_obj
 
-    async def update_role(self, role_id: int, role_in: RoleUpdate) -> Role:
+    async def update_role(self, role_id: int, role_in: RoleUpdate, commit: bool = True) -> Role:
         db_obj = await self.get_role(role_id)
         if not db_obj:
             raise ValueError("Role not found.")
@@ -38,8 +38,8 @@ class RoleService:
             if existing and existing.id != role_id:
                 raise ValueError(f"Role with name '{role_in.name}' already exists.")
         
-        return await role_crud.update(self.db, db_obj=db_obj, obj_in=role_in)
+        return await role_crud.update(self.db, db_obj=db_obj, obj_in=role_in, commit=commit)
 
-    async def delete_role(self, role_id: int) -> bool:
-        db_obj = await role_crud.remove(self.db, id=role_id)
+    async def delete_role(self, role_id: int, commit: bool = True) -> bool:
+        db_obj = await role_crud.remove(self.db, id=role_id, commit=commit)
         return db_obj is not None
@@ -1,28 +1,233 @@
-from typing import Optional
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from arq.connections import ArqRedis
+from arq.jobs import Job as ArqJob, JobStatus
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import queue
+from app.core.config import settings
+from app.crud.connected_account import get_connected_account
+from app.models.job import Job
+from app.schemas.job import JobEnqueued, JobRead
+from app.services.job_service import JobService
+
+# Deterministic ARQ job ids make enqueueing idempotent: ARQ refuses a second job
+# with the id of one that is still queued or running, and the jobs table holds at
+# most one active record per id (uq_jobs_active_arq_job_id).
+# A QUEUED record is committed just before its ARQ job is enqueued: until then ARQ
+# does not know the id, which must not be mistaken for a lost job
+ENQUEUE_GRACE = timedelta(seconds=30)
+# ARQ releases a job id only after the job's record is final; an enqueue landing in
+# between is retried shortly
+ENQUEUE_ATTEMPTS = 3
+ENQUEUE_RETRY_DELAY_SECONDS = 0.1
 
 class TaskService:
+    """
+    Enqueues background jobs. Each job gets a QUEUED record at enqueue time,
+    linked to its ARQ job id, which the worker then runs, retries and finalises.
+    A trigger arriving while the same job is pending is coalesced into it.
+    """
+
+    def __init__(self, db: AsyncSession, pool: Optional[ArqRedis] = None):
+        self.db = db
+        self.job_service = JobService(db)
+        # Workers pass their own ARQ connection; the API uses the pool opened at startup
+        self.pool = pool
+
     @staticmethod
-    async def enqueue_email_fetch(user_id: int, provider: str = "gmail", limit: int = 20, account_id: Optional[int] = None):
-        """Enqueue an email fetch job to the email pool."""
-        if not queue.email_pool:
-            raise RuntimeError("Email queue pool is not initialized. Ensure the application is running.")
-        
-        await queue.email_pool.enqueue_job(
-            "run_email_fetch", 
-            user_id=user_id, 
-            provider=provider, 
-            limit=limit,
-            account_id=account_id
-        )
+    def fetch_job_id(account_id: int, backfill: bool = False, part: int = 1) -> str:
+        """
+        ARQ job id of an email fetch: one pending fetch (and one backfill) per account,
+        whichever path triggered it. Continuation parts of a backfill get their own id,
+        as the part enqueueing them is still running.
+        """
+        job_id = f"{'backfill' if backfill else 'fetch'}:{account_id}"
+        return f"{job_id}:{part}" if backfill and part > 1 else job_id
 
     @staticmethod
-    async def enqueue_email_extraction(batch_size: int = 10):
-        """Enqueue an email extraction job to the email pool."""
-        if not queue.email_pool:
+    def extraction_job_id(slot: int) -> str:
+        """ARQ job id of an extraction job: one per slot, up to EXTRACTION_MAX_JOBS running at once."""
+        return f"extract:{slot}"
+
+    async def _get_pending_job(self, pool: ArqRedis, arq_job_id: str) -> Optional[Job]:
+        """
+        The active record for `arq_job_id`, if ARQ still holds that job (queued, deferred
+        for a retry, or running) or is about to (a record created within ENQUEUE_GRACE,
+        whose caller is enqueueing it). A record whose job ARQ no longer knows (lost
+        queue, killed worker) is marked FAILED so it does not block new jobs, unless
+        it has meanwhile been finalised by its worker.
+        """
+        job_record = await self.job_service.get_active_job_by_arq_id_db(arq_job_id)
+        if job_record is None:
+            return None
+
+        arq_status = await ArqJob(arq_job_id, pool, _queue_name=pool.default_queue_name).status()
+        if arq_status in (JobStatus.queued, JobStatus.deferred, JobStatus.in_progress):
+            return job_record
+
+        created_at = job_record.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if job_record.status == "QUEUED" and datetime.now(timezone.utc) - created_at < ENQUEUE_GRACE:
+            return job_record
+
+        # The worker may have finalised the record since it was read (ARQ releases the id
+        # right after): only a record still QUEUED/RUNNING in the database is failed
+        await self.job_service.fail_active_job(
+            job_record.id, {"error": f"Job {arq_job_id} no longer in the queue ({arq_status.value})"}
+        )
+        return None
+
+    async def _get_pending_backfill_part(self, account_id: int) -> Optional[Job]:
+        """The pending continuation part of the account's unfinished backfill, if any."""
+        account = await get_connected_account(self.db, account_id)
+        pool = self.pool or queue.email_pool
+        if account is None or not account.backfill_state or not pool:
+            return None
+        # The part that recorded the state may still be running, or has enqueued the next one
+        recorded_part = account.backfill_state.get("part", 1)
+        for part in (recorded_part, recorded_part + 1):
+            if part > 1:
+                arq_job_id = self.fetch_job_id(account_id, backfill=True, part=part)
+                pending = await self._get_pending_job(pool, arq_job_id)
+                if pending is not None:
+                    return pending
+        return None
+
+    async def _enqueue(
+        self,
+        function: str,
+        job_type: str,
+        input_payload: Dict[str, Any],
+        task_kwargs: Dict[str, Any],
+        arq_job_id: str,
+        triggered_by: str = "API",
+        user_id: Optional[int] = None,
+        defer_by: Optional[timedelta] = None
+    ) -> JobEnqueued:
+        """
+        Idempotent on `arq_job_id`: while a job with that id is queued or running,
+        nothing new is enqueued and that job's record is returned (coalesced=True).
+        The task function must keep no result, so the id is free again once it finishes.
+        """
+        pool = self.pool or queue.email_pool
+        if not pool:
             raise RuntimeError("Email queue pool is not initialized. Ensure the application is running.")
-        
-        await queue.email_pool.enqueue_job(
-            "run_email_extraction", 
-            batch_size=batch_size
+
+        job_record = None
+        for _ in range(ENQUEUE_ATTEMPTS):
+            pending = await self._get_pending_job(pool, arq_job_id)
+            if pending is not None:
+                return JobEnqueued(job=JobRead.model_validate(pending), coalesced=True)
+
+            # None: a concurrent caller's record went in first, coalesced into on the next pass
+            job_record = await self.job_service.create_active_job_raw(
+                job_type=job_type,
+                input_payload=input_payload,
+                triggered_by=triggered_by,
+                user_id=user_id,
+                status="QUEUED",
+                arq_job_id=arq_job_id
+            )
+            if job_record is not None:
+                break
+        if job_record is None:
+            raise RuntimeError(f"No pending job {arq_job_id} found and none created after {ENQUEUE_ATTEMPTS} attempts")
+
+        for attempt in range(1, ENQUEUE_ATTEMPTS + 1):
+            try:
+                arq_job = await pool.enqueue_job(
+                    function, _job_id=arq_job_id, _defer_by=defer_by, job_id=job_record.id, **task_kwargs
+                )
+            except Exception as e:
+                # Never leave a QUEUED record behind that no worker will pick up
+                await self.job_service.fail_active_job(job_record.id, {"error": f"Enqueue failed: {e}"})
+                raise
+
+            if arq_job is not None:
+                return JobEnqueued(job=JobRead.model_validate(job_record))
+
+            # Ours is the only active record, so the id is held by a finished job
+            # ARQ has not released yet: try again shortly
+            await asyncio.sleep(ENQUEUE_RETRY_DELAY_SECONDS * attempt)
+
+        await self.job_service.fail_active_job(
+            job_record.id, {"error": f"Job {arq_job_id} still held by ARQ after {ENQUEUE_ATTEMPTS} attempts"}
         )
+        raise RuntimeError(f"Job {arq_job_id} is still held by ARQ after {ENQUEUE_ATTEMPTS} attempts")
+
+    async def enqueue_email_fetch(
+        self,
+        user_id: int,
+        account_id: int,
+        provider: str = "gmail",
+        limit: int = 20,
+        backfill: bool = False,
+        since: Optional[datetime] = None,
+        part: int = 1,
+        triggered_by: str = "API",
+        defer_by: Optional[timedelta] = None
+    ) -> JobEnqueued:
+        """
+        Enqueue an email fetch job to the email pool.
+        With backfill=True the job walks the whole mailbox (or everything after
+        `since`) page by page instead of fetching a single page of `limit`;
+        `part` > 1 continues a backfill that stopped at its time slice.
+        Coalesced into the pending fetch (or backfill, any part) of the same account, if any.
+        """
+        if backfill and part == 1:
+            pending = await self._get_pending_backfill_part(account_id)
+            if pending is not None:
+                return JobEnqueued(job=JobRead.model_validate(pending), coalesced=True)
+
+        task_kwargs = {
+            "user_id": user_id,
+            "provider": provider,
+            "limit": limit,
+            "account_id": account_id,
+            "backfill": backfill,
+            "since": since.isoformat() if since else None,
+            "part": part
+        }
+        payload = {"user_id": user_id, "provider": provider, "limit": limit, "account_id": account_id}
+        if backfill:
+            payload.update({"backfill": True, "since": task_kwargs["since"], "part": part})
+
+        return await self._enqueue(
+            "run_email_fetch", "EMAIL_FETCH", payload, task_kwargs,
+            arq_job_id=self.fetch_job_id(account_id, backfill, part),
+            triggered_by=triggered_by, user_id=user_id, defer_by=defer_by
+        )
+
+    async def enqueue_email_extraction(
+        self, batch_size: int = 10, triggered_by: str = "API", exclude: Optional[str] = None
+    ) -> JobEnqueued:
+        """
+        Enqueue an email extraction job to the email pool, in the first free slot.
+        Every job claims batches until no PENDING email is left, so a trigger is
+        coalesced into a queued job (it has not claimed anything yet) or, when all
+        slots are taken, into a running one. `exclude` skips the caller's own slot.
+        """
+        pool = self.pool or queue.email_pool
+        if not pool:
+            raise RuntimeError("Email queue pool is not initialized. Ensure the application is running.")
+
+        running = None
+        for slot in range(settings.EXTRACTION_MAX_JOBS):
+            arq_job_id = self.extraction_job_id(slot)
+            if arq_job_id == exclude:
+                continue
+            pending = await self._get_pending_job(pool, arq_job_id)
+            if pending is None:
+                return await self._enqueue(
+                    "run_email_extraction", "EMAIL_EXTRACTION", {"batch_size": batch_size}, {"batch_size": batch_size},
+                    arq_job_id=arq_job_id, triggered_by=triggered_by
+                )
+            if pending.status == "QUEUED":
+                return JobEnqueued(job=JobRead.model_validate(pending), coalesced=True)
+            running = running or pending
+
+        if running is None:
+            raise RuntimeError("No extraction slot available; EXTRACTION_MAX_JOBS must be at least 2")
+        return JobEnqueued(job=JobRead.model_validate(running), coalesced=True)
@@ -1,31 +1,66 @@
+from datetime import date
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor
 from app.crud import transaction as crud
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
+from app.crud import transaction_aggregate as aggregate_crud
+from app.crud.transaction_aggregate import AggregateDelta
+from app.models.transaction import TransactionType
+from app.schemas.transaction import (
+    TransactionCreate, TransactionUpdate, TransactionResponse, TransactionSummaryResponse
+)
 
 
 class TransactionService:
+    """
+    Transaction writes also maintain the user's monthly aggregates
+    (transaction_aggregates) in the same database transaction.
+    """
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_transaction(self, transaction_in: TransactionCreate, user_id: int) -> TransactionResponse:
-        db_obj = await crud.create_transaction(self.db, transaction_in, user_id)
+    async def create_transaction(self, transaction_in: TransactionCreate, user_id: int, commit: bool = True) -> TransactionResponse:
+        db_obj = await crud.create_transaction(self.db, transaction_in, user_id, commit=False)
+        await aggregate_crud.apply_deltas(self.db, [AggregateDelta.of(db_obj)], commit=commit)
         return TransactionResponse.model_validate(db_obj)
 
     async def get_transaction(self, transaction_id: int) -> Optional[TransactionResponse]:
         db_obj = await crud.get_transaction(self.db, transaction_id)
         return TransactionResponse.model_validate(db_obj) if db_obj else None
 
-    async def list_user_transactions(self, user_id: int, skip: int = 0, limit: int = 100) -> List[TransactionResponse]:
-        db_objs = await crud.get_transactions_by_user(self.db, user_id, skip, limit)
+    async def list_user_transactions(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[Cursor] = None
+    ) -> List[TransactionResponse]:
+        db_objs = await crud.get_transactions_by_user(self.db, user_id, skip, limit, cursor)
         return [TransactionResponse.model_validate(obj) for obj in db_objs]
 
-    async def update_transaction(self, transaction_id: int, transaction_in: TransactionUpdate) -> Optional[TransactionResponse]:
+    async def update_transaction(self, transaction_id: int, transaction_in: TransactionUpdate, commit: bool = True) -> Optional[TransactionResponse]:
         db_obj = await crud.get_transaction(self.db, transaction_id)
         if not db_obj:
             return None
-        updated_obj = await crud.update_transaction(self.db, db_obj, transaction_in)
+        previous = AggregateDelta.of(db_obj, sign=-1)
+        updated_obj = await crud.update_transaction(self.db, db_obj, transaction_in, commit=False)
+        await aggregate_crud.apply_deltas(self.db, [previous, AggregateDelta.of(updated_obj)], commit=commit)
         return TransactionResponse.model_validate(updated_obj)
 
-    async def delete_transaction(self, transaction_id: int) -> bool:
-        return await crud.delete_transaction(self.db, transaction_id)
+    async def delete_transaction(self, transaction_id: int, commit: bool = True) -> bool:
+        db_obj = await crud.get_transaction(self.db, transaction_id)
+        if not db_obj:
+            return False
+        await aggregate_crud.apply_deltas(self.db, [AggregateDelta.of(db_obj, sign=-1)], commit=False)
+        return await crud.delete_transaction(self.db, transaction_id, commit=commit)
+
+    async def get_summary(
+        self,
+        user_id: int,
+        from_month: Optional[date] = None,
+        to_month: Optional[date] = None,
+        transaction_type: Optional[TransactionType] = None
+    ) -> List[TransactionSummaryResponse]:
+        db_objs = await aggregate_crud.get_summary(self.db, user_id, from_month, to_month, transaction_type)
+        return [TransactionSummaryResponse.model_validate(obj) for obj in db_objs]
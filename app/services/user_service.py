@@ -1,15 +1,18 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import Cursor
 from app.crud import user as crud
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.services.auth_cache import auth_user_cache
+from app.services.auth_revocation import revocation_list
 
 
 class UserService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create_user(self, user_in: UserCreate) -> UserResponse:
-        db_obj = await crud.create_user(self.db, user_in)
+    async def create_user(self, user_in: UserCreate, commit: bool = True) -> UserResponse:
+        db_obj = await crud.create_user(self.db, user_in, commit=commit)
         return UserResponse.model_validate(db_obj)
 
     async def get_user(self, user_id: int) -> Optional[UserResponse]:
@@ -20,16 +23,24 @@ class UserService:
         db_obj = await crud.get_user_by_email(self.db, email)
         return UserResponse.model_validate(db_obj) if db_obj else None
 
-    async def get_users(self, skip: int = 0, limit: int = 100) -> List[UserResponse]:
-        db_objs = await crud.get_users(self.db, skip, limit)
+    async def get_users(self, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None) -> List[UserResponse]:
+        db_objs = await crud.get_users(self.db, skip, limit, cursor)
         return [UserResponse.model_validate(obj) for obj in db_objs]
 
-    async def update_user(self, user_id: int, user_in: UserUpdate) -> Optional[UserResponse]:
+    async def update_user(self, user_id: int, user_in: UserUpdate, commit: bool = True) -> Optional[UserResponse]:
         db_obj = await crud.get_user(self.db, user_id)
         if not db_obj:
             return None
-        updated_obj = await crud.update_user(self.db, db_user=db_obj, user_in=user_in)
+        updated_obj = await crud.update_user(self.db, db_user=db_obj, user_in=user_in, commit=commit)
+        # Profile, active flag or password changed: get_current_user must reload the user
+        await auth_user_cache.invalidate(user_id)
+        if user_in.is_active is False or user_in.password is not None:
+            # Stateless mode trusts token claims: revoke the tokens issued so far
+            await revocation_list.revoke(user_id)
         return UserResponse.model_validate(updated_obj)
 
-    async def delete_user(self, user_id: int) -> bool:
-        return await crud.delete_user(self.db, user_id)
+    async def delete_user(self, user_id: int, commit: bool = True) -> bool:
+        deleted = await crud.delete_user(self.db, user_id, commit=commit)
+        await auth_user_cache.invalidate(user_id)
+        await revocation_list.revoke(user_id)
+        return deleted
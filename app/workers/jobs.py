@@ -1,35 +1,112 @@
+from datetime import datetime
+from arq.worker import Retry
+from app.core.config import settings
 from app.core.database import AsyncSessionLocal
-from app.jobs import JobRunner, EmailFetchJob, EmailExtractionJob
+from app.crud.user import get_user
+from app.email import EmailSendError, OutgoingEmail
+from app.email.templates import NOTIFICATION_EMAIL, OTP_EMAIL
+from app.jobs import JobRunner, JobRetryError, EmailFetchJob, EmailExtractionJob
+from app.services.job_service import JobService
+from app.services.task_service import TaskService
 
-async def run_email_fetch(ctx, user_id: int, provider: str = "gmail", limit: int = 20, account_id: int = None):
-    """ARQ Task: Fetch emails for a user."""
+async def _run(ctx, job_id, *args, **kwargs):
+    """Run a job against its record, turning a scheduled retry into an ARQ Retry. Returns the record."""
     async with AsyncSessionLocal() as db:
         runner = JobRunner(db)
-        payload = {"user_id": user_id, "provider": provider, "limit": limit, "account_id": account_id}
-        await runner.run_job(EmailFetchJob, "EMAIL_FETCH", payload, triggered_by="system", user_id=user_id)
+        try:
+            return await runner.run_job(
+                *args,
+                **kwargs,
+                job_id=job_id,
+                arq_job_id=ctx.get("job_id"),
+                attempt=ctx.get("job_try", 1),
+                max_retries=settings.JOB_MAX_RETRIES
+            )
+        except JobRetryError as e:
+            raise Retry(defer=e.defer_seconds)
 
-async def run_email_extraction(ctx, batch_size: int = 10):
-    """ARQ Task: Extract data from pending emails."""
-    async with AsyncSessionLocal() as db:
-        runner = JobRunner(db)
-        payload = {"batch_size": batch_size}
-        await runner.run_job(EmailExtractionJob, "EMAIL_EXTRACTION", payload, triggered_by="system")
+async def run_email_fetch(
+    ctx,
+    user_id: int,
+    provider: str = "gmail",
+    limit: int = 20,
+    account_id: int = None,
+    backfill: bool = False,
+    since: str = None,
+    part: int = 1,
+    job_id: int = None
+):
+    """
+    ARQ Task: Fetch emails for a user. `job_id` is the QUEUED record created at enqueue time.
+    A backfill that stopped at its time slice (complete=False) is continued by
+    enqueueing its next part, which resumes from the page the account records.
+    The record of a scheduled poll that saved nothing is deleted once it succeeds.
+    """
+    payload = {"user_id": user_id, "provider": provider, "limit": limit, "account_id": account_id}
+    if backfill:
+        payload.update({"backfill": True, "since": since, "part": part})
+    job_record = await _run(ctx, job_id, EmailFetchJob, "EMAIL_FETCH", payload, triggered_by="system", user_id=user_id)
+
+    result = job_record.output_payload if job_record is not None and job_record.status == "SUCCESS" else None
+    if result and job_record.triggered_by == "CRON" and result.get("saved_count") == 0 and result.get("complete", True):
+        # Most polls find nothing new; keeping their records would add one row per account
+        # and poll (every few minutes) to the jobs table. Failed polls are kept.
+        async with AsyncSessionLocal() as db:
+            await JobService(db).delete_job(job_record.id)
+    elif result and result.get("complete") is False:
+        async with AsyncSessionLocal() as db:
+            await TaskService(db, pool=ctx["redis"]).enqueue_email_fetch(
+                user_id=user_id,
+                provider=provider,
+                account_id=result["account_id"],
+                backfill=True,
+                since=datetime.fromisoformat(result["since"]) if result["since"] else None,
+                part=result["part"] + 1,
+                triggered_by="SYSTEM"
+            )
+
+async def run_email_extraction(ctx, batch_size: int = 10, job_id: int = None):
+    """
+    ARQ Task: Extract data from pending emails. `job_id` is the QUEUED record created at enqueue time.
+    A job that stopped at its time slice with emails left (complete=False) hands
+    over to a new job in another slot.
+    """
+    payload = {"batch_size": batch_size}
+    job_record = await _run(ctx, job_id, EmailExtractionJob, "EMAIL_EXTRACTION", payload, triggered_by="system")
+
+    result = job_record.output_payload if job_record is not None and job_record.status == "SUCCESS" else None
+    if result and result.get("complete") is False:
+        async with AsyncSessionLocal() as db:
+            await TaskService(db, pool=ctx["redis"]).enqueue_email_extraction(
+                batch_size=batch_size, triggered_by="SYSTEM", exclude=ctx.get("job_id")
+            )
 
 async def sample_task(ctx):
     """A sample base task."""
     print("Executing sample base task...")
     return "base_task_complete"
 
-async def send_email(ctx, user_id: int):
-    """Job to handle sending emails."""
-    print(f"Sending email to user id: {user_id}")
+async def _deliver(ctx, message: OutgoingEmail) -> None:
+    """Send through the worker's sender; transient failures are retried shortly (ARQ max_tries)."""
+    try:
+        await ctx["email_sender"].send(message)
+    except EmailSendError as e:
+        if e.permanent:
+            raise
+        raise Retry(defer=ctx.get("job_try", 1))
+
+async def send_email(ctx, user_id: int, subject: str = "Notification", body: str = ""):
+    """Job to send a notification email to a user."""
+    async with AsyncSessionLocal() as db:
+        user = await get_user(db, user_id)
+    if user is None:
+        return "user_not_found"
+    await _deliver(ctx, NOTIFICATION_EMAIL.render(
+        user.primary_email, subject=subject, name=user.name or user.username, body=body
+    ))
     return "email_sent"
 
 async def send_otp_email(ctx, email: str, otp: str):
-    """Job to handle sending OTP emails."""
-    print(f"--- OTP EMAIL ---")
-    print(f"To: {email}")
-    print(f"OTP: {otp}")
-    print(f"Valid for 5 minutes.")
-    print(f"------------------")
+    """Job to send a password reset OTP."""
+    await _deliver(ctx, OTP_EMAIL.render(email, otp=otp))
     return "otp_email_sent"
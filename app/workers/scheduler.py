@@ -0,0 +1,63 @@
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.connected_account_service import ConnectedAccountService
+from app.services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+# schedule_email_fetches runs from an ARQ cron once a minute
+SCHEDULER_TICK_SECONDS = 60
+
+
+async def schedule_email_fetches(ctx):
+    """
+    ARQ Cron: enqueue run_email_fetch for every active account due within the next tick.
+    Each fetch is deferred to the account's own next_poll_at, so the load is spread
+    over the minute instead of landing at the top of it. Accounts never scheduled
+    (new, or all of them right after the migration) get a random first poll within
+    their interval; overdue ones (worker downtime) a random slot within this tick.
+    """
+    now = datetime.now(timezone.utc)
+    window_end = now + timedelta(seconds=SCHEDULER_TICK_SECONDS)
+    enqueued = coalesced = 0
+
+    async with AsyncSessionLocal() as db:
+        account_service = ConnectedAccountService(db)
+        task_service = TaskService(db, pool=ctx["redis"])
+        accounts = await account_service.list_accounts_due_for_poll_db(window_end, settings.EMAIL_POLL_BATCH_SIZE)
+
+        for account in accounts:
+            if account.next_poll_at is None:
+                run_at = now + timedelta(seconds=random.uniform(0, account_service.poll_interval(account)))
+                if run_at >= window_end:
+                    account.next_poll_at = run_at
+                    continue
+            elif account.next_poll_at > now:
+                run_at = account.next_poll_at
+            else:
+                run_at = now + timedelta(seconds=random.uniform(0, SCHEDULER_TICK_SECONDS))
+
+            # Provisional, so later ticks skip the account; the fetch reschedules from its result
+            account_service.schedule_next_poll(account, after=run_at)
+            result = await task_service.enqueue_email_fetch(
+                user_id=account.user_id,
+                provider=account.provider.value,
+                account_id=account.id,
+                triggered_by="CRON",
+                defer_by=run_at - now
+            )
+            if result.coalesced:
+                coalesced += 1
+            else:
+                enqueued += 1
+
+        await db.commit()
+
+    logger.info(
+        f"Email fetch scheduler: {len(accounts)} due, {enqueued} enqueued, "
+        f"{coalesced} already pending"
+    )
+    return {"due_count": len(accounts), "enqueued_count": enqueued, "coalesced_count": coalesced}
@@ -0,0 +1,63 @@
+"""
+Run ARQ workers for one or more queues, with N worker processes per queue.
+
+Each process is an independent ARQ worker (its own event loop, DB engine and
+Redis connections) running up to the queue's *_WORKER_MAX_JOBS jobs at once.
+
+Usage:
+    python run_workers.py --queue email --processes 4
+    python run_workers.py --queue transactional email --processes 2
+"""
+import argparse
+import importlib
+import multiprocessing
+import signal
+
+from arq import run_worker
+
+QUEUES = {
+    "base": "app.core.worker.base_settings",
+    "email": "app.core.worker.email_settings",
+    "transactional": "app.core.worker.transactional_settings",
+}
+
+
+def run_queue_worker(queue_name: str) -> None:
+    settings_cls = importlib.import_module(QUEUES[queue_name]).WorkerSettings
+    run_worker(settings_cls)
+
+
+def main(queue_names: list, processes: int) -> None:
+    # Fresh interpreters: nothing (event loop, engine, pools) is inherited from the parent
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(target=run_queue_worker, args=(queue_name,), name=f"{queue_name}-worker-{i}")
+        for queue_name in queue_names
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"Started {len(workers)} worker processes: {', '.join(w.name for w in workers)}")
+
+    def stop(signum, frame):
+        # Each ARQ worker finishes its running jobs on SIGTERM before exiting
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        # Ctrl+C already reached the children (same process group); wait for them to shut down
+        for worker in workers:
+            worker.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue", nargs="+", choices=sorted(QUEUES), required=True)
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes per queue")
+    args = parser.parse_args()
+    main(args.queue, args.processes)